@@ -0,0 +1,241 @@
+import re
+from typing import Callable, Dict, Iterable, Iterator, Mapping, Sequence
+
+from RecordMapper.appliers import NestedSchemaSelectorApplier, RenameApplier, TransformApplier, CleanApplier, \
+    FusedApplier, BatchApplier
+from RecordMapper.builders import FlatRecordBuilder, SchemaPlanBuilder, MapperFunctionBuilder, SlotRecordBuilder, \
+    BatchBuilder
+from RecordMapper.builders.BatchBuilder import FlatBatch, BatchRecordView, column_as_list
+from RecordMapper.builders.FlatSchemaBuilder import FieldData
+
+
+class MappingPlan(object):
+    """A compiled plan to transform records.
+
+    The plan is built once from the FlatSchemas and contains everything
+    that does not depend on the records: the base FlatSchema, its
+    SchemaPlan (field order, aliases and transform phases) and the
+    sequence of applier functions. Transforming a record only moves the
+    data through these precomputed steps.
+
+    There are four engines to apply the transformations:
+      - "chain": The default one. It chains the rename, transform and clean appliers.
+      - "fused": It uses a FusedApplier, which gives the same results doing the
+        three steps in a single pass, without copying the record in each step.
+      - "codegen": It generates and compiles a specialised mapper function
+        (see MapperFunctionBuilder) for each complete FlatSchema, that is, for
+        the base schema and each combination of selected nested schemas.
+      - "slots": Like "codegen", but the records are flattened into SlotRecords
+        (see SlotRecordBuilder) and the generated functions access the fields
+        by their slots instead of by their tuple keys.
+
+    Besides, the plan can transform batches of records stored by columns
+    (see BatchBuilder), whatever the engine is.
+    """
+
+    engines = ("chain", "fused", "codegen", "slots")
+    primitive_types = ("null", "boolean", "int", "long", "float", "double", "bytes", "string")
+    max_cached_mapper_functions = 256
+
+    def __init__(self, flat_schemas: Dict[str, dict], base_schema_name: str, custom_variables: dict,
+                 engine: str = "chain"):
+        """The constructor of the MappingPlan.
+
+        :param flat_schemas: A dict with the FlatSchemas, indexed by schema name.
+        :type flat_schemas: Dict[str, dict]
+        :param base_schema_name: The name of the base schema.
+        :type base_schema_name: str
+        :param custom_variables: A dict of custom variables that will be accessible for the appliers.
+        :type custom_variables: dict
+        :param engine: The engine used to apply the transformations ("chain", "fused", "codegen" or "slots").
+            Defaults to "chain".
+        :type engine: str, optional
+        :raises RuntimeError: The engine is not valid.
+        """
+
+        if engine not in self.engines:
+            raise RuntimeError(f"Invalid engine: {engine}")
+
+        self.engine = engine
+        self.flat_schemas = flat_schemas
+        self.base_schema_name = base_schema_name
+        self.base_flat_schema = flat_schemas[base_schema_name]
+        self.custom_variables = custom_variables
+
+        # Compile the plan of the base schema in advance.
+        self.base_schema_plan = SchemaPlanBuilder.get_schema_plan(self.base_flat_schema)
+
+        # Load the appliers.
+        self.selector_applier = NestedSchemaSelectorApplier(self.flat_schemas, self.custom_variables)
+        self.rename_applier = RenameApplier(self.custom_variables)
+        self.transform_applier = TransformApplier(self.custom_variables)
+        self.clean_applier = CleanApplier(self.custom_variables)
+        self.fused_applier = FusedApplier(self.custom_variables)
+        self.batch_applier = BatchApplier(self.custom_variables)
+
+        # The selector applier is only needed if there is any field with nested schemas.
+        has_selectors = any(field_data.selector is not None for field_data in self.base_flat_schema.values())
+        self.has_selectors = has_selectors
+
+        # Without selectors, aliases or transforms, and with simple types, a record of the base schema does not change.
+        self.is_identity = not has_selectors and all(
+            self.is_identity_field(key, field_data) for key, field_data in self.base_flat_schema.items()
+        )
+
+        # The generated mapper functions, indexed by the id of their complete FlatSchema.
+        self.mapper_functions = {}
+        self.uses_mapper_functions = engine in ("codegen", "slots")
+
+        # The slots of the SlotRecords, only used by the "slots" engine.
+        self.slot_index = SlotRecordBuilder.get_slot_index(self.flat_schemas, base_schema_name) \
+            if engine == "slots" else None
+
+        if engine == "fused":
+            engine_functions = [self.fused_applier.apply]
+        elif self.uses_mapper_functions:
+            engine_functions = []
+        else:
+            engine_functions = [self.rename_applier.apply, self.transform_applier.apply, self.clean_applier.apply]
+
+        self.applier_functions = tuple(
+            ([self.selector_applier.apply] if has_selectors else []) + engine_functions
+        )
+
+        # Without selectors, the base schema is the only complete schema, so its function is generated in advance.
+        if self.uses_mapper_functions and not has_selectors:
+            self.get_mapper_function(self.base_flat_schema)
+
+    @staticmethod
+    def is_identity_field(key: tuple, field_data: FieldData) -> bool:
+        """Check if the value of a field is not changed by the plan.
+
+        :param key: The key of the field.
+        :type key: tuple
+        :param field_data: The data of the field.
+        :type field_data: FieldData
+        :return: True if the field is a top-level field of a primitive type (or a union or an array of primitive
+            types) without aliases or transforms.
+        :rtype: bool
+        """
+
+        if len(key) != 1 or field_data.aliases or field_data.transforms or field_data.selector is not None:
+            return False
+
+        types = field_data.types
+        if isinstance(types, dict) and types.get("type") == "array":
+            types = types["items"]
+        types = types if isinstance(types, list) else [types]
+
+        return all(isinstance(field_type, str) and field_type in MappingPlan.primitive_types for field_type in types)
+
+    def transform_records(self, record_list: Iterable[dict]) -> Iterator[dict]:
+        """Transform records following the plan.
+
+        :param record_list: An iterable of records.
+        :type record_list: Iterable[dict]
+        :yield: A transformed record.
+        :rtype: Iterator[dict]
+        """
+
+        transform_record = self.transform_record
+
+        for record in record_list:
+            yield transform_record(record)
+
+    def transform_record(self, record: dict) -> dict:
+        """Transform a single record following the plan.
+
+        :param record: An input record.
+        :type record: dict
+        :return: A transformed record.
+        :rtype: dict
+        """
+
+        if self.slot_index is not None:
+            flat_record = SlotRecordBuilder.get_slot_record_from_normal_record(record, self.slot_index)
+        else:
+            flat_record = FlatRecordBuilder.get_flat_record_from_normal_record(record)
+        flat_schema = self.base_flat_schema
+
+        for applier_function in self.applier_functions:
+            flat_record, flat_schema = applier_function(flat_record, flat_schema)
+
+        # The generated functions include the clean and unflatten steps.
+        if self.uses_mapper_functions:
+            return self.get_mapper_function(flat_schema)(flat_record)
+
+        return FlatRecordBuilder.get_normal_record_from_flat_record(flat_record)
+
+    def transform_batch(self, batch: Dict[str, Sequence]) -> FlatBatch:
+        """Transform a batch of records stored by columns following the plan.
+
+        If there is any field with nested schemas, the records are grouped by
+        their selected nested schemas and each group is transformed separately.
+
+        :param batch: A dict with a column (a list or a NumPy array) for each field.
+        :type batch: Dict[str, Sequence]
+        :return: The transformed FlatBatch.
+        :rtype: FlatBatch
+        """
+
+        flat_batch = BatchBuilder.get_flat_batch_from_batch(batch)
+
+        if not self.has_selectors:
+            return self.batch_applier.apply(flat_batch, self.base_flat_schema)[0]
+
+        # Group the records by their complete flat schema.
+        list_columns = {key: column_as_list(column) for key, column in flat_batch.columns.items()}
+        groups = {}
+
+        for index in range(flat_batch.size):
+            _, flat_schema = self.selector_applier.apply(BatchRecordView(list_columns, index), self.base_flat_schema)
+            groups.setdefault(id(flat_schema), (flat_schema, []))[1].append(index)
+
+        if len(groups) == 1:
+            flat_schema, _ = next(iter(groups.values()))
+            return self.batch_applier.apply(flat_batch, flat_schema)[0]
+
+        transformed_batches = [
+            self.batch_applier.apply(BatchBuilder.take(flat_batch, indices), flat_schema)[0]
+            for flat_schema, indices in groups.values()
+        ]
+
+        return BatchBuilder.merge(transformed_batches, [indices for _, indices in groups.values()], flat_batch.size)
+
+    def get_mapper_function(self, flat_schema: Mapping) -> Callable:
+        """Return the generated mapper function of a complete FlatSchema.
+
+        The function is generated only the first time, and then it is cached.
+
+        :param flat_schema: A complete FlatSchema.
+        :type flat_schema: Mapping
+        :return: The mapper function.
+        :rtype: Callable
+        """
+
+        # The cached entry keeps a reference to the schema, so its id cannot be reused.
+        cached_entry = self.mapper_functions.get(id(flat_schema))
+        if cached_entry is not None and cached_entry[0] is flat_schema:
+            return cached_entry[1]
+
+        base_schema_name = re.sub(r"\W", "_", self.base_schema_name)
+        mapper_function = MapperFunctionBuilder.get_mapper_function(
+            flat_schema, self.custom_variables, f"map_{base_schema_name}_{len(self.mapper_functions)}",
+            self.slot_index
+        )
+
+        # Discard the oldest function when the cache is full.
+        if len(self.mapper_functions) >= self.max_cached_mapper_functions:
+            del self.mapper_functions[next(iter(self.mapper_functions))]
+        self.mapper_functions[id(flat_schema)] = (flat_schema, mapper_function)
+
+        return mapper_function
+
+    def get_generated_source(self) -> str:
+        """Return the source of the mapper functions generated so far (for debugging).
+
+        :return: The source of the generated functions.
+        :rtype: str
+        """
+
+        return "\n\n".join(mapper_function.source for _, mapper_function in self.mapper_functions.values())
@@ -0,0 +1,378 @@
+import copy
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Union
+
+from RecordMapper.MappingPlan import MappingPlan
+from RecordMapper.builders import FlatSchemaBuilder
+
+
+class MappingRegistry(object):
+    """A registry of the FlatSchemas and the MappingPlans of the mappings, indexed by their fingerprint.
+
+    Building the FlatSchemas of a mapping (with the transform functions of
+    their fields) and its MappingPlan is the time spent by the constructor
+    of the RecordMapper. The RecordMappers that use the same registry reuse
+    the MappingPlan already built in the process for the same mapping,
+    engine and custom variables (and its generated mapper functions), or
+    at least the FlatSchemas of the mapping. The least recently used
+    mappings and plans are removed when the registry is full.
+
+    The fingerprint of a mapping is the SHA-256 hash of the canonical JSON
+    of its base and nested schemas and of the versions of the modules of
+    its custom functions (their __version__ and the hash of their source
+    file), so a change in any of them gives another mapping.
+
+    With a directory, the description of the FlatSchemas of each mapping
+    (see FlatSchemaBuilder.get_schema_description) is also written there,
+    in a file named after its fingerprint, so other processes (like the
+    workers of a ParallelTransformer) build the mapping from it without
+    parsing the function strings again.
+
+    The transform functions are shared by the RecordMappers of a mapping,
+    so the custom functions used with a registry must not keep a state of
+    their own between records, nor change the custom variables. A reused
+    MappingPlan keeps a copy of the custom variables it was built with, so
+    the later changes of the dict of a RecordMapper do not affect it.
+    """
+
+    description_version = 1
+    default_max_size = 64
+
+    # The versions of the modules of the custom functions, by module name (they are imported once per process).
+    module_versions = {}
+
+    def __init__(self, directory: str = None, max_size: int = default_max_size):
+        """The constructor of the MappingRegistry.
+
+        :param directory: The directory of the descriptions of the mappings. Defaults to None (they are only
+            kept in memory).
+        :type directory: str, optional
+        :param max_size: The maximum number of mappings (and of MappingPlans) kept in memory. Defaults to 64
+            (0 disables it).
+        :type max_size: int, optional
+        :raises RuntimeError: The size is not valid.
+        """
+
+        if max_size < 0:
+            raise RuntimeError(f"Invalid mapping registry size: {max_size}")
+
+        self.directory = directory
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+        self.builds = 0
+        self.plan_hits = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self) -> dict:
+        """Return the state to pickle the registry (for example, for the workers), without its mappings.
+
+        :return: The attributes of the registry, with no mappings nor MappingPlans.
+        :rtype: dict
+        """
+
+        return {**self.__dict__, "entries": OrderedDict(), "plans": OrderedDict()}
+
+    def get_mapping_plan(self, base_schema: dict, nested_schemas: List[dict], custom_variables: dict,
+                         engine: str = "chain") -> MappingPlan:
+        """Return the MappingPlan of a mapping, reusing it if it is already in the registry.
+
+        The plans are reused for the same mapping, engine and custom variables
+        (compared by their canonical JSON and then by value). The plans with
+        custom variables that can not be serialized to JSON are not kept.
+
+        :param base_schema: The base schema in Avro format.
+        :type base_schema: dict
+        :param nested_schemas: The schemas of the nested record types.
+        :type nested_schemas: List[dict]
+        :param custom_variables: A dict of custom variables that will be accessible for the appliers.
+        :type custom_variables: dict
+        :param engine: The engine used to apply the transformations. Defaults to "chain".
+        :type engine: str, optional
+        :raises RuntimeError: A function string or the engine is not valid.
+        :raises InvalidFunctionError: The import path of a custom function is not valid.
+        :return: The MappingPlan.
+        :rtype: MappingPlan
+        """
+
+        fingerprint = MappingRegistry.get_fingerprint(base_schema, nested_schemas)
+
+        try:
+            plan_key = (fingerprint, engine,
+                        json.dumps(custom_variables, sort_keys=True, separators=(",", ":")))
+        except (TypeError, ValueError):
+            plan_key = None
+
+        mapping_plan = self.plans.get(plan_key) if plan_key is not None else None
+        if mapping_plan is not None and mapping_plan.custom_variables == custom_variables:
+            self.plan_hits += 1
+            self.plans.move_to_end(plan_key)
+            return mapping_plan
+
+        flat_schemas = self.get_flat_schemas_of_fingerprint(fingerprint, base_schema, nested_schemas)
+
+        if plan_key is None:
+            return MappingPlan(dict(flat_schemas), base_schema["name"], custom_variables, engine)
+
+        # The plan is shared, so it keeps its own copy of the custom variables.
+        mapping_plan = MappingPlan(dict(flat_schemas), base_schema["name"], copy.deepcopy(custom_variables), engine)
+        self.add_entry(self.plans, plan_key, mapping_plan)
+
+        return mapping_plan
+
+    def get_flat_schemas(self, base_schema: dict, nested_schemas: List[dict]) -> Dict[str, dict]:
+        """Return the FlatSchemas of a mapping, reusing them if the mapping is already in the registry.
+
+        :param base_schema: The base schema in Avro format.
+        :type base_schema: dict
+        :param nested_schemas: The schemas of the nested record types.
+        :type nested_schemas: List[dict]
+        :raises RuntimeError: A function string is not valid.
+        :raises InvalidFunctionError: The import path of a custom function is not valid.
+        :return: A dict with the FlatSchemas, indexed by schema name.
+        :rtype: Dict[str, dict]
+        """
+
+        fingerprint = MappingRegistry.get_fingerprint(base_schema, nested_schemas)
+
+        return self.get_flat_schemas_of_fingerprint(fingerprint, base_schema, nested_schemas)
+
+    def get_flat_schemas_of_fingerprint(self, fingerprint: str, base_schema: dict,
+                                        nested_schemas: List[dict]) -> Dict[str, dict]:
+        """Return the FlatSchemas of a mapping with a known fingerprint (see get_flat_schemas).
+
+        A description that can not be loaded (for example, edited by hand or
+        written by another version) is treated as a missing one: the
+        FlatSchemas are built from the schemas, and the description is
+        written again.
+
+        :param fingerprint: The fingerprint of the mapping.
+        :type fingerprint: str
+        :param base_schema: The base schema in Avro format.
+        :type base_schema: dict
+        :param nested_schemas: The schemas of the nested record types.
+        :type nested_schemas: List[dict]
+        :raises RuntimeError: A function string is not valid.
+        :raises InvalidFunctionError: The import path of a custom function is not valid.
+        :return: A dict with the FlatSchemas, indexed by schema name.
+        :rtype: Dict[str, dict]
+        """
+
+        flat_schemas = self.entries.get(fingerprint)
+        if flat_schemas is not None:
+            self.hits += 1
+            self.entries.move_to_end(fingerprint)
+            return flat_schemas
+
+        description = self.read_description(fingerprint)
+        flat_schemas = None
+
+        if description is not None:
+            try:
+                flat_schemas = MappingRegistry.get_flat_schemas_from_description(description)
+                self.loads += 1
+            except Exception:
+                flat_schemas = None
+
+        if flat_schemas is None:
+            schemas = [base_schema] + nested_schemas
+            description = {
+                "description_version": MappingRegistry.description_version,
+                "schemas": {schema["name"]: FlatSchemaBuilder.get_schema_description(schema) for schema in schemas}
+            }
+            flat_schemas = MappingRegistry.get_flat_schemas_from_description(description)
+            self.builds += 1
+            self.write_description(fingerprint, description)
+
+        self.add_entry(self.entries, fingerprint, flat_schemas)
+
+        return flat_schemas
+
+    def add_entry(self, entries: OrderedDict, key: object, value: object):
+        """Add an entry to the mappings or the MappingPlans, removing the least recently used one if it is full.
+
+        :param entries: The mappings or the MappingPlans of the registry.
+        :type entries: OrderedDict
+        :param key: The key of the entry.
+        :type key: object
+        :param value: The value of the entry.
+        :type value: object
+        """
+
+        if self.max_size > 0:
+            entries[key] = value
+            if len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def get_description_path(self, fingerprint: str) -> str:
+        """Return the path of the description of a mapping.
+
+        :param fingerprint: The fingerprint of the mapping.
+        :type fingerprint: str
+        :return: The path of the file, in the directory of the registry.
+        :rtype: str
+        """
+
+        return os.path.join(self.directory, f"{fingerprint}.json")
+
+    def read_description(self, fingerprint: str) -> Union[dict, None]:
+        """Read the description of a mapping from the directory of the registry.
+
+        :param fingerprint: The fingerprint of the mapping.
+        :type fingerprint: str
+        :return: The description, or None if there is no directory, or no valid description of the mapping.
+        :rtype: Union[dict, None]
+        """
+
+        if self.directory is None:
+            return None
+
+        try:
+            with open(self.get_description_path(fingerprint), "r") as description_file:
+                description = json.load(description_file)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(description, dict) or \
+                description.get("description_version") != MappingRegistry.description_version:
+            return None
+
+        return description
+
+    def write_description(self, fingerprint: str, description: dict):
+        """Write the description of a mapping in the directory of the registry, if any.
+
+        The file is written with another name and then renamed, so the other
+        processes never read a partial description.
+
+        :param fingerprint: The fingerprint of the mapping.
+        :type fingerprint: str
+        :param description: The description of the FlatSchemas of the mapping.
+        :type description: dict
+        """
+
+        if self.directory is None:
+            return
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(file_descriptor, "w") as description_file:
+                json.dump(description, description_file)
+            os.replace(temporary_path, self.get_description_path(fingerprint))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def get_counts(self) -> Dict[str, int]:
+        """Return the counters of the registry.
+
+        :return: The number of mappings reused from memory ("hits"), built from their descriptions ("loads")
+            and built from their schemas ("builds"), and of MappingPlans reused ("plan_hits").
+        :rtype: Dict[str, int]
+        """
+
+        return {"hits": self.hits, "loads": self.loads, "builds": self.builds, "plan_hits": self.plan_hits}
+
+    def clear(self):
+        """Remove the mappings and MappingPlans kept in memory (but not their descriptions) and reset the
+        counters."""
+
+        self.entries.clear()
+        self.plans.clear()
+        self.hits = 0
+        self.loads = 0
+        self.builds = 0
+        self.plan_hits = 0
+
+    @staticmethod
+    def get_flat_schemas_from_description(description: dict) -> Dict[str, dict]:
+        """Build the FlatSchemas of a mapping from its description.
+
+        :param description: The description of the FlatSchemas of the mapping.
+        :type description: dict
+        :raises RuntimeError: A function string is not valid.
+        :raises InvalidFunctionError: The import path of a custom function is not valid.
+        :return: A dict with the FlatSchemas, indexed by schema name.
+        :rtype: Dict[str, dict]
+        """
+
+        return {
+            schema_name: FlatSchemaBuilder.get_flat_schema_from_description(schema_description)
+            for schema_name, schema_description in description["schemas"].items()
+        }
+
+    @staticmethod
+    def get_fingerprint(base_schema: dict, nested_schemas: List[dict]) -> str:
+        """Return the fingerprint of a mapping.
+
+        :param base_schema: The base schema in Avro format.
+        :type base_schema: dict
+        :param nested_schemas: The schemas of the nested record types.
+        :type nested_schemas: List[dict]
+        :return: The SHA-256 hash of the schemas and of the versions of the modules of the custom functions,
+            in hexadecimal.
+        :rtype: str
+        """
+
+        schemas = [base_schema] + nested_schemas
+        function_strs = []
+
+        for schema in schemas:
+            for field in schema["fields"]:
+                transform_field = field.get("transform", None)
+                function_strs += [transform_field] if isinstance(transform_field, str) else transform_field or []
+                function_strs.append(field.get("nestedSchemaSelector", None))
+
+        # The custom functions are referenced by their complete import path.
+        function_names = [function_str.split("(")[0] for function_str in function_strs if function_str is not None]
+        module_names = sorted({function_name.rpartition(".")[0] for function_name in function_names
+                               if "." in function_name})
+
+        mapping = {
+            "description_version": MappingRegistry.description_version,
+            "base_schema": base_schema,
+            "nested_schemas": nested_schemas,
+            "modules": {module_name: MappingRegistry.get_module_version(module_name) for module_name in module_names}
+        }
+
+        return hashlib.sha256(json.dumps(mapping, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    @staticmethod
+    def get_module_version(module_name: str) -> Union[str, None]:
+        """Return the version of the module of some custom functions.
+
+        :param module_name: The name of the module.
+        :type module_name: str
+        :return: Its __version__ (if any) and the SHA-256 hash of its source file, or None if it can not be
+            imported.
+        :rtype: Union[str, None]
+        """
+
+        if module_name in MappingRegistry.module_versions:
+            return MappingRegistry.module_versions[module_name]
+
+        try:
+            module = importlib.import_module(module_name)
+        except (ImportError, ValueError):
+            return None
+
+        source_hash = None
+        module_path = getattr(module, "__file__", None)
+        if module_path is not None:
+            with open(module_path, "rb") as module_file:
+                source_hash = hashlib.sha256(module_file.read()).hexdigest()
+
+        module_version = f"{getattr(module, '__version__', None)}:{source_hash}"
+        MappingRegistry.module_versions[module_name] = module_version
+
+        return module_version
@@ -0,0 +1,305 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from RecordMapper.MappingRegistry import MappingRegistry
+from RecordMapper.avro.AvroReader import AvroReader
+from RecordMapper.avro.AvroSplitter import AvroSplitter
+from RecordMapper.builders import BuiltinFunctions, DateParseCache
+from RecordMapper.csv.CSVSplitter import CSVRangeError, CSVSplitter
+
+# The RecordMapper of each worker process, built once by its initializer.
+worker_record_mapper = None
+
+
+class ParallelTransformer(object):
+    """A transformer of records that uses a pool of worker processes.
+
+    The input records are split in chunks, which are transformed by the
+    workers, and the transformed records are returned in the input order.
+    Each worker builds its own RecordMapper (and its compiled MappingPlan)
+    once, when it starts, so only the chunks of records are sent between
+    processes.
+
+    The number of chunks waiting for a worker or for being returned is
+    bounded, so the input is read as the results are consumed.
+
+    The workers can also read the records themselves, from the byte ranges
+    of a csv or avro file, so the reading is parallel too.
+
+    In the unordered mode, the records of each chunk are returned as soon as
+    the chunk is transformed, so a slow chunk does not stop the others (but
+    the records of the ranges of a csv file are always returned in order).
+
+    Each worker has its own cache of parsed dates, and the counters of the
+    caches are sent with the transformed records (see date_cache_counts).
+    """
+
+    def __init__(self, base_schema: dict, nested_schemas: List[dict], custom_variables: dict, engine: str,
+                 workers: int, chunk_size: int = 1000, ordered: bool = True, date_cache_size: int = None,
+                 mapping_registry: MappingRegistry = None):
+        """The constructor of the ParallelTransformer.
+
+        :param base_schema: The base schema in Avro format to transform the records.
+        :type base_schema: dict
+        :param nested_schemas: The schemas of the nested record types.
+        :type nested_schemas: List[dict]
+        :param custom_variables: A dict of custom variables that will be accessible for the appliers.
+        :type custom_variables: dict
+        :param engine: The engine used to apply the transformations.
+        :type engine: str
+        :param workers: The number of worker processes.
+        :type workers: int
+        :param chunk_size: The number of records of each chunk. Defaults to 1000.
+        :type chunk_size: int, optional
+        :param ordered: If the records are returned in the input order. Defaults to True.
+        :type ordered: bool, optional
+        :param date_cache_size: The size of the cache of parsed dates of each worker. Defaults to None
+            (the default size).
+        :type date_cache_size: int, optional
+        :param mapping_registry: The registry of the mappings of each worker. Defaults to None.
+        :type mapping_registry: MappingRegistry, optional
+        :raises RuntimeError: The number of workers or the chunk size are not valid.
+        """
+
+        if workers < 1:
+            raise RuntimeError(f"Invalid number of workers: {workers}")
+        if chunk_size < 1:
+            raise RuntimeError(f"Invalid chunk size: {chunk_size}")
+
+        self.worker_args = (base_schema, nested_schemas, custom_variables, engine, date_cache_size, mapping_registry)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        # The maximum number of chunks submitted to the pool and not returned yet.
+        self.max_pending_chunks = 2 * workers
+        # The counters of the caches of parsed dates of the workers, for the returned records.
+        self.date_cache_counts = {"hits": 0, "misses": 0, "formats": {}}
+
+    def transform_records(self, record_list: Iterable[dict]) -> Iterator[dict]:
+        """Transform records in the worker processes.
+
+        :param record_list: An iterable of records.
+        :type record_list: Iterable[dict]
+        :yield: A transformed record.
+        :rtype: Iterator[dict]
+        """
+
+        record_iterator = iter(record_list)
+        chunks = iter(lambda: list(itertools.islice(record_iterator, self.chunk_size)), [])
+
+        yield from self.run_tasks(ParallelTransformer.transform_chunk, ((chunk,) for chunk in chunks))
+
+    def transform_csv_file(self, file_path: str, range_size: int) -> Iterator[dict]:
+        """Read and transform the records of a csv file in the worker processes.
+
+        The file is split in byte ranges (see CSVSplitter), and each worker
+        reads and transforms the records of a range. If a range does not end
+        at a record boundary (the quotes of the file do not follow RFC 4180),
+        the records from its start are read in this process instead, and
+        transformed in chunks. The ranges are returned in order, so the
+        records of the previous ones are complete.
+
+        :param file_path: Path of the csv file.
+        :type file_path: str
+        :param range_size: The approximate size of each range, in bytes.
+        :type range_size: int
+        :yield: A transformed record.
+        :rtype: Iterator[dict]
+        """
+
+        csv_splitter = CSVSplitter(file_path)
+        fieldnames, _ = csv_splitter.get_fieldnames()
+
+        if fieldnames is None:
+            return
+
+        try:
+            yield from self.run_tasks(
+                ParallelTransformer.transform_csv_range,
+                ((file_path, start, end, fieldnames) for start, end in csv_splitter.get_byte_ranges(range_size)),
+                ordered=True
+            )
+        except CSVRangeError as error:
+            file_size = os.path.getsize(file_path)
+            yield from self.transform_records(
+                CSVSplitter.read_records_in_range(file_path, error.start, file_size, fieldnames)
+            )
+
+    def transform_avro_file(self, file_path: str, range_size: int) -> Iterator[dict]:
+        """Read and transform the records of an avro file in the worker processes.
+
+        The file is split in ranges of blocks (see AvroSplitter), and each
+        worker decodes and transforms the records of a range.
+
+        :param file_path: Path of the avro file.
+        :type file_path: str
+        :param range_size: The approximate size of each range, in bytes.
+        :type range_size: int
+        :yield: A transformed record.
+        :rtype: Iterator[dict]
+        """
+
+        avro_splitter = AvroSplitter(file_path)
+
+        yield from self.run_tasks(
+            ParallelTransformer.transform_avro_range,
+            ((file_path, start, end) for start, end in avro_splitter.get_byte_ranges(range_size))
+        )
+
+    def run_tasks(self, task_function: Callable[..., Tuple[List[dict], Dict[str, object]]],
+                  tasks_args: Iterable[tuple], ordered: bool = None) -> Iterator[dict]:
+        """Run tasks that return transformed records in the worker processes.
+
+        :param task_function: The function of the tasks, which returns a list of records and the counters
+            of the cache of parsed dates (see get_task_results).
+        :type task_function: Callable[..., Tuple[List[dict], Dict[str, object]]]
+        :param tasks_args: The arguments of each task.
+        :type tasks_args: Iterable[tuple]
+        :param ordered: If the records are returned in the order of the tasks. Defaults to None (the mode of
+            the ParallelTransformer).
+        :type ordered: bool, optional
+        :raises Exception: The exception of a task (the pending tasks are cancelled).
+        :yield: A transformed record, in the order of the tasks (unless the mode is unordered).
+        :rtype: Iterator[dict]
+        """
+
+        ordered = self.ordered if ordered is None else ordered
+
+        with ProcessPoolExecutor(self.workers, initializer=ParallelTransformer.init_worker,
+                                 initargs=self.worker_args) as executor:
+            pending_tasks = deque()
+
+            try:
+                for task_args in tasks_args:
+                    pending_tasks.append(executor.submit(task_function, *task_args))
+
+                    if len(pending_tasks) >= self.max_pending_chunks:
+                        yield from self.get_next_results(pending_tasks, ordered)
+
+                while pending_tasks:
+                    yield from self.get_next_results(pending_tasks, ordered)
+            finally:
+                for pending_task in pending_tasks:
+                    pending_task.cancel()
+
+    def get_next_results(self, pending_tasks: deque, ordered: bool) -> List[dict]:
+        """Wait for the next task and remove it from the pending tasks.
+
+        :param pending_tasks: The futures of the pending tasks, in the order of submission.
+        :type pending_tasks: deque
+        :param ordered: If the tasks are returned in the order of submission.
+        :type ordered: bool
+        :return: The results of the first task (or, in the unordered mode, of the first finished task).
+        :rtype: List[dict]
+        """
+
+        if ordered:
+            done_task = pending_tasks.popleft()
+        else:
+            done_tasks, _ = wait(pending_tasks, return_when=FIRST_COMPLETED)
+            done_task = next(task for task in pending_tasks if task in done_tasks)
+            pending_tasks.remove(done_task)
+
+        records, date_cache_counts = done_task.result()
+        DateParseCache.add_counts(self.date_cache_counts, date_cache_counts)
+
+        return records
+
+    @staticmethod
+    def init_worker(base_schema: dict, nested_schemas: List[dict], custom_variables: dict, engine: str,
+                    date_cache_size: int, mapping_registry: MappingRegistry):
+        """Build the RecordMapper of a worker process.
+
+        :param base_schema: The base schema in Avro format to transform the records.
+        :type base_schema: dict
+        :param nested_schemas: The schemas of the nested record types.
+        :type nested_schemas: List[dict]
+        :param custom_variables: A dict of custom variables that will be accessible for the appliers.
+        :type custom_variables: dict
+        :param engine: The engine used to apply the transformations.
+        :type engine: str
+        :param date_cache_size: The size of the cache of parsed dates, or None for the default size.
+        :type date_cache_size: int
+        :param mapping_registry: The registry of the mappings, or None. The mappings built by the main process
+            are only kept by forked workers, the others read their descriptions (if the registry has a directory).
+        :type mapping_registry: MappingRegistry
+        """
+
+        global worker_record_mapper
+
+        from RecordMapper.RecordMapper import RecordMapper
+        worker_record_mapper = RecordMapper(base_schema, nested_schemas, custom_variables, engine, date_cache_size,
+                                            mapping_registry)
+
+    @staticmethod
+    def transform_chunk(chunk: List[dict]) -> Tuple[List[dict], Dict[str, object]]:
+        """Transform a chunk of records in a worker process.
+
+        :param chunk: A list of records.
+        :type chunk: List[dict]
+        :return: The list of transformed records and the counters of the cache of parsed dates.
+        :rtype: Tuple[List[dict], Dict[str, object]]
+        """
+
+        return ParallelTransformer.get_task_results(worker_record_mapper.transform_records(chunk))
+
+    @staticmethod
+    def transform_csv_range(file_path: str, start: int, end: int,
+                            fieldnames: List[str]) -> Tuple[List[dict], Dict[str, object]]:
+        """Read and transform the records of a byte range of a csv file in a worker process.
+
+        :param file_path: Path of the csv file.
+        :type file_path: str
+        :param start: The start offset of the range.
+        :type start: int
+        :param end: The end offset of the range.
+        :type end: int
+        :param fieldnames: The names of the columns, from the header of the file.
+        :type fieldnames: List[str]
+        :return: The list of transformed records and the counters of the cache of parsed dates.
+        :rtype: Tuple[List[dict], Dict[str, object]]
+        """
+
+        return ParallelTransformer.get_task_results(worker_record_mapper.transform_records(
+            CSVSplitter.read_records_in_range(file_path, start, end, fieldnames)
+        ))
+
+    @staticmethod
+    def transform_avro_range(file_path: str, start: int, end: int) -> Tuple[List[dict], Dict[str, object]]:
+        """Read and transform the records of a range of blocks of an avro file in a worker process.
+
+        :param file_path: Path of the avro file.
+        :type file_path: str
+        :param start: The start offset of the range.
+        :type start: int
+        :param end: The end offset of the range.
+        :type end: int
+        :return: The list of transformed records and the counters of the cache of parsed dates.
+        :rtype: Tuple[List[dict], Dict[str, object]]
+        """
+
+        reader = AvroReader(file_path, memory_map=True)
+
+        try:
+            return ParallelTransformer.get_task_results(
+                worker_record_mapper.transform_records(reader.read_records_from_block(start, end))
+            )
+        finally:
+            reader.close()
+
+    @staticmethod
+    def get_task_results(transformed_records: Iterable[dict]) -> Tuple[List[dict], Dict[str, object]]:
+        """Transform the records of a task, and take the counters of the cache of parsed dates of the worker.
+
+        :param transformed_records: An iterable of transformed records.
+        :type transformed_records: Iterable[dict]
+        :return: The list of transformed records and the counters of the cache since the previous task.
+        :rtype: Tuple[List[dict], Dict[str, object]]
+        """
+
+        records = list(transformed_records)
+
+        return records, BuiltinFunctions.date_parse_cache.reset_counts()
@@ -1,14 +1,18 @@
 import itertools
-from typing import List, Iterable, Iterator
+from typing import TYPE_CHECKING, Dict, List, Iterable, Iterator, Sequence
 
-from RecordMapper.appliers import NestedSchemaSelectorApplier, RenameApplier, TransformApplier, CleanApplier
-from RecordMapper.avro.AvroReader import AvroReader
-from RecordMapper.avro.AvroWriter import AvroWriter
-from RecordMapper.builders import FlatSchemaBuilder, FlatRecordBuilder
-from RecordMapper.csv.CSVReader import CSVReader
-from RecordMapper.csv.CSVWriter import CSVWriter
-from RecordMapper.xml.XMLReader import XMLReader
-from RecordMapper.utils import chain_functions
+from RecordMapper.MappingPlan import MappingPlan
+from RecordMapper.MappingRegistry import MappingRegistry
+from RecordMapper.builders import BuiltinFunctions, DateParseCache, FlatSchemaBuilder
+from RecordMapper.builders.BatchBuilder import FlatBatch
+from RecordMapper.common import FanOutWriter
+
+# The readers, the writers and the ParallelTransformer (and their dependencies, like fastavro) are imported
+# when they are used, so importing the RecordMapper (for example, in a short-lived process) is fast.
+if TYPE_CHECKING:
+    from RecordMapper.ParallelTransformer import ParallelTransformer
+    from RecordMapper.avro.AvroReader import AvroReader
+    from RecordMapper.csv.CSVWriter import CSVWriter
 
 
 class RecordMapper(object):
@@ -17,7 +21,8 @@ class RecordMapper(object):
     Include methods to transform data using an Avro schema and custom functions.
     """
 
-    def __init__(self, base_schema: dict, nested_schemas: List[dict] = [], custom_variables: dict = {}):
+    def __init__(self, base_schema: dict, nested_schemas: List[dict] = [], custom_variables: dict = {},
+                 engine: str = "chain", date_cache_size: int = None, mapping_registry: MappingRegistry = None):
         """Constructor method of RecordMapper.
 
         Initialize the base and nested schemas, and the custom variables.
@@ -33,44 +38,103 @@ class RecordMapper(object):
           - The clean applier, which will filter the output fields to
             keep only the ones given in the output schema.
 
+        The appliers are compiled, together with the base flat schema, into
+        a MappingPlan that is reused for every record. The "fused" engine
+        replaces the rename, transform and clean appliers by a single
+        FusedApplier, with the same results and fewer copies of each record.
+        The "codegen" engine generates and compiles a specialised function
+        for each combination of base and nested schemas, and the "slots"
+        engine does the same over slot-indexed records (SlotRecords).
+
+        The date built-in functions cache the parsed dates in a cache of each
+        process (see DateParseCache), and the stats of the executions include
+        its hits and misses ("date_cache") and the number of dates of each
+        format of toDate ("date_formats").
+
+        With a MappingRegistry, the FlatSchemas of the mapping are reused if
+        another RecordMapper with the same registry already built them (or
+        built from their description on disk), instead of being built again.
 
         :param base_schema: The base schema in Avro format to transform the records.
         :type base_schema: dict
         :param nested_schemas: The schemas of the nested record types. Defaults to [].
         :type nested_schemas: List[dict], optional
         :param custom_variables: A dict of custom variables that will be accessible for the appliers.
+        :param engine: The engine used to apply the transformations ("chain", "fused", "codegen" or "slots").
+            Defaults to "chain".
+        :type engine: str, optional
+        :param date_cache_size: The maximum number of dates in the cache of parsed dates of this process (and
+            of the workers). Defaults to None (the current size, 65536 by default).
+        :type date_cache_size: int, optional
+        :param mapping_registry: The registry of the FlatSchemas and the MappingPlans of the mappings (also used
+            by the workers). Defaults to None (they are always built).
+        :type mapping_registry: MappingRegistry, optional
         """
 
         # Load the base and nested schemas, and the custom variables.
         self.original_base_schema = base_schema
         self.original_nested_schemas = nested_schemas
         self.custom_variables = custom_variables
+        self.engine = engine
+        self.date_cache_size = date_cache_size
+        self.mapping_registry = mapping_registry
+
+        # The cache of parsed dates is shared by all the RecordMappers of the process.
+        if date_cache_size is not None:
+            BuiltinFunctions.date_parse_cache.resize(date_cache_size)
 
         # Initialize the stats of the Record Mapper.
         self.stats = {}
 
-        # Load flattened schemas for both, base and nested schemas.
-        self.flat_schemas = dict(
-            [
-                (schema["name"], FlatSchemaBuilder.get_flat_schema(schema))
-                for schema in ([self.original_base_schema] + self.original_nested_schemas)
-            ]
-        )
-
-        # Load the appliers.
-        self.selector_applier = NestedSchemaSelectorApplier(self.flat_schemas, self.custom_variables)
-        self.rename_applier = RenameApplier(self.custom_variables)
-        self.transform_applier = TransformApplier(self.custom_variables)
-        self.clean_applier = CleanApplier(self.custom_variables)
+        if mapping_registry is not None:
+            # Reuse the mapping plan (or at least the flattened schemas) of the registry.
+            self.mapping_plan = mapping_registry.get_mapping_plan(self.original_base_schema,
+                                                                  self.original_nested_schemas, self.custom_variables,
+                                                                  engine)
+            self.flat_schemas = self.mapping_plan.flat_schemas
+        else:
+            # Load flattened schemas for both, base and nested schemas.
+            self.flat_schemas = dict(
+                [
+                    (schema["name"], FlatSchemaBuilder.get_flat_schema(schema))
+                    for schema in ([self.original_base_schema] + self.original_nested_schemas)
+                ]
+            )
+
+            # Compile the mapping plan, which loads the appliers.
+            self.mapping_plan = MappingPlan(self.flat_schemas, self.original_base_schema["name"],
+                                            self.custom_variables, engine)
+
+        self.selector_applier = self.mapping_plan.selector_applier
+        self.rename_applier = self.mapping_plan.rename_applier
+        self.transform_applier = self.mapping_plan.transform_applier
+        self.clean_applier = self.mapping_plan.clean_applier
 
     def execute(self, input_format: str, input_file_path: str, paths_to_write: dict, input_opts: dict = {},
                 base_schema_to_write: dict = None, nested_schemas_to_write: List[dict] = None,
-                output_opts: dict = {}):
+                output_opts: dict = {}, workers: int = None, chunk_size: int = 1000, ordered: bool = True):
         """Read, transform and write the data from a format to another one.
 
         The following input formats are allowed to be read: csv, avro, xml
         The following output formats are allowed to be written: csv, avro
 
+        If several workers are requested, the records are transformed in chunks
+        by a pool of worker processes (see ParallelTransformer), and they are
+        written in the input order, as in a serial execution (unless "ordered"
+        is False). The avro files are also read by the workers, split in byte
+        ranges of about "split_size" bytes (an input option, 16 MB by default),
+        unless the "split_input" input option is False. The csv files are only
+        split if the "split_input" input option is True, since their quote
+        characters should only be used to enclose fields (otherwise, the rest
+        of the file may be read serially, see CSVSplitter).
+
+        If the mapping does not change the records of an avro file (there are
+        no transforms, aliases or selectors, and the input and output schemas
+        have the same fields), the compressed blocks are copied to the output
+        file as they are, unless the "avro_passthrough" input option is False
+        or the output codec is different. The records are only decoded for
+        the csv file.
+
         :param input_format: The input format (csv, avro, xml)
         :type input_format: str
         :param input_file_path: The path of the input file.
@@ -85,16 +149,62 @@ class RecordMapper(object):
         :type nested_schemas_to_write: List[dict], optional
         :param output_opts: A dict-like set of options to be able to handle the behaviour of the output.
         :type output_opts: dict
+        :param workers: The number of worker processes that transform the records. Defaults to None
+            (the records are transformed in this process).
+        :type workers: int, optional
+        :param chunk_size: The number of records sent to a worker at once. Defaults to 1000.
+        :type chunk_size: int, optional
+        :param ordered: If the records are written in the input order when there are several workers.
+            Defaults to True.
+        :type ordered: bool, optional
         """
         
         # Reset the RecordMapper stats.
         self.stats = {}
+        BuiltinFunctions.date_parse_cache.reset_counts()
+
+        # The identity mappings of avro files copy the blocks, without decoding them.
+        if input_format == "avro" and input_opts.get("avro_passthrough", True) and self.mapping_plan.is_identity:
+            from RecordMapper.avro.AvroReader import AvroReader
+            avro_reader = AvroReader(input_file_path, memory_map=True)
+
+            if self.can_copy_avro_blocks(avro_reader, base_schema_to_write or self.original_base_schema,
+                                         output_opts):
+                self.copy_avro_blocks(avro_reader, paths_to_write, base_schema_to_write, nested_schemas_to_write,
+                                      output_opts)
+                self.update_date_stats()
+                return
+
+            avro_reader.close()
 
         # Read, transform and write records.
-        read_records = self.read_records(input_format, input_file_path, input_opts)
-        transformed_records = self.transform_records(read_records)
+        parallel_transformer = None
+        if workers is not None and workers > 1:
+            from RecordMapper.ParallelTransformer import ParallelTransformer
+            parallel_transformer = ParallelTransformer(self.original_base_schema, self.original_nested_schemas,
+                                                       self.custom_variables, self.engine, workers, chunk_size, ordered,
+                                                       self.date_cache_size, self.mapping_registry)
+            split_size = input_opts.get("split_size", 16 * 1024 * 1024)
+
+            # The workers read the avro files (and the csv files, on request) by byte ranges.
+            if input_format == "csv" and input_opts.get("split_input", False):
+                transformed_records = self.count_read_records(
+                    parallel_transformer.transform_csv_file(input_file_path, split_size)
+                )
+            elif input_format == "avro" and input_opts.get("split_input", True):
+                transformed_records = self.count_read_records(
+                    parallel_transformer.transform_avro_file(input_file_path, split_size)
+                )
+            else:
+                read_records = self.read_records(input_format, input_file_path, input_opts)
+                transformed_records = parallel_transformer.transform_records(read_records)
+        else:
+            read_records = self.read_records(input_format, input_file_path, input_opts)
+            transformed_records = self.transform_records(read_records)
+
         self.write_records(transformed_records, paths_to_write, base_schema_to_write,
                            nested_schemas_to_write, output_opts)
+        self.update_date_stats(parallel_transformer)
 
     def transform_records(self, record_list: Iterable[dict]) -> Iterator[dict]:
         """Transform file records using different appliers.
@@ -107,17 +217,15 @@ class RecordMapper(object):
         :rtype: Iterator[dict]
         """
 
-        for record in record_list:
-            yield self.transform_record(record)
+        return self.mapping_plan.transform_records(record_list)
 
     def transform_record(self, record: dict) -> dict:
         """Apply transformations on a single record.
 
         The transforming process includes:
-          - Loading the flattened schema.
           - Converting a given record to a convenient flat format.
-          - Constructing the transforming pipeline chaining the appliers functions.
-          - Applying the record transformation.
+          - Applying the record transformations with the appliers of
+            the compiled MappingPlan.
           - De-converting the transformed record from the flat format to the original one.
           - Returning the transformed record.
 
@@ -129,28 +237,178 @@ class RecordMapper(object):
         :rtype: dict
         """
 
-        # Load the flattened schema.
-        base_schema_name = self.original_base_schema["name"]
-        base_flat_schema = self.flat_schemas[base_schema_name]
+        return self.mapping_plan.transform_record(record)
 
-        # Convert the record to a flat format.
-        flat_record = FlatRecordBuilder.get_flat_record_from_normal_record(record)
+    def transform_batches(self, batches: Iterable[Dict[str, Sequence]]) -> Iterator[FlatBatch]:
+        """Transform batches of records stored by columns.
 
-        # Construct the transforming pipeline.
-        all_functions = chain_functions(
-            self.selector_applier.apply,
-            self.rename_applier.apply,
-            self.transform_applier.apply,
-            self.clean_applier.apply
-        )
+        Each batch is a dict with a column (a list or a NumPy array) for each
+        field, containing the value of the field for each record. The
+        transformations are applied column by column, and the records of the
+        results are only built when they are requested (for example, with
+        get_records_from_batches, to write them).
+
+        :param batches: An iterable of batches.
+        :type batches: Iterable[Dict[str, Sequence]]
+        :yield: A transformed FlatBatch.
+        :rtype: Iterator[FlatBatch]
+        """
+
+        for batch in batches:
+            yield self.mapping_plan.transform_batch(batch)
+
+    @staticmethod
+    def get_records_from_batches(flat_batches: Iterable[FlatBatch]) -> Iterator[dict]:
+        """Convert transformed batches into records.
+
+        :param flat_batches: An iterable of FlatBatches.
+        :type flat_batches: Iterable[FlatBatch]
+        :yield: A record.
+        :rtype: Iterator[dict]
+        """
+
+        for flat_batch in flat_batches:
+            yield from flat_batch.get_records()
+
+    def get_generated_source(self) -> str:
+        """Return the source of the mapper functions generated by the "codegen" and "slots" engines.
+
+        :return: The source of the generated functions.
+        :rtype: str
+        """
+
+        return self.mapping_plan.get_generated_source()
+
+    def update_date_stats(self, parallel_transformer: "ParallelTransformer" = None):
+        """Take the counters of the cache of parsed dates since the last reset into the stats.
+
+        The hits and misses are in "date_cache", and the number of dates parsed
+        with each format of toDate in "date_formats".
+
+        :param parallel_transformer: The transformer of the workers, if any, to include their caches.
+            Defaults to None.
+        :type parallel_transformer: ParallelTransformer, optional
+        """
+
+        date_cache_counts = BuiltinFunctions.date_parse_cache.reset_counts()
+
+        if parallel_transformer is not None:
+            DateParseCache.add_counts(date_cache_counts, parallel_transformer.date_cache_counts)
+
+        self.stats["date_formats"] = date_cache_counts.pop("formats")
+        self.stats["date_cache"] = date_cache_counts
+
+    def can_copy_avro_blocks(self, avro_reader: "AvroReader", base_schema_to_write: dict,
+                             output_opts: dict) -> bool:
+        """Check if the blocks of an avro file can be copied to the output file, as an identity mapping.
+
+        :param avro_reader: The reader of the input file, in the memory-mapped mode.
+        :type avro_reader: AvroReader
+        :param base_schema_to_write: The base schema used to write.
+        :type base_schema_to_write: dict
+        :param output_opts: A dict-like set of options to be able to handle the behaviour of the output.
+        :type output_opts: dict
+        :return: True if the input file, the mapping and the output have the same fields and codec.
+        :rtype: bool
+        """
+
+        if avro_reader.get_codec() != output_opts.get("avro_codec", "null"):
+            return False
+
+        fields_forms = [
+            self.get_fields_canonical_form(schema)
+            for schema in (avro_reader.get_writer_schema(), self.original_base_schema, base_schema_to_write)
+        ]
 
-        # Apply the record transformations.
-        transformed_record, transformed_flat_schema = all_functions(flat_record, base_flat_schema)
+        return fields_forms[0] is not None and fields_forms.count(fields_forms[0]) == len(fields_forms)
 
-        # Convert the transformed record to the original format.
-        normal_record = FlatRecordBuilder.get_normal_record_from_flat_record(transformed_record)
+    def copy_avro_blocks(self, avro_reader: "AvroReader", paths_to_write: dict, base_schema_to_write: dict = None,
+                         nested_schemas_to_write: List[dict] = None, output_opts: dict = {}):
+        """Copy the blocks of an avro file to the output files, without transforming the records.
 
-        return normal_record
+        The records are only decoded to write the csv file.
+
+        :param avro_reader: The reader of the input file, in the memory-mapped mode.
+        :type avro_reader: AvroReader
+        :param paths_to_write: A dict with the formats and the paths that will be written.
+        :type paths_to_write: dict
+        :param base_schema_to_write: A base schema used in the writing process. Defaults to None.
+        :type base_schema_to_write: dict, optional
+        :param nested_schemas_to_write: A list of nested schemas used in the write process. Defaults to None.
+        :type nested_schemas_to_write: List[dict], optional
+        :param output_opts: A dict-like set of options to be able to handle the behaviour of the output.
+        :type output_opts: dict, optional
+        :raises RuntimeError: Raises and error if there is not a specified path for the avro format.
+        """
+
+        self.stats["read_count"] = 0
+        self.stats["write_count"] = {}
+
+        base_schema_to_write = base_schema_to_write or self.original_base_schema
+        nested_schemas_to_write = nested_schemas_to_write or self.original_nested_schemas
+
+        if "avro" not in paths_to_write:
+            raise RuntimeError("It is necessary a path to write an Avro File!")
+
+        from RecordMapper.avro.AvroWriter import AvroWriter
+        writers = {
+            "avro": AvroWriter(paths_to_write["avro"], base_schema_to_write, nested_schemas_to_write, output_opts)
+        }
+        if "csv" in paths_to_write:
+            writers["csv"] = self.get_csv_writer(paths_to_write["csv"], base_schema_to_write, nested_schemas_to_write,
+                                                 output_opts)
+
+        opened_writers = []
+
+        try:
+            try:
+                writers["avro"].open({**output_opts, "avro_copy_blocks": True})
+                opened_writers.append(writers["avro"])
+                if "csv" in writers:
+                    writers["csv"].open(output_opts)
+                    opened_writers.append(writers["csv"])
+
+                for block_start, block_end, record_count, compressed_block in avro_reader.read_raw_blocks():
+                    writers["avro"].write_compressed_block(record_count, compressed_block)
+                    compressed_block.release()
+
+                    if "csv" in writers:
+                        for record in avro_reader.read_records_from_block(block_start, block_end):
+                            writers["csv"].write_record(record)
+
+                    self.stats["read_count"] += record_count
+            finally:
+                FanOutWriter.close_writers(opened_writers)
+        except BaseException:
+            # As in write_records, the csv file is not left incomplete.
+            FanOutWriter.remove_outputs([writers["csv"]] if "csv" in writers else [])
+            raise
+        finally:
+            avro_reader.close()
+
+        self.stats["write_count"] = {name: writer.write_count for name, writer in writers.items()}
+
+    @staticmethod
+    def get_fields_canonical_form(schema: object) -> str:
+        """Return the canonical form of the fields of a record schema (ignoring its name, aliases or defaults).
+
+        :param schema: An avro schema.
+        :type schema: object
+        :return: The canonical form, or None if the schema is not a record schema with a valid canonical form.
+        :rtype: str
+        """
+
+        if not isinstance(schema, dict) or schema.get("type") != "record":
+            return None
+
+        import fastavro
+
+        try:
+            return fastavro.schema.to_parsing_canonical_form(
+                {"type": "record", "name": "Fields", "fields": schema["fields"]}
+            )
+        except Exception:
+            return None
 
     def read_records(self, input_format: str, path_to_read: str, opts: dict = {}) -> Iterator[dict]:
         """Read records from an input file.
@@ -160,6 +418,8 @@ class RecordMapper(object):
         :param path_to_read: The path of the file.
         :type path_to_read: str
         :param opts: Some special options in the read process. Defaults to {}.
+            The "xml_streaming" option reads the xml records while the file is parsed.
+            The "avro_memory_map" option maps the avro files in memory instead of reading them.
         :type opts: dict, optional
         :raises RuntimeError: The format is not supported by the RecordMapper.
         :yield:
@@ -169,11 +429,14 @@ class RecordMapper(object):
         self.stats["read_count"] = 0
 
         if input_format == "avro":
-            reader_object = AvroReader(path_to_read)
+            from RecordMapper.avro.AvroReader import AvroReader
+            reader_object = AvroReader(path_to_read, opts.get("avro_memory_map", False))
         elif input_format == "csv":
+            from RecordMapper.csv.CSVReader import CSVReader
             reader_object = CSVReader(path_to_read)
         elif input_format == "xml":
-            reader_object = XMLReader(path_to_read)
+            from RecordMapper.xml.XMLReader import XMLReader
+            reader_object = XMLReader(path_to_read, opts.get("xml_streaming", False))
         else:
             raise RuntimeError(f"Invalid input format: {input_format}")
 
@@ -183,6 +446,21 @@ class RecordMapper(object):
 
         reader_object.close()
 
+    def count_read_records(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Count the records read by other objects (for example, the workers) in the stats.
+
+        :param records: An iterable of records.
+        :type records: Iterable[dict]
+        :yield: A record.
+        :rtype: Iterator[dict]
+        """
+
+        self.stats["read_count"] = 0
+
+        for record in records:
+            self.stats["read_count"] += 1
+            yield record
+
     def write_records(self, records_list: Iterable, paths_to_write: dict, base_schema_to_write: dict = None,
                       nested_schemas_to_write: List[dict] = None, output_opts: dict = {}):
         """Write transformed records to one or several formats.
@@ -191,6 +469,12 @@ class RecordMapper(object):
           The Record Mapper is able to write in both, csv and avro formats.
           But it is always necessary writing an avro file at least.
 
+        All the files are written in a single pass (see FanOutWriter). The csv
+        file gets the records as they would be read from the Avro file, so it
+        is the same as writing it from the Avro file. If the writing fails, the
+        csv file is removed, as it would not be written from an incomplete
+        Avro file.
+
         :param records_list: An iterable of records.
         :type records_list: Iterable
         :param paths_to_write: A dict with the formats and the paths that will be written.
@@ -203,7 +487,8 @@ class RecordMapper(object):
             different from the one used in the transform process. Defaults to None.
         :type nested_schemas_to_write: List[dict], optional
         :param output_opts: A dict-like set of options to be able to handle the behaviour
-            of the output.
+            of the output. The "write_buffer_size" option sets the maximum number of records
+            buffered before writing them to the files (1000 by default).
         :type output_opts: dict, optional
         :raises RuntimeError: Raises and error if there is not a specified path for the avro format.
         """
@@ -219,31 +504,56 @@ class RecordMapper(object):
         if "avro" not in paths_to_write:
             raise RuntimeError("It is necessary a path to write an Avro File!")
 
-        # Write the Avro file (mandatory).
+        from RecordMapper.avro.AvroWriter import AvroWriter
+
+        # The Avro file (mandatory) is the first sink.
+        fan_out_writer = FanOutWriter(output_opts.get("write_buffer_size", 1000))
         writer_avro = AvroWriter(
             paths_to_write["avro"],
             base_schema_to_write,
             nested_schemas_to_write,
             output_opts
         )
-        writer_avro.write_records(records_list, output_opts)
-        self.stats["write_count"]["avro"] = writer_avro.write_count
-        writer_avro.close()
+        fan_out_writer.add_sink("avro", writer_avro, output_opts)
 
-        # Write the csv file (optional).
+        # The csv file (optional) receives the records as they are read from the Avro file.
         if "csv" in paths_to_write:
-            fieldnames = [field["name"] for field in base_schema_to_write["fields"]]
-
-            # If requested, flatten the nested schemas.
-            if output_opts.get("flat_nested_schema_on_csv") is not None:
-                keys = output_opts["flat_nested_schema_on_csv"].values()
-                fieldnames_nested = [nested_schema['fields'] for nested_schema in nested_schemas_to_write if
-                                     nested_schema['name'] in keys]
-                fields_concatenated = list(itertools.chain.from_iterable(fieldnames_nested))
-                fieldnames_concatenated = [entry['name'] for entry in fields_concatenated]
-                fieldnames += fieldnames_concatenated
-
-            records = AvroReader(paths_to_write["avro"]).read_records()
-            writer_csv = CSVWriter(paths_to_write["csv"], fieldnames)
-            writer_csv.write_records(records, output_opts)
-            self.stats["write_count"]["csv"] = writer_csv.write_count
+            writer_csv = self.get_csv_writer(paths_to_write["csv"], base_schema_to_write, nested_schemas_to_write,
+                                             output_opts)
+            fan_out_writer.add_sink("csv", writer_csv, output_opts, writer_avro.get_projector().project,
+                                    remove_on_error=True)
+
+        # Write all the files in a single pass.
+        fan_out_writer.write_records(records_list)
+        self.stats["write_count"] = fan_out_writer.get_write_counts()
+
+    def get_csv_writer(self, path_to_write: str, base_schema_to_write: dict, nested_schemas_to_write: List[dict],
+                       output_opts: dict) -> "CSVWriter":
+        """Build the writer of the csv file, with a column for each field of the output schema.
+
+        :param path_to_write: The path of the csv file.
+        :type path_to_write: str
+        :param base_schema_to_write: The base schema used to write.
+        :type base_schema_to_write: dict
+        :param nested_schemas_to_write: The nested schemas used to write.
+        :type nested_schemas_to_write: List[dict]
+        :param output_opts: A dict-like set of options to be able to handle the behaviour of the output.
+        :type output_opts: dict
+        :return: The csv writer.
+        :rtype: CSVWriter
+        """
+
+        fieldnames = [field["name"] for field in base_schema_to_write["fields"]]
+
+        # If requested, flatten the nested schemas.
+        if output_opts.get("flat_nested_schema_on_csv") is not None:
+            keys = output_opts["flat_nested_schema_on_csv"].values()
+            fieldnames_nested = [nested_schema['fields'] for nested_schema in nested_schemas_to_write if
+                                 nested_schema['name'] in keys]
+            fields_concatenated = list(itertools.chain.from_iterable(fieldnames_nested))
+            fieldnames_concatenated = [entry['name'] for entry in fields_concatenated]
+            fieldnames += fieldnames_concatenated
+
+        from RecordMapper.csv.CSVWriter import CSVWriter
+
+        return CSVWriter(path_to_write, fieldnames)
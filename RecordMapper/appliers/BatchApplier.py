@@ -0,0 +1,194 @@
+from typing import Callable, Dict, List, Sequence
+
+from RecordMapper.builders.BatchBuilder import FlatBatch, BatchContext, column_as_list
+from RecordMapper.builders.SchemaPlanBuilder import SchemaPlanBuilder
+from RecordMapper.builders.SlotRecordBuilder import EMPTY_SLOT
+
+
+class BatchApplier(object):
+    """An applier that executes the rename, transform and clean steps over a FlatBatch.
+
+    It gives the same records as chaining RenameApplier, TransformApplier
+    and CleanApplier over each record of the batch, but it works column by
+    column: the renaming copies whole columns and each transform function
+    is executed over a whole column before the next one.
+    """
+
+    def __init__(self, custom_variables: dict):
+        """The constructor of the applier.
+
+        :param custom_variables: A dict of custom variables.
+        :type custom_variables: dict
+        """
+
+        self.custom_variables = custom_variables
+
+    def apply(self, flat_batch: FlatBatch, flat_schema: dict) -> (FlatBatch, dict):
+        """Execute the function of this applier.
+
+        All the records of the batch must use the same (complete) flat schema.
+
+        As an applier, the output is the transformed batch and schema.
+        In BatchApplier, only the batch is transformed.
+
+        :param flat_batch: The input FlatBatch.
+        :type flat_batch: FlatBatch
+        :param flat_schema: The flat schema of all the records of the batch.
+        :type flat_schema: dict
+        :return: The renamed, transformed and clean batch and the original flat schema.
+        :rtype: (FlatBatch, dict)
+        """
+
+        schema_plan = SchemaPlanBuilder.get_schema_plan(flat_schema)
+        columns = {**flat_batch.columns}
+        size = flat_batch.size
+
+        # Rename step: Copy the values of the aliases (only in the records that have them).
+        for field_key, alias_key in schema_plan.aliases:
+            if alias_key in columns:
+                columns[field_key] = self.merge_columns(columns.get(field_key), columns[alias_key])
+
+        # Transform step.
+        for transforms_by_key in schema_plan.phases:
+            columns = self.apply_phase(transforms_by_key, columns, size, flat_schema)
+
+        # Clean step: Keep only the fields of the schema.
+        columns = {
+            field_key: columns[field_key]
+            for field_key in schema_plan.keys
+            if field_key in columns
+        }
+
+        return FlatBatch(columns, size), flat_schema
+
+    def apply_phase(self, transforms_by_key: List[tuple], columns: Dict[tuple, Sequence], size: int,
+                    flat_schema: dict) -> Dict[tuple, Sequence]:
+        """Execute the transform functions of a single phase over the columns of a batch.
+
+        :param transforms_by_key: The (key, transform_function) pairs of the phase.
+        :type transforms_by_key: List[tuple]
+        :param columns: The columns at the start of the phase.
+        :type columns: Dict[tuple, Sequence]
+        :param size: The number of records of the batch.
+        :type size: int
+        :param flat_schema: The flat schema of the batch.
+        :type flat_schema: dict
+        :raises RuntimeError: A transform function returns an invalid result.
+        :return: The columns at the end of the phase.
+        :rtype: Dict[tuple, Sequence]
+        """
+
+        # Every function of the phase sees the columns at the start of the phase.
+        batch_context = BatchContext(columns, size, flat_schema, self.custom_variables)
+        new_columns_in_this_phase = {}
+        # The new columns created in this phase, which can be modified in place.
+        own_columns = set()
+
+        for key, transform_function in transforms_by_key:
+            results = self.apply_transform_function(transform_function, key, batch_context)
+
+            # The simple values replace the whole column (the last value of each key in the phase wins).
+            if not self.has_tuples(results):
+                new_columns_in_this_phase[key] = results
+                own_columns.discard(key)
+                continue
+
+            # A tuple result also updates other keys of its record.
+            new_column = list(new_columns_in_this_phase.get(key, [EMPTY_SLOT] * size))
+            new_columns_in_this_phase[key] = new_column
+            own_columns.add(key)
+
+            for index, res in enumerate(results):
+                if type(res) is not tuple:
+                    new_column[index] = res
+                elif len(res) == 2 and type(res[1]) is dict:
+                    new_column[index] = res[0]
+                    for update_key, update_value in res[1].items():
+                        if update_key not in own_columns:
+                            new_columns_in_this_phase[update_key] = list(
+                                new_columns_in_this_phase.get(update_key, [EMPTY_SLOT] * size)
+                            )
+                            own_columns.add(update_key)
+                        new_columns_in_this_phase[update_key][index] = update_value
+                else:
+                    raise RuntimeError(f"Invalid result in a transform function of the key: '{key}'")
+
+        columns = {**columns}
+
+        for key, new_column in new_columns_in_this_phase.items():
+            columns[key] = self.merge_columns(columns.get(key), new_column)
+
+        return columns
+
+    @staticmethod
+    def apply_transform_function(transform_function: Callable, key: tuple, batch_context: BatchContext) -> Sequence:
+        """Execute a transform function over a column.
+
+        If the function has a batch implementation (in its "batch_function"
+        attribute), it is executed once with the whole column. If not, the
+        function is executed for each record.
+
+        :param transform_function: The transform function.
+        :type transform_function: Callable
+        :param key: The key of the transformed column.
+        :type key: tuple
+        :param batch_context: The context of the batch at the start of the phase.
+        :type batch_context: BatchContext
+        :raises RuntimeError: The batch implementation does not return a result for each record.
+        :return: The result of the function for each record.
+        :rtype: Sequence
+        """
+
+        batch_function = getattr(transform_function, "batch_function", None)
+
+        if batch_function is not None:
+            results = batch_function(batch_context.get_column(key), batch_context)
+            if len(results) != batch_context.size:
+                raise RuntimeError(f"Invalid number of results in a batch function of the key: '{key}'")
+            return results
+
+        flat_schema = batch_context.flat_schema
+        custom_variables = batch_context.custom_variables
+        get_record = batch_context.get_record
+
+        return [
+            transform_function(value, get_record(index), flat_schema, custom_variables)
+            for index, value in enumerate(column_as_list(batch_context.get_column(key)))
+        ]
+
+    @staticmethod
+    def has_tuples(column: Sequence) -> bool:
+        """Check if a column of results contains any tuple.
+
+        :param column: A column of results.
+        :type column: Sequence
+        :return: True if there is any tuple in the column.
+        :rtype: bool
+        """
+
+        # The NumPy arrays of numbers or strings can not contain tuples.
+        if not isinstance(column, list) and getattr(column, "dtype", object) != object:
+            return False
+
+        return any(type(res) is tuple for res in column)
+
+    @staticmethod
+    def merge_columns(old_column: Sequence, new_column: Sequence) -> Sequence:
+        """Merge two columns, taking the values of the new one when they are not empty.
+
+        :param old_column: The old column (or None if there is no old column).
+        :type old_column: Sequence
+        :param new_column: The new column.
+        :type new_column: Sequence
+        :return: The merged column.
+        :rtype: Sequence
+        """
+
+        if old_column is None or not isinstance(new_column, list) or \
+                not any(new_value is EMPTY_SLOT for new_value in new_column):
+            return new_column
+
+        return [
+            new_value if new_value is not EMPTY_SLOT else old_value
+            for old_value, new_value in zip(column_as_list(old_column), new_column)
+        ]
@@ -1,3 +1,4 @@
+from RecordMapper.builders.SchemaPlanBuilder import SchemaPlanBuilder
 
 
 class CleanApplier(object):
@@ -33,7 +34,7 @@ class CleanApplier(object):
         
         new_record = {}
 
-        for field_key, field_data in flat_schema.items():
+        for field_key in SchemaPlanBuilder.get_schema_plan(flat_schema).keys:
 
             if field_key in flat_record:
                 new_record[field_key] = flat_record[field_key]
@@ -0,0 +1,73 @@
+from RecordMapper.builders.SchemaPlanBuilder import SchemaPlanBuilder
+
+
+class FusedApplier(object):
+    """An applier that executes the rename, transform and clean steps in a single pass.
+
+    It gives the same results as chaining RenameApplier, TransformApplier and
+    CleanApplier, but without copying the record in each step: the renaming and
+    the transform phases work in place on the input record, and only the clean
+    output record is created.
+    """
+
+    def __init__(self, custom_variables: dict):
+        """The constructor of the applier.
+
+        :param custom_variables: A dict of custom variables.
+        :type custom_variables: dict
+        """
+
+        self.custom_variables = custom_variables
+
+    def apply(self, flat_record: dict, flat_schema: dict) -> (dict, dict):
+        """Execute the function of this applier.
+
+        IMPORTANT NOTE:
+          The input record is modified, so it must not be used after
+          calling this function (as it happens with the FlatRecords
+          created by the MappingPlan).
+
+        As an applier, the output is the transformed record and schema.
+        In FusedApplier, only the record is transformed.
+
+        :param flat_record: The input flat record. It is modified in place.
+        :type flat_record: dict
+        :param flat_schema: The input flat schema.
+        :type flat_schema: dict
+        :return: The renamed, transformed and clean record and the original flat schema.
+        :rtype: (dict, dict)
+        """
+
+        schema_plan = SchemaPlanBuilder.get_schema_plan(flat_schema)
+        custom_variables = self.custom_variables
+
+        # Rename step: Copy the values of the aliases.
+        for field_key, alias_key in schema_plan.aliases:
+            if alias_key in flat_record:
+                flat_record[field_key] = flat_record[alias_key]
+
+        # Transform step: Each phase only updates the keys that it changes.
+        for transforms_by_key in schema_plan.phases:
+            new_values_in_this_phase = {}
+
+            for key, transform_function in transforms_by_key:
+                res = transform_function(flat_record.get(key), flat_record, flat_schema, custom_variables)
+
+                if type(res) is not tuple:
+                    new_values_in_this_phase[key] = res
+                elif len(res) == 2 and type(res[1]) is dict:
+                    new_values_in_this_phase[key] = res[0]
+                    new_values_in_this_phase.update(res[1])
+                else:
+                    raise RuntimeError(f"Invalid result in a transform function of the key: '{key}'")
+
+            flat_record.update(new_values_in_this_phase)
+
+        # Clean step: Keep only the fields of the schema.
+        new_record = {
+            field_key: flat_record[field_key]
+            for field_key in schema_plan.keys
+            if field_key in flat_record
+        }
+
+        return new_record, flat_schema
@@ -1,5 +1,7 @@
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 from RecordMapper.builders.FlatSchemaBuilder import FieldData
+from RecordMapper.builders.SchemaPlanBuilder import SchemaPlanBuilder
 
 
 class NestedSchemaSelectorApplier(object):
@@ -7,6 +9,8 @@ class NestedSchemaSelectorApplier(object):
     the nestedSchemaSelector function from a schema field.
     """
 
+    max_cached_schemas = 256
+
     def __init__(self, flat_schemas: Dict[str, dict], custom_variables: dict):
         """The constructor function of this class.
 
@@ -19,7 +23,10 @@ class NestedSchemaSelectorApplier(object):
         self.flat_schemas = flat_schemas
         self.custom_variables = custom_variables
 
-    def apply(self, record: dict, base_flat_schema: dict) -> (dict, dict):
+        # The complete FlatSchemas already built, indexed by base schema and selected nested schemas.
+        self.complete_flat_schemas = {}
+
+    def apply(self, record: dict, base_flat_schema: dict) -> (dict, Mapping):
         """Execute the function of this applier.
 
         If a field has any nested schemas, this applier creates a new
@@ -27,31 +34,73 @@ class NestedSchemaSelectorApplier(object):
         to the resulting flat schema) using the function defined in
         the value "nestedSchemaSelector" of a schema field.
 
+        Each selector is called once per record. Only a few combinations of
+        nested schemas are usually selected, so the complete flat schema of
+        each combination is built once and shared (as a read-only mapping)
+        by all the records that select it.
+
         As an applier, the output is the transformed record and schema.
         In NestedSchemaSelectorApplier, only the schema is transformed.
 
-        :param record: The input record. 
+        :param record: The input record.
         :type record: dict
-        :param base_flat_schema: The input base flat schema. 
-        :type base_flat_schema: dict. 
+        :param base_flat_schema: The input base flat schema.
+        :type base_flat_schema: dict.
         :return: The record (unmodified) and the flat schema
             (modified with the selected nested schemas).
-        :rtype: (dict, dict)
+        :rtype: (dict, Mapping)
         """
 
+        selectors = SchemaPlanBuilder.get_schema_plan(base_flat_schema).selectors
+
+        # Identify the nested schema names.
+        nested_schema_names = tuple(
+            selector(field_key, record, self.custom_variables)
+            for field_key, selector in selectors
+        )
+
+        return record, self.get_complete_flat_schema(base_flat_schema, nested_schema_names)
+
+    def get_complete_flat_schema(self, base_flat_schema: dict, nested_schema_names: Tuple[str, ...]) -> Mapping:
+        """Return the complete flat schema for a selection of nested schemas.
+
+        The complete flat schema is built only the first time that a
+        selection is found, and then it is cached.
+
+        :param base_flat_schema: The input base flat schema.
+        :type base_flat_schema: dict
+        :param nested_schema_names: The selected nested schema name (or None) of
+            each field with a selector, in schema order.
+        :type nested_schema_names: Tuple[str, ...]
+        :return: The complete flat schema, as a read-only mapping.
+        :rtype: Mapping
+        """
+
+        cache_key = (id(base_flat_schema), nested_schema_names)
+
+        # The cached entry keeps a reference to the base schema, so its id cannot be reused.
+        cached_entry = self.complete_flat_schemas.get(cache_key)
+        if cached_entry is not None and cached_entry[0] is base_flat_schema:
+            return cached_entry[1]
+
         # The value that will be returned with the record.
         complete_flat_schema = {**base_flat_schema}
 
-        # Look for the fields that include a nested schema selector.
-        for field_key, field_data in base_flat_schema.items():
+        selectors = SchemaPlanBuilder.get_schema_plan(base_flat_schema).selectors
+
+        for (field_key, _), nested_schema_name in zip(selectors, nested_schema_names):
+            complete_flat_schema = self.add_nested_schema_fields(complete_flat_schema, field_key, nested_schema_name)
+            # Remove the parent key of the nested schemas from the complete schema.
+            del complete_flat_schema[field_key]
 
-            if field_data.selector is not None:
-                complete_flat_schema = self.select_nested_schema_and_add_their_fields(record, complete_flat_schema,
-                                                                                      field_key, field_data)
-                # Remove the parent key of the nested schemas from the complete schema.
-                del complete_flat_schema[field_key]
+        complete_flat_schema = MappingProxyType(complete_flat_schema)
 
-        return record, complete_flat_schema
+        # Discard the oldest schema when the cache is full.
+        if len(self.complete_flat_schemas) >= self.max_cached_schemas:
+            del self.complete_flat_schemas[next(iter(self.complete_flat_schemas))]
+        self.complete_flat_schemas[cache_key] = (base_flat_schema, complete_flat_schema)
+
+        return complete_flat_schema
 
     def select_nested_schema_and_add_their_fields(self, record: dict, flat_schema: dict, field_key: str,
                                                   field_data: FieldData) -> dict:
@@ -75,9 +124,24 @@ class NestedSchemaSelectorApplier(object):
 
         # Identify the nested schema name.
         nested_schema_name = field_data.selector(field_key, record, self.custom_variables) \
-            if (field_data.selector is not None) \
-               and (field_data.selector(field_key, record, self.custom_variables) is not None) \
-            else None
+            if field_data.selector is not None else None
+
+        return self.add_nested_schema_fields(flat_schema, field_key, nested_schema_name)
+
+    def add_nested_schema_fields(self, flat_schema: dict, field_key: str, nested_schema_name: str) -> dict:
+        """Add the fields of a selected nested schema to the resulting flat schema.
+
+        :param flat_schema: The input flat schema.
+        :type flat_schema: dict
+        :param field_key: The key of the field with the nested schemas.
+        :type field_key: str
+        :param nested_schema_name: The name of the selected nested schema (or None).
+        :type nested_schema_name: str
+        :raises RuntimeError: This function will raise if the selected nested
+            schema name is not valid.
+        :return: The modified flat Schema.
+        :rtype: dict
+        """
 
         # If there is no a nested schema, just skip.
         if nested_schema_name is None:
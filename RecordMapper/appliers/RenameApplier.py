@@ -2,6 +2,8 @@ from typing import List, Union
 
 from collections import namedtuple
 
+from RecordMapper.builders.SchemaPlanBuilder import SchemaPlanBuilder
+
 
 class RenameApplier(object):
     """An applier that applies a renaming process using the defined aliases
@@ -45,11 +47,9 @@ class RenameApplier(object):
         new_record = {**flat_record}
 
         # Rename each field from the original record (if corresponds).
-        for field_key, field_data in flat_schema.items():
-
-            for alias in field_data.aliases:
-                # The identifier keys in records are tuples.
-                if (alias,) in new_record:
-                    new_record[field_key] = new_record[(alias,)]
+        # The identifier keys in records are tuples, so the aliases are stored as tuples in the SchemaPlan.
+        for field_key, alias_key in SchemaPlanBuilder.get_schema_plan(flat_schema).aliases:
+            if alias_key in new_record:
+                new_record[field_key] = new_record[alias_key]
 
         return new_record, flat_schema
@@ -4,6 +4,8 @@ from collections import namedtuple
 from inspect import getmembers, isfunction
 from typing import Callable, List
 
+from RecordMapper.builders.SchemaPlanBuilder import SchemaPlanBuilder
+
 
 class TransformApplier(object):
     """This applier executes the defined transformations for each field.
@@ -28,6 +30,11 @@ class TransformApplier(object):
         phases. Each phase receives the resulting record of the previous
         one (except the first phase, that receives the initial record).
 
+        The (key, function) pairs of each phase come from the SchemaPlan
+        of the flat schema, so they are computed only once per schema.
+        The values of a phase are calculated from the record as it was
+        at the start of the phase and then updated in place.
+
         As an applier, the output is the transformed record and schema.
         In TransformApplier, only the record is transformed.
 
@@ -39,24 +46,24 @@ class TransformApplier(object):
         :rtype: (dict, dict)
         """
 
-        # The maximum number of transform phases to perform.
-        max_phases = max([len(field_data.transforms) for _, field_data in flat_schema.items()])
+        # The transforming functions of each phase, computed once per FlatSchema.
+        phases = SchemaPlanBuilder.get_schema_plan(flat_schema).phases
+
+        if not phases:
+            return flat_record, flat_schema
+
+        custom_variables = self.custom_variables
 
         # Initial copy of the record, which will be transformed.
         new_record = {**flat_record} 
 
         # Iterate over different phases getting the transforming functions.
-        for phase_index in range(max_phases):
+        for transforms_by_key in phases:
             new_values_in_this_phase = {}
-            transforms_by_key = [
-               (field_key, field_data.transforms[phase_index])
-               for field_key, field_data in flat_schema.items()
-               if phase_index < len(field_data.transforms) and field_data.transforms[phase_index] is not None
-            ]
 
             # Iterate over the transform functions.
             for key, transform_function in transforms_by_key:
-                res = transform_function(new_record.get(key), new_record, flat_schema, self.custom_variables)
+                res = transform_function(new_record.get(key), new_record, flat_schema, custom_variables)
 
                 # If res is a single value, it modifies only the current value.
                 if type(res) is not tuple:
@@ -70,6 +77,7 @@ class TransformApplier(object):
                 else:
                     raise RuntimeError(f"Invalid result in a transform function of the key: '{key}'")
             
-            new_record = {**new_record, **new_values_in_this_phase}
+            # Only the keys changed in this phase are updated.
+            new_record.update(new_values_in_this_phase)
 
         return new_record, flat_schema
@@ -1,4 +1,6 @@
 from .RenameApplier import RenameApplier
 from .TransformApplier import TransformApplier
 from .NestedSchemaSelectorApplier import NestedSchemaSelectorApplier
-from .CleanApplier import CleanApplier
\ No newline at end of file
+from .CleanApplier import CleanApplier
+from .FusedApplier import FusedApplier
+from .BatchApplier import BatchApplier
\ No newline at end of file
@@ -0,0 +1,303 @@
+import bz2
+import io
+import lzma
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Tuple
+
+import fastavro
+
+
+class AvroBlockWriter(object):
+    """A writer of avro container files, block by block.
+
+    The records are encoded by fastavro into blocks without compression and,
+    when a block reaches the sync interval, it is compressed and appended to
+    the output. The blocks can also be compressed in a pool of threads while
+    the next blocks are encoded (the compression libraries release the
+    GIL), and they are appended in order.
+
+    Blocks encoded or compressed somewhere else can be appended too, as
+    long as they use the schema and the codec of the writer.
+    """
+
+    def __init__(self, output: BinaryIO, parsed_schema: dict, codec: str = "null", compression_level: int = None,
+                 sync_interval: int = 16000, compression_threads: int = 0, metadata: dict = None,
+                 sync_marker: bytes = None):
+        """The constructor of the AvroBlockWriter. It writes the header of the file.
+
+        :param output: The output stream.
+        :type output: BinaryIO
+        :param parsed_schema: A parsed (and expanded) avro schema.
+        :type parsed_schema: dict
+        :param codec: The compression codec of the blocks. Defaults to "null".
+        :type codec: str, optional
+        :param compression_level: The compression level of the codec. Defaults to None (the codec default).
+        :type compression_level: int, optional
+        :param sync_interval: The approximate size of each block before compressing it. Defaults to 16000.
+        :type sync_interval: int, optional
+        :param compression_threads: The number of threads that compress the blocks. Defaults to 0
+            (the blocks are compressed when they are full, in this thread).
+        :type compression_threads: int, optional
+        :param metadata: Additional metadata of the header. Defaults to None.
+        :type metadata: dict, optional
+        :param sync_marker: The sync marker of the file. Defaults to None (a random one).
+        :type sync_marker: bytes, optional
+        :raises RuntimeError: The codec is not supported.
+        """
+
+        self.output = output
+        self.parsed_schema = parsed_schema
+        self.compress = self.get_compression_function(codec, compression_level)
+        self.sync_interval = sync_interval
+        self.compression_threads = compression_threads
+        self.executor = None
+        self.pending_blocks = deque()
+        # The maximum number of blocks waiting for a compression thread or for being written.
+        self.max_pending_blocks = 2 * compression_threads
+
+        # fastavro writes the header, so it is the same as in the files written by fastavro.
+        header_output = io.BytesIO()
+        header_writer = fastavro.write.Writer(header_output, parsed_schema, codec=codec, metadata=metadata,
+                                             sync_marker=sync_marker)
+        self.sync_marker = header_writer.sync_marker
+        self.output.write(header_output.getvalue())
+
+        # fastavro also encodes the records, into blocks without compression that are taken when they are full.
+        self.encoded_blocks = io.BytesIO()
+        self.encoder = fastavro.write.Writer(self.encoded_blocks, parsed_schema, sync_interval=sync_interval,
+                                             sync_marker=self.sync_marker)
+        self.clear_encoded_blocks()
+
+    def write(self, record: dict):
+        """Encode a record into the current block.
+
+        :param record: A record.
+        :type record: dict
+        """
+
+        self.encoder.write(record)
+
+        if self.encoded_blocks.tell() > 0:
+            self.take_encoded_block()
+
+    def take_encoded_block(self):
+        """Take the block written by the encoder and send it to be compressed and written."""
+
+        encoded_block = self.encoded_blocks.getvalue()
+        self.clear_encoded_blocks()
+
+        record_count, position = self.decode_long(encoded_block, 0)
+        block_size, position = self.decode_long(encoded_block, position)
+
+        self.compress_block(record_count, encoded_block[position:position + block_size])
+
+    def dump(self):
+        """Send the current block, even if it is not full, to be compressed and written."""
+
+        self.encoder.flush()
+
+        if self.encoded_blocks.tell() > 0:
+            self.take_encoded_block()
+
+    def clear_encoded_blocks(self):
+        """Remove the blocks written by the encoder (or its header)."""
+
+        self.encoded_blocks.seek(0)
+        self.encoded_blocks.truncate()
+
+    def write_block(self, record_count: int, block_bytes: bytes):
+        """Compress and write a block of records encoded somewhere else.
+
+        :param record_count: The number of records of the block.
+        :type record_count: int
+        :param block_bytes: The encoded records, not compressed.
+        :type block_bytes: bytes
+        """
+
+        # The records written before must be written first.
+        self.dump()
+        self.compress_block(record_count, block_bytes)
+
+    def compress_block(self, record_count: int, block_bytes: bytes):
+        """Compress a block, in this thread or in the pool of threads, and write it.
+
+        :param record_count: The number of records of the block.
+        :type record_count: int
+        :param block_bytes: The encoded records, not compressed.
+        :type block_bytes: bytes
+        """
+
+        if self.compression_threads < 1:
+            self.append_block(record_count, self.compress(block_bytes))
+            return
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.compression_threads)
+
+        self.pending_blocks.append((record_count, self.executor.submit(self.compress, block_bytes)))
+
+        if len(self.pending_blocks) >= self.max_pending_blocks:
+            self.write_pending_block()
+
+    def write_pending_block(self):
+        """Wait for the compression of the oldest pending block and write it."""
+
+        record_count, compressed_block = self.pending_blocks.popleft()
+        self.append_block(record_count, compressed_block.result())
+
+    def write_compressed_block(self, record_count: int, compressed_bytes: bytes):
+        """Write a block that is already compressed with the codec of the writer.
+
+        :param record_count: The number of records of the block.
+        :type record_count: int
+        :param compressed_bytes: The compressed block.
+        :type compressed_bytes: bytes
+        """
+
+        # The records and the blocks written before must be written first.
+        self.dump()
+        while self.pending_blocks:
+            self.write_pending_block()
+
+        self.append_block(record_count, compressed_bytes)
+
+    def write_encoded_blocks(self, blocks: bytes):
+        """Write blocks encoded and compressed somewhere else, with the codec and the sync marker of the writer.
+
+        :param blocks: The blocks, each one with its record count, size and sync marker.
+        :type blocks: bytes
+        """
+
+        # The records and the blocks written before must be written first.
+        self.dump()
+        while self.pending_blocks:
+            self.write_pending_block()
+
+        self.output.write(blocks)
+
+    def append_block(self, record_count: int, compressed_bytes: bytes):
+        """Append a compressed block to the output, with its sync marker.
+
+        :param record_count: The number of records of the block.
+        :type record_count: int
+        :param compressed_bytes: The compressed block.
+        :type compressed_bytes: bytes
+        """
+
+        self.output.write(self.encode_long(record_count))
+        self.output.write(self.encode_long(len(compressed_bytes)))
+        self.output.write(compressed_bytes)
+        self.output.write(self.sync_marker)
+
+    def flush(self):
+        """Write the current block and the pending blocks, and stop the compression threads."""
+
+        self.dump()
+
+        while self.pending_blocks:
+            self.write_pending_block()
+
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        self.output.flush()
+
+    @staticmethod
+    def encode_long(value: int) -> bytes:
+        """Encode a long as a zigzag varint.
+
+        :param value: The long.
+        :type value: int
+        :return: The encoded long.
+        :rtype: bytes
+        """
+
+        value = (value << 1) ^ (value >> 63)
+        encoded = bytearray()
+
+        while value > 0x7F:
+            encoded.append((value & 0x7F) | 0x80)
+            value >>= 7
+        encoded.append(value)
+
+        return bytes(encoded)
+
+    @staticmethod
+    def decode_long(buffer: bytes, position: int) -> Tuple[int, int]:
+        """Decode a long encoded as a zigzag varint.
+
+        :param buffer: The buffer.
+        :type buffer: bytes
+        :param position: The position of the long in the buffer.
+        :type position: int
+        :return: The long and the position after it.
+        :rtype: Tuple[int, int]
+        """
+
+        value = 0
+        shift = 0
+
+        while True:
+            byte = buffer[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte & 0x80 == 0:
+                return (value >> 1) ^ -(value & 1), position
+            shift += 7
+
+    @staticmethod
+    def get_compression_function(codec: str, compression_level: int = None) -> Callable[[bytes], bytes]:
+        """Return the function that compresses the blocks with a codec, as fastavro does.
+
+        :param codec: The codec.
+        :type codec: str
+        :param compression_level: The compression level. Defaults to None (the codec default).
+        :type compression_level: int, optional
+        :raises RuntimeError: The codec is not supported or its library is not installed.
+        :return: The compression function.
+        :rtype: Callable[[bytes], bytes]
+        """
+
+        level_args = () if compression_level is None else (compression_level,)
+
+        if codec == "null":
+            return lambda block_bytes: block_bytes
+        elif codec == "deflate":
+            # The raw deflate data, without the zlib wrappers.
+            return lambda block_bytes: zlib.compress(block_bytes, *level_args)[2:-1]
+        elif codec == "bzip2":
+            return lambda block_bytes: bz2.compress(block_bytes, *level_args)
+        elif codec == "xz":
+            return lambda block_bytes: lzma.compress(block_bytes, preset=compression_level)
+        elif codec == "snappy":
+            snappy = AvroBlockWriter.import_codec_library(codec, "snappy")
+            return lambda block_bytes: snappy.compress(block_bytes) + zlib.crc32(block_bytes).to_bytes(4, "big")
+        elif codec == "zstandard":
+            zstandard = AvroBlockWriter.import_codec_library(codec, "zstandard")
+            return lambda block_bytes: zstandard.ZstdCompressor(*level_args).compress(block_bytes)
+        elif codec == "lz4":
+            lz4_block = AvroBlockWriter.import_codec_library(codec, "lz4.block")
+            return lambda block_bytes: lz4_block.compress(block_bytes)
+        else:
+            raise RuntimeError(f"Invalid avro codec: {codec}")
+
+    @staticmethod
+    def import_codec_library(codec: str, library: str) -> object:
+        """Import the library of a codec.
+
+        :param codec: The codec.
+        :type codec: str
+        :param library: The name of the module.
+        :type library: str
+        :raises RuntimeError: The library is not installed.
+        :return: The module.
+        :rtype: object
+        """
+
+        try:
+            return __import__(library, fromlist=["_"])
+        except ImportError:
+            raise RuntimeError(f"The avro codec {codec} needs the library {library}")
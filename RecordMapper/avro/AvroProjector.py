@@ -0,0 +1,231 @@
+import io
+import struct
+from typing import Callable, List
+
+import fastavro
+from fastavro.validation import validate
+
+
+class AvroProjector(object):
+    """A projector of records into an Avro schema.
+
+    It returns each record as it would be read from an Avro file after
+    writing it with the schema: the fields are sorted as in the schema,
+    the missing fields get their default value (or None), the fields that
+    are not in the schema are discarded and the values are converted to
+    the Avro types (for example, a "float" loses precision). This way,
+    the records can be sent to other outputs without reading the Avro file.
+
+    The records must be valid for the schema, that is, they must have been
+    written to an Avro file with the same schema before projecting them.
+    """
+
+    def __init__(self, base_schema: dict, nested_schemas: List[dict] = []):
+        """The constructor of the AvroProjector.
+
+        :param base_schema: A valid avro schema as a dict.
+        :type base_schema: dict
+        :param nested_schemas: The schemas of the named types used by the base schema. Defaults to [].
+        :type nested_schemas: List[dict], optional
+        """
+
+        named_schemas = {}
+        for nested_schema in nested_schemas:
+            fastavro.parse_schema(nested_schema, named_schemas)
+
+        # The named types are replaced by their definitions.
+        expanded_schema = fastavro.parse_schema(base_schema, named_schemas, expand=True)
+
+        self.project_record = self.get_projection_function(expanded_schema)
+
+    def project(self, record: dict) -> dict:
+        """Project a record into the schema.
+
+        :param record: A record, valid for the schema.
+        :type record: dict
+        :return: The projected record.
+        :rtype: dict
+        """
+
+        return self.project_record(record)
+
+    def get_projection_function(self, schema: object) -> Callable[[object], object]:
+        """Build the projection function of a (expanded) schema.
+
+        :param schema: An expanded avro schema.
+        :type schema: object
+        :return: A function that projects a value into the schema.
+        :rtype: Callable[[object], object]
+        """
+
+        if isinstance(schema, list):
+            return self.get_union_projection_function(schema)
+
+        if isinstance(schema, str):
+            schema_type = schema
+        elif "logicalType" in schema:
+            return self.get_round_trip_function(schema)
+        else:
+            schema_type = schema["type"]
+
+        if schema_type == "null":
+            return lambda value: None
+        elif schema_type == "boolean":
+            return bool
+        elif schema_type in ("int", "long"):
+            return int
+        elif schema_type == "float":
+            return lambda value: struct.unpack("<f", struct.pack("<f", value))[0]
+        elif schema_type == "double":
+            return float
+        elif schema_type in ("string", "bytes", "enum", "fixed"):
+            return lambda value: value
+        elif schema_type in ("record", "error"):
+            return self.get_record_projection_function(schema)
+        elif schema_type == "array":
+            project_item = self.get_projection_function(schema["items"])
+            return lambda value: [project_item(item) for item in value]
+        elif schema_type == "map":
+            project_value = self.get_projection_function(schema["values"])
+            return lambda value: {key: project_value(item) for key, item in value.items()}
+        elif isinstance(schema, dict):
+            return self.get_projection_function(schema_type)
+        else:
+            raise RuntimeError(f"Invalid avro type: {schema_type}")
+
+    def get_record_projection_function(self, schema: dict) -> Callable[[dict], dict]:
+        """Build the projection function of a record schema.
+
+        :param schema: An expanded record schema.
+        :type schema: dict
+        :return: A function that projects a record into the schema.
+        :rtype: Callable[[dict], dict]
+        """
+
+        fields = [
+            (field["name"], field.get("default"), self.get_projection_function(field["type"]))
+            for field in schema["fields"]
+        ]
+
+        def project_record(record: dict) -> dict:
+            return {
+                name: project_value(record.get(name, default))
+                for name, default, project_value in fields
+            }
+
+        return project_record
+
+    def get_union_projection_function(self, schema: list) -> Callable[[object], object]:
+        """Build the projection function of a union schema.
+
+        The type of the union is chosen as fastavro does when it writes the value.
+
+        :param schema: An expanded union schema.
+        :type schema: list
+        :return: A function that projects a value into the schema.
+        :rtype: Callable[[object], object]
+        """
+
+        projection_functions = [self.get_projection_function(candidate) for candidate in schema]
+        candidate_types = [self.get_type(candidate) for candidate in schema]
+        not_null_indexes = [index for index, candidate_type in enumerate(candidate_types) if candidate_type != "null"]
+
+        # The most common union, a type and null, does not need any validation.
+        if len(not_null_indexes) == 1 and len(schema) == 2:
+            project_not_null = projection_functions[not_null_indexes[0]]
+            return lambda value: project_not_null(value) if value is not None else None
+
+        def project_union(value: object) -> object:
+
+            # A (type name, value) tuple chooses the type.
+            if isinstance(value, tuple):
+                type_name, value = value
+                for index, candidate in enumerate(schema):
+                    if self.get_name(candidate) == type_name:
+                        return projection_functions[index](value)
+
+            best_match_index = -1
+            most_fields = -1
+
+            for index, candidate in enumerate(schema):
+                if not validate(value, candidate, raise_errors=False):
+                    continue
+
+                if candidate_types[index] == "record":
+                    fields = len(set(field["name"] for field in candidate["fields"]).intersection(value))
+                    if fields > most_fields:
+                        best_match_index = index
+                        most_fields = fields
+                elif candidate_types[index] == "float":
+                    # A "double" is preferred, as in fastavro.
+                    best_match_index = next(
+                        (double_index for double_index in range(index + 1, len(schema))
+                         if candidate_types[double_index] == "double"),
+                        index
+                    )
+                    break
+                else:
+                    best_match_index = index
+                    break
+
+            if best_match_index == -1:
+                raise RuntimeError(f"The value {value!r} does not match the union {schema}")
+
+            return projection_functions[best_match_index](value)
+
+        return project_union
+
+    @staticmethod
+    def get_round_trip_function(schema: dict) -> Callable[[object], object]:
+        """Build a projection function that writes and reads each value with fastavro.
+
+        It is used for the types whose conversions are not replicated by the
+        projector (the logical types).
+
+        :param schema: An expanded avro schema.
+        :type schema: dict
+        :return: A function that projects a value into the schema.
+        :rtype: Callable[[object], object]
+        """
+
+        parsed_schema = fastavro.parse_schema(schema)
+
+        def round_trip(value: object) -> object:
+            buffer = io.BytesIO()
+            fastavro.schemaless_writer(buffer, parsed_schema, value)
+            buffer.seek(0)
+            return fastavro.schemaless_reader(buffer, parsed_schema)
+
+        return round_trip
+
+    @staticmethod
+    def get_type(schema: object) -> str:
+        """Return the type of a schema.
+
+        :param schema: An expanded avro schema.
+        :type schema: object
+        :return: The type of the schema.
+        :rtype: str
+        """
+
+        if isinstance(schema, list):
+            return "union"
+        elif isinstance(schema, str):
+            return schema
+        else:
+            return AvroProjector.get_type(schema["type"])
+
+    @staticmethod
+    def get_name(schema: object) -> str:
+        """Return the name of a schema, as used in the (type name, value) tuples of the unions.
+
+        :param schema: An expanded avro schema.
+        :type schema: object
+        :return: The name of the schema.
+        :rtype: str
+        """
+
+        if isinstance(schema, dict) and schema.get("type") in ("record", "error", "enum", "fixed"):
+            return schema["name"]
+
+        return AvroProjector.get_type(schema)
@@ -1,23 +1,54 @@
-from typing import BinaryIO, Iterator
+import json
+import mmap
+from typing import BinaryIO, Iterator, List, Tuple
 
 import fastavro
+from fastavro.read import SYNC_SIZE
 
-from RecordMapper.common import Reader
+from RecordMapper.avro.AvroSplitter import AvroSplitter
+from RecordMapper.common import MemoryViewReader, Reader
 
 
 class AvroReader(Reader):
-    """A Record reader for Avro format."""
+    """A Record reader for Avro format.
 
-    def __init__(self, file_path: str):
+    In the memory-mapped mode, the file is mapped in memory instead of being
+    read through a buffered file, and the blocks are read from memoryview
+    slices of the mapping. This mode also reads the records from any block,
+    given its offset (see get_block_offsets).
+    """
+
+    def __init__(self, file_path: str, memory_map: bool = False):
         """Constructor of the AvroRecord.
 
         :param file_path: Path of the file to read.
         :type file_path: string
+        :param memory_map: If the file is mapped in memory. Defaults to False.
+        :type memory_map: bool, optional
         """
 
         super().__init__(file_path)
         self.read_options = "rb"
         self.reader = None
+        self.memory_map = memory_map
+        self.mapped_file = None
+        self.buffer = None
+        self.header = None
+        self.header_size = None
+
+    def read_records(self) -> Iterator[dict]:
+        """Open the file and read the records.
+
+        :return: Returns a generator of records.
+        :rtype: Iterator[dict]
+        """
+
+        if not self.memory_map:
+            return super().read_records()
+
+        self.open_memory_map()
+
+        return self.read_records_from_input(self.mapped_file)
 
     def read_records_from_input(self, input_stream: BinaryIO) -> Iterator[dict]:
         """Read records from an input stream in avro format.
@@ -33,3 +64,103 @@ class AvroReader(Reader):
         for record in self.reader:
             yield record
 
+    def open_memory_map(self):
+        """Map the file in memory, if it is not mapped yet, and read its header.
+
+        :raises RuntimeError: The file is not an avro file.
+        """
+
+        if self.mapped_file is not None:
+            return
+
+        self.input_stream = open(self.file_path, self.read_options)
+        self.mapped_file = mmap.mmap(self.input_stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mapped_file)
+
+        self.header = AvroSplitter.read_header(self.mapped_file)
+        self.header_size = self.mapped_file.tell()
+        self.mapped_file.seek(0)
+
+    def get_codec(self) -> str:
+        """Return the compression codec of the blocks of the file.
+
+        :return: The codec.
+        :rtype: str
+        """
+
+        self.open_memory_map()
+
+        return self.header["meta"].get("avro.codec", b"null").decode()
+
+    def get_writer_schema(self) -> dict:
+        """Return the schema used to write the file.
+
+        :return: The schema, as written in the header.
+        :rtype: dict
+        """
+
+        self.open_memory_map()
+
+        return json.loads(self.header["meta"]["avro.schema"])
+
+    def get_block_offsets(self) -> List[int]:
+        """Find the offset of each block of the file, without decoding them.
+
+        :raises RuntimeError: The file is corrupted.
+        :return: The offsets of the blocks.
+        :rtype: List[int]
+        """
+
+        return [block_start for block_start, _, _, _ in self.read_raw_blocks()]
+
+    def read_raw_blocks(self) -> Iterator[Tuple[int, int, int, memoryview]]:
+        """Read the blocks of the file without decompressing or decoding them.
+
+        :raises RuntimeError: The file is corrupted.
+        :yield: The offset of a block, the offset after it, its number of records and its compressed
+            data, as a slice of the memory map.
+        :rtype: Iterator[Tuple[int, int, int, memoryview]]
+        """
+
+        self.open_memory_map()
+
+        # The blocks are scanned with another memory map, so the position of the first one does not change.
+        with mmap.mmap(self.input_stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            mapped_file.seek(self.header_size)
+
+            for block_start, record_count, data_start, block_end in \
+                    AvroSplitter.get_blocks(mapped_file, self.header["sync"]):
+                yield block_start, block_end, record_count, self.buffer[data_start:block_end - SYNC_SIZE]
+
+    def read_records_from_block(self, start: int, end: int = None) -> Iterator[dict]:
+        """Read the records from a block of the file to another one.
+
+        :param start: The offset of the first block.
+        :type start: int
+        :param end: The offset after the last block. Defaults to None (the end of the file).
+        :type end: int, optional
+        :yield: A record.
+        :rtype: Iterator[dict]
+        """
+
+        self.open_memory_map()
+
+        # The header and the blocks are read as a single file, without joining them in a new buffer
+        # (the decoder still copies the data it reads).
+        block_stream = MemoryViewReader([self.buffer[:self.header_size], self.buffer[start:end]])
+
+        try:
+            yield from fastavro.reader(block_stream)
+        finally:
+            block_stream.close()
+
+    def close(self):
+        """Close the input stream (and the memory map)."""
+
+        if self.buffer is not None:
+            self.buffer.release()
+            self.mapped_file.close()
+            self.buffer = None
+            self.mapped_file = None
+
+        self.input_stream.close()
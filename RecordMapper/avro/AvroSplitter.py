@@ -0,0 +1,159 @@
+import io
+from typing import BinaryIO, Iterator, Tuple
+
+import fastavro
+from fastavro.read import HEADER_SCHEMA, MAGIC, SYNC_SIZE
+
+
+class AvroSplitter(object):
+    """A splitter of avro files in byte ranges that can be read independently.
+
+    An avro file is a header followed by blocks of records, and each block
+    ends with the sync marker of the header, so a range of whole blocks can
+    be decoded with the header alone. The blocks are found by reading their
+    sizes, without decompressing or decoding them. The ranges can be read
+    with an AvroReader (see AvroReader.read_records_from_block).
+    """
+
+    def __init__(self, file_path: str):
+        """The constructor of the AvroSplitter.
+
+        :param file_path: Path of the avro file.
+        :type file_path: str
+        """
+
+        self.file_path = file_path
+
+    def get_header_size(self) -> int:
+        """Read the header of the file.
+
+        :raises RuntimeError: The file is not an avro file.
+        :return: The size of the header, that is, the offset of the first block.
+        :rtype: int
+        """
+
+        with open(self.file_path, "rb") as input_file:
+            self.read_header(input_file)
+            return input_file.tell()
+
+    def get_byte_ranges(self, range_size: int) -> Iterator[Tuple[int, int]]:
+        """Split the blocks of the file in byte ranges.
+
+        Each range contains whole blocks, at least one, and it ends at the
+        first block end after "range_size" bytes. The ranges are found while
+        they are consumed.
+
+        :param range_size: The approximate size of each range, in bytes.
+        :type range_size: int
+        :raises RuntimeError: The range size is not valid or the file is corrupted.
+        :yield: The start and end offsets of a range.
+        :rtype: Iterator[Tuple[int, int]]
+        """
+
+        if range_size < 1:
+            raise RuntimeError(f"Invalid range size: {range_size}")
+
+        with open(self.file_path, "rb") as input_file:
+            header = self.read_header(input_file)
+            range_start = input_file.tell()
+
+            for block_end in self.get_block_ends(input_file, header["sync"]):
+                if block_end - range_start >= range_size:
+                    yield range_start, block_end
+                    range_start = block_end
+
+            if input_file.tell() > range_start:
+                yield range_start, input_file.tell()
+
+    @staticmethod
+    def get_block_ends(input_file: BinaryIO, sync_marker: bytes) -> Iterator[int]:
+        """Find the end offset of each block, skipping their data.
+
+        :param input_file: The file, opened in binary mode and positioned at the first block.
+        :type input_file: BinaryIO
+        :param sync_marker: The sync marker of the file.
+        :type sync_marker: bytes
+        :raises RuntimeError: A block does not end with the sync marker.
+        :yield: The offset after the sync marker of a block.
+        :rtype: Iterator[int]
+        """
+
+        for _, _, _, block_end in AvroSplitter.get_blocks(input_file, sync_marker):
+            yield block_end
+
+    @staticmethod
+    def get_blocks(input_file: BinaryIO, sync_marker: bytes) -> Iterator[Tuple[int, int, int, int]]:
+        """Find the blocks of the file, skipping their data.
+
+        :param input_file: The file, opened in binary mode and positioned at the first block.
+        :type input_file: BinaryIO
+        :param sync_marker: The sync marker of the file.
+        :type sync_marker: bytes
+        :raises RuntimeError: A block does not end with the sync marker.
+        :yield: The offset of a block, its number of records, the offset of its (compressed) data and the
+            offset after its sync marker.
+        :rtype: Iterator[Tuple[int, int, int, int]]
+        """
+
+        while True:
+            block_start = input_file.tell()
+
+            record_count = AvroSplitter.read_long(input_file)
+            if record_count is None:
+                return
+
+            block_size = AvroSplitter.read_long(input_file)
+            if block_size is None:
+                raise RuntimeError(f"Invalid avro block at offset {block_start}")
+
+            data_start = input_file.tell()
+            input_file.seek(block_size, io.SEEK_CUR)
+            if input_file.read(SYNC_SIZE) != sync_marker:
+                raise RuntimeError(f"Invalid sync marker in the avro block at offset {block_start}")
+
+            yield block_start, record_count, data_start, input_file.tell()
+
+    @staticmethod
+    def read_header(input_file: BinaryIO) -> dict:
+        """Read the header of an avro file.
+
+        :param input_file: The file, opened in binary mode and positioned at the beginning.
+        :type input_file: BinaryIO
+        :raises RuntimeError: The file is not an avro file.
+        :return: The header, with the "magic", "meta" and "sync" fields.
+        :rtype: dict
+        """
+
+        try:
+            header = fastavro.schemaless_reader(input_file, HEADER_SCHEMA)
+        except (EOFError, StopIteration, ValueError) as error:
+            raise RuntimeError(f"Invalid avro header: {error}")
+
+        if header["magic"] != MAGIC:
+            raise RuntimeError("Invalid avro header: the file is not an avro file")
+
+        return header
+
+    @staticmethod
+    def read_long(input_file: BinaryIO) -> int:
+        """Read a long (a zigzag encoded varint) from a file.
+
+        :param input_file: The file, opened in binary mode.
+        :type input_file: BinaryIO
+        :return: The long, or None at the end of the file.
+        :rtype: int
+        """
+
+        value = 0
+        shift = 0
+
+        while True:
+            byte = input_file.read(1)
+            if not byte:
+                return None
+
+            value |= (byte[0] & 0x7F) << shift
+            if byte[0] & 0x80 == 0:
+                return (value >> 1) ^ -(value & 1)
+
+            shift += 7
@@ -2,6 +2,9 @@ from typing import BinaryIO, List, Iterable
 
 import fastavro
 
+from RecordMapper.avro.AvroBlockWriter import AvroBlockWriter
+from RecordMapper.avro.AvroProjector import AvroProjector
+from RecordMapper.avro.ParallelBlockEncoder import ParallelBlockEncoder
 from RecordMapper.common import Writer
 
 
@@ -32,25 +35,119 @@ class AvroWriter(Writer):
         super().__init__(obj_to_write)
         self.write_options = "wb"
         self.write_count = 0
-        self.parsed_nested_schemas = [fastavro.parse_schema(schema) for schema in nested_schemas]
+        self.nested_schemas = nested_schemas
+        # The nested schemas are available for the base schema by their names.
+        self.named_schemas = {}
+        self.parsed_nested_schemas = [fastavro.parse_schema(schema, self.named_schemas) for schema in nested_schemas]
         self.writer = None
+        self.block_encoder = None
 
         if output_opts.get('merge_schemas', False):
-            self.parsed_base_schema = self.merge_schemas(base_schema, nested_schemas)
+            self.base_schema = self.merge_schemas(base_schema, nested_schemas)
+            self.parsed_base_schema = self.base_schema
         else:
-            self.parsed_base_schema = fastavro.parse_schema(base_schema)
+            self.base_schema = base_schema
+            self.parsed_base_schema = fastavro.parse_schema(base_schema, self.named_schemas, expand=True)
 
     def write_records_to_output(self, record_list: Iterable, output: BinaryIO, output_opts: dict):
 
-        # As fastavro is not able to use nested schemas, we must combine the base schema and the nested schema
-        self.writer = fastavro.write.Writer(output, self.parsed_base_schema)
+        self.start_output(output, output_opts)
 
         for record in record_list:
+            self.write_record(record)
+
+    def start_output(self, output: BinaryIO, output_opts: dict):
+        """Prepare an output stream to write records one by one.
+
+        :param output: An output stream.
+        :type output: BinaryIO
+        :param output_opts: A dict-like set of options to be able to handle the
+            behaviour of the output. The "avro_codec" (null, deflate, bzip2, xz, and
+            snappy, zstandard or lz4 if their libraries are installed),
+            "avro_compression_level" and "avro_sync_interval" (the approximate
+            size of each block, in bytes) options configure the blocks, and
+            "avro_compression_threads" compresses them in a pool of threads.
+            The "avro_encoding_workers" option encodes and compresses the records
+            in a pool of worker processes, in chunks of "avro_encoding_chunk_size"
+            records (1000 by default). The "avro_copy_blocks" option prepares the
+            writer to copy compressed blocks (see write_compressed_block).
+        :type output_opts: dict
+        :raises RuntimeError: The codec is not supported.
+        """
+
+        codec = output_opts.get("avro_codec", "null")
+        compression_level = output_opts.get("avro_compression_level")
+        sync_interval = output_opts.get("avro_sync_interval", 16000)
+        compression_threads = output_opts.get("avro_compression_threads", 0)
+        encoding_workers = output_opts.get("avro_encoding_workers", 0)
+
+        # Check the codec (and its library) before writing anything.
+        AvroBlockWriter.get_compression_function(codec, compression_level)
+
+        # As fastavro is not able to use nested schemas, we must combine the base schema and the nested schema
+        if compression_threads > 0 or encoding_workers > 0 or output_opts.get("avro_copy_blocks", False):
+            self.writer = AvroBlockWriter(output, self.parsed_base_schema, codec, compression_level, sync_interval,
+                                          compression_threads)
+        else:
+            self.writer = fastavro.write.Writer(output, self.parsed_base_schema, codec=codec,
+                                                sync_interval=sync_interval, compression_level=compression_level)
+
+        # The worker processes encode the blocks, and the writer appends them to the file.
+        if encoding_workers > 0:
+            self.block_encoder = ParallelBlockEncoder(self.writer, self.parsed_base_schema, codec, compression_level,
+                                                      sync_interval, encoding_workers,
+                                                      output_opts.get("avro_encoding_chunk_size", 1000))
+
+    def write_record(self, record: dict):
+        """Write a single record.
+
+        :param record: A record.
+        :type record: dict
+        :raises AvroMatchingException: The record does not match the schema. With encoding
+            workers, it is raised when the chunk of the record is written.
+        """
+
+        if self.block_encoder is not None:
             try:
-                self.writer.write(record)
-                self.write_count += 1
-            except ValueError as ex:
-                raise AvroMatchingException(f"Exception: {ex} for row -> {record}")
+                self.block_encoder.write(record)
+            finally:
+                self.write_count = self.block_encoder.write_count
+            return
+
+        try:
+            self.writer.write(record)
+            self.write_count += 1
+        except (ValueError, TypeError) as ex:
+            raise AvroMatchingException(f"Exception: {ex} for row -> {record}")
+
+    def write_compressed_block(self, record_count: int, compressed_block: bytes):
+        """Write a block of records already encoded and compressed with the schema and the codec of the output.
+
+        The output must be opened with the "avro_copy_blocks" option.
+
+        :param record_count: The number of records of the block.
+        :type record_count: int
+        :param compressed_block: The compressed block, for example, copied from another file.
+        :type compressed_block: bytes
+        :raises RuntimeError: The output is not opened to copy blocks.
+        """
+
+        if not isinstance(self.writer, AvroBlockWriter):
+            raise RuntimeError("The avro output must be opened with the avro_copy_blocks option to copy blocks")
+
+        self.writer.write_compressed_block(record_count, compressed_block)
+        self.write_count += record_count
+
+    def get_projector(self) -> AvroProjector:
+        """Return an AvroProjector of the schema of this writer.
+
+        It gives the records as they will be read from the written file.
+
+        :return: The AvroProjector.
+        :rtype: AvroProjector
+        """
+
+        return AvroProjector(self.base_schema, self.nested_schemas)
 
     def merge_schemas(self, base_schema: dict, nested_schemas: List[dict]):
 
@@ -67,7 +164,18 @@ class AvroWriter(Writer):
         return res_schema
 
     def close(self):
-        """Send the buffer remaining data and close the output stream."""
+        """Send the buffer remaining data and close the output stream.
+
+        :raises AvroMatchingException: A record does not match the schema (with encoding workers).
+        """
+
+        try:
+            if self.block_encoder is not None:
+                try:
+                    self.block_encoder.flush()
+                finally:
+                    self.write_count = self.block_encoder.write_count
 
-        self.writer.flush()
-        super().close()
+            self.writer.flush()
+        finally:
+            super().close()
@@ -0,0 +1,213 @@
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from RecordMapper.avro.AvroBlockWriter import AvroBlockWriter
+
+# The arguments of the AvroBlockWriter of each worker process, set once by its initializer.
+worker_block_writer_args = None
+
+
+class ParallelBlockEncoder(object):
+    """An encoder of avro blocks that uses a pool of worker processes.
+
+    The records are buffered in chunks, and each chunk is encoded and
+    compressed into blocks by a worker. The blocks use the sync marker of
+    the AvroBlockWriter of the output file, so they are appended to it as
+    they are, in the order of the records.
+
+    When a record does not match the schema, the records before it are
+    still written, as in a serial writer, and the error is raised when its
+    chunk is written.
+    """
+
+    def __init__(self, block_writer: AvroBlockWriter, parsed_schema: dict, codec: str = "null",
+                 compression_level: int = None, sync_interval: int = 16000, workers: int = 2,
+                 chunk_size: int = 1000):
+        """The constructor of the ParallelBlockEncoder.
+
+        :param block_writer: The writer of the output file.
+        :type block_writer: AvroBlockWriter
+        :param parsed_schema: A parsed (and expanded) avro schema.
+        :type parsed_schema: dict
+        :param codec: The compression codec of the blocks. Defaults to "null".
+        :type codec: str, optional
+        :param compression_level: The compression level of the codec. Defaults to None.
+        :type compression_level: int, optional
+        :param sync_interval: The approximate size of each block before compressing it. Defaults to 16000.
+        :type sync_interval: int, optional
+        :param workers: The number of worker processes. Defaults to 2.
+        :type workers: int, optional
+        :param chunk_size: The number of records of each chunk. Defaults to 1000.
+        :type chunk_size: int, optional
+        :raises RuntimeError: The number of workers or the chunk size are not valid.
+        """
+
+        if workers < 1:
+            raise RuntimeError(f"Invalid number of workers: {workers}")
+        if chunk_size < 1:
+            raise RuntimeError(f"Invalid chunk size: {chunk_size}")
+
+        self.block_writer = block_writer
+        self.worker_args = (parsed_schema, codec, compression_level, sync_interval, block_writer.sync_marker)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.executor = None
+        self.chunk = []
+        self.pending_chunks = deque()
+        # The maximum number of chunks submitted to the pool and not written yet.
+        self.max_pending_chunks = 2 * workers
+        self.write_count = 0
+
+    def write(self, record: dict):
+        """Add a record to the current chunk, and write the encoded chunks.
+
+        :param record: A record.
+        :type record: dict
+        :raises AvroMatchingException: A record of a written chunk does not match the schema.
+        """
+
+        self.chunk.append(record)
+
+        if len(self.chunk) >= self.chunk_size:
+            self.submit_chunk()
+
+    def submit_chunk(self):
+        """Send the current chunk to be encoded."""
+
+        if not self.chunk:
+            return
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers, initializer=ParallelBlockEncoder.init_worker,
+                                                initargs=self.worker_args)
+
+        self.pending_chunks.append(self.executor.submit(ParallelBlockEncoder.encode_chunk, self.chunk))
+        self.chunk = []
+
+        if len(self.pending_chunks) >= self.max_pending_chunks:
+            self.write_pending_chunk()
+
+    def write_pending_chunk(self):
+        """Wait for the oldest pending chunk and write its blocks.
+
+        :raises AvroMatchingException: A record of the chunk does not match the schema.
+        """
+
+        try:
+            record_count, blocks, error = self.pending_chunks.popleft().result()
+        except BaseException:
+            # The chunks after the failed one are not written (for example, when the output is closed).
+            self.discard_pending_chunks()
+            raise
+
+        self.block_writer.write_encoded_blocks(blocks)
+        self.write_count += record_count
+
+        if error is not None:
+            # The records after the failed one are not written.
+            self.discard_pending_chunks()
+
+            from RecordMapper.avro.AvroWriter import AvroMatchingException
+            raise AvroMatchingException(error)
+
+    def discard_pending_chunks(self):
+        """Cancel the pending chunks and discard the current one, so they are not written."""
+
+        for pending_chunk in self.pending_chunks:
+            pending_chunk.cancel()
+        self.pending_chunks.clear()
+        self.chunk = []
+
+    def flush(self):
+        """Write all the records, and stop the worker processes.
+
+        :raises AvroMatchingException: A record does not match the schema.
+        """
+
+        try:
+            self.submit_chunk()
+
+            while self.pending_chunks:
+                self.write_pending_chunk()
+        finally:
+            if self.executor is not None:
+                # The chunks not written yet (after an error) are cancelled before waiting for the workers.
+                self.discard_pending_chunks()
+                self.executor.shutdown(wait=True)
+                self.executor = None
+
+    @staticmethod
+    def init_worker(parsed_schema: dict, codec: str, compression_level: int, sync_interval: int,
+                    sync_marker: bytes):
+        """Keep the arguments of the AvroBlockWriter of a worker process.
+
+        :param parsed_schema: A parsed (and expanded) avro schema.
+        :type parsed_schema: dict
+        :param codec: The compression codec of the blocks.
+        :type codec: str
+        :param compression_level: The compression level of the codec.
+        :type compression_level: int
+        :param sync_interval: The approximate size of each block before compressing it.
+        :type sync_interval: int
+        :param sync_marker: The sync marker of the output file.
+        :type sync_marker: bytes
+        """
+
+        global worker_block_writer_args
+
+        worker_block_writer_args = (parsed_schema, codec, compression_level, sync_interval, sync_marker)
+
+    @staticmethod
+    def encode_chunk(chunk: List[dict]) -> Tuple[int, bytes, str]:
+        """Encode and compress a chunk of records into blocks, in a worker process.
+
+        :param chunk: A list of records.
+        :type chunk: List[dict]
+        :return: The number of encoded records, their blocks and the error of the first record that does
+            not match the schema (None if all the records match it).
+        :rtype: Tuple[int, bytes, str]
+        """
+
+        output, block_writer = ParallelBlockEncoder.get_block_writer()
+        record_count = 0
+        error = None
+
+        for record in chunk:
+            try:
+                block_writer.write(record)
+            except (ValueError, TypeError) as ex:
+                # fastavro raises TypeError for some mismatches, like a string in an int field.
+                error = f"Exception: {ex} for row -> {record}"
+
+                # The failed record can leave a part of its data in the block, so the previous ones are encoded again.
+                output, block_writer = ParallelBlockEncoder.get_block_writer()
+                for previous_record in chunk[:record_count]:
+                    block_writer.write(previous_record)
+                break
+
+            record_count += 1
+
+        block_writer.flush()
+
+        return record_count, output.getvalue(), error
+
+    @staticmethod
+    def get_block_writer() -> Tuple[io.BytesIO, AvroBlockWriter]:
+        """Build an AvroBlockWriter that writes the blocks (without the header) to a buffer, in a worker process.
+
+        :return: The buffer and the AvroBlockWriter.
+        :rtype: Tuple[io.BytesIO, AvroBlockWriter]
+        """
+
+        parsed_schema, codec, compression_level, sync_interval, sync_marker = worker_block_writer_args
+
+        output = io.BytesIO()
+        block_writer = AvroBlockWriter(output, parsed_schema, codec, compression_level, sync_interval,
+                                       sync_marker=sync_marker)
+        # Only the blocks are sent to the output file.
+        output.seek(0)
+        output.truncate()
+
+        return output, block_writer
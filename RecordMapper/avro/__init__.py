@@ -1,2 +1,5 @@
 from .AvroWriter import AvroWriter
-from .AvroReader import AvroReader
\ No newline at end of file
+from .AvroReader import AvroReader
+from .AvroProjector import AvroProjector
+from .AvroSplitter import AvroSplitter
+from .AvroBlockWriter import AvroBlockWriter
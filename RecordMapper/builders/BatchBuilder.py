@@ -0,0 +1,318 @@
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Sequence
+
+from RecordMapper.builders.FlatRecordBuilder import FlatRecordBuilder
+from RecordMapper.builders.SlotRecordBuilder import EMPTY_SLOT
+
+
+def column_as_list(column: Sequence) -> list:
+    """Return a column as a list of Python values.
+
+    :param column: A column (a list or a NumPy array).
+    :type column: Sequence
+    :return: The column as a list.
+    :rtype: list
+    """
+
+    if isinstance(column, list):
+        return column
+    elif hasattr(column, "tolist"):
+        return column.tolist()
+    else:
+        return list(column)
+
+
+class FlatBatch(object):
+    """A batch of FlatRecords stored by columns.
+
+    Each column is indexed by a flat key and it contains the value of
+    that key for each record of the batch. A column can be a list or
+    a NumPy array. The records without a value for a key have the
+    EMPTY_SLOT value in its column.
+    """
+
+    __slots__ = ("columns", "size")
+
+    def __init__(self, columns: Dict[tuple, Sequence], size: int):
+        """The constructor of the FlatBatch.
+
+        :param columns: The columns of the batch, indexed by flat key.
+        :type columns: Dict[tuple, Sequence]
+        :param size: The number of records of the batch.
+        :type size: int
+        """
+
+        self.columns = columns
+        self.size = size
+
+    def get_records(self) -> List[dict]:
+        """Return the records of the batch as normal records.
+
+        :return: The list of records.
+        :rtype: List[dict]
+        """
+
+        return BatchBuilder.get_records_from_flat_batch(self)
+
+    def __repr__(self) -> str:
+        return f"FlatBatch(size={self.size}, columns={list(self.columns.keys())})"
+
+
+class BatchRecordView(Mapping):
+    """A read-only view of a single record of a FlatBatch.
+
+    It is the record received by the transform (and selector) functions
+    that do not have a batch implementation, so they can be executed
+    record by record over a batch.
+    """
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns: Dict[tuple, list], index: int):
+        """The constructor of the BatchRecordView.
+
+        :param columns: The columns of the batch, as lists.
+        :type columns: Dict[tuple, list]
+        :param index: The position of the record in the batch.
+        :type index: int
+        """
+
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, key: tuple) -> object:
+        column = self.columns.get(key)
+
+        if column is not None:
+            value = column[self.index]
+            if value is not EMPTY_SLOT:
+                return value
+
+        raise KeyError(key)
+
+    def get(self, key: tuple, default: object = None) -> object:
+        column = self.columns.get(key)
+
+        if column is not None:
+            value = column[self.index]
+            return value if value is not EMPTY_SLOT else default
+
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        column = self.columns.get(key)
+
+        return column is not None and column[self.index] is not EMPTY_SLOT
+
+    def __iter__(self) -> Iterator[tuple]:
+        index = self.index
+
+        for key, column in self.columns.items():
+            if column[index] is not EMPTY_SLOT:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class BatchContext(object):
+    """The context received by the batch implementations of the transform functions.
+
+    It contains the columns of the batch at the start of the current
+    transform phase, so every function of a phase sees the same values,
+    as with the record by record engines.
+    """
+
+    __slots__ = ("columns", "size", "flat_schema", "custom_variables", "list_columns")
+
+    def __init__(self, columns: Dict[tuple, Sequence], size: int, flat_schema: dict, custom_variables: dict):
+        """The constructor of the BatchContext.
+
+        :param columns: The columns of the batch, indexed by flat key.
+        :type columns: Dict[tuple, Sequence]
+        :param size: The number of records of the batch.
+        :type size: int
+        :param flat_schema: The flat schema of the batch.
+        :type flat_schema: dict
+        :param custom_variables: A dict of custom variables.
+        :type custom_variables: dict
+        """
+
+        self.columns = columns
+        self.size = size
+        self.flat_schema = flat_schema
+        self.custom_variables = custom_variables
+        self.list_columns = None
+
+    def get_column(self, key: tuple) -> Sequence:
+        """Return the column of a key, with None for the records without a value.
+
+        The NumPy arrays are returned as they are.
+
+        :param key: A flat key.
+        :type key: tuple
+        :return: The column.
+        :rtype: Sequence
+        """
+
+        column = self.columns.get(key)
+
+        if column is None:
+            return [None] * self.size
+        elif not isinstance(column, list):
+            return column
+        elif any(value is EMPTY_SLOT for value in column):
+            return [value if value is not EMPTY_SLOT else None for value in column]
+        else:
+            return column
+
+    def get_record(self, index: int) -> BatchRecordView:
+        """Return a view of a single record of the batch.
+
+        :param index: The position of the record in the batch.
+        :type index: int
+        :return: The view of the record.
+        :rtype: BatchRecordView
+        """
+
+        if self.list_columns is None:
+            self.list_columns = {key: column_as_list(column) for key, column in self.columns.items()}
+
+        return BatchRecordView(self.list_columns, index)
+
+
+class BatchBuilder(object):
+    """A builder of FlatBatches.
+
+    A 'batch' is a dict whose keys are field names and whose values are
+    columns (lists or NumPy arrays) with the value of the field for each
+    record. For example:
+      {
+        "field_1": [5, 6],
+        "field_2": [{"field_x": 7}, {"field_x": 8}]
+      }
+
+    The FlatBatch will be:
+      FlatBatch(
+        columns={
+          ("field_1",): [5, 6],
+          ("field_2", "field_x"): [7, 8]
+        },
+        size=2
+      )
+    """
+
+    @staticmethod
+    def get_flat_batch_from_batch(batch: Dict[str, Sequence]) -> FlatBatch:
+        """Flatten a batch.
+
+        The nested records (dicts) of a column are flattened into one
+        column for each nested key, as FlatRecordBuilder does.
+
+        :param batch: The input batch.
+        :type batch: Dict[str, Sequence]
+        :raises RuntimeError: The columns of the batch have different lengths.
+        :return: The FlatBatch.
+        :rtype: FlatBatch
+        """
+
+        sizes = set(len(column) for column in batch.values())
+        if len(sizes) > 1:
+            raise RuntimeError(f"All the columns of a batch must have the same length: {sorted(sizes)}")
+        size = sizes.pop() if sizes else 0
+
+        columns = {}
+
+        for key, column in batch.items():
+            flat_key = (key,)
+
+            # Only the columns of Python objects can contain nested records.
+            has_nested_records = (isinstance(column, list) or getattr(column, "dtype", None) == object) and \
+                any(isinstance(value, dict) for value in column)
+
+            if not has_nested_records:
+                columns[flat_key] = column
+                continue
+
+            # The same keys as FlatRecordBuilder, for each record of the column.
+            for index, value in enumerate(column_as_list(column)):
+                subrecord = {key: value}
+                for flat_subkey, subvalue in FlatRecordBuilder.get_flat_record_from_normal_record(subrecord).items():
+                    if flat_subkey not in columns:
+                        columns[flat_subkey] = [EMPTY_SLOT] * size
+                    columns[flat_subkey][index] = subvalue
+
+        return FlatBatch(columns, size)
+
+    @staticmethod
+    def get_records_from_flat_batch(flat_batch: FlatBatch) -> List[dict]:
+        """Return the normal records of a FlatBatch.
+
+        :param flat_batch: The FlatBatch.
+        :type flat_batch: FlatBatch
+        :return: The list of records.
+        :rtype: List[dict]
+        """
+
+        keys = list(flat_batch.columns.keys())
+        columns = [column_as_list(column) for column in flat_batch.columns.values()]
+
+        return [
+            FlatRecordBuilder.get_normal_record_from_flat_record({
+                key: value
+                for key, value in zip(keys, row)
+                if value is not EMPTY_SLOT
+            })
+            for row in zip(*columns)
+        ] if columns else [{} for _ in range(flat_batch.size)]
+
+    @staticmethod
+    def take(flat_batch: FlatBatch, indices: List[int]) -> FlatBatch:
+        """Return a new FlatBatch with some records of another FlatBatch.
+
+        :param flat_batch: The input FlatBatch.
+        :type flat_batch: FlatBatch
+        :param indices: The positions of the records to take, in order.
+        :type indices: List[int]
+        :return: The new FlatBatch.
+        :rtype: FlatBatch
+        """
+
+        columns = {}
+
+        for key, column in flat_batch.columns.items():
+            column_list = column_as_list(column)
+            column = [column_list[index] for index in indices]
+
+            # Skip the columns without values in the taken records.
+            if any(value is not EMPTY_SLOT for value in column):
+                columns[key] = column
+
+        return FlatBatch(columns, len(indices))
+
+    @staticmethod
+    def merge(flat_batches: List[FlatBatch], indices_list: List[List[int]], size: int) -> FlatBatch:
+        """Merge several FlatBatches into one, placing their records at the given positions.
+
+        :param flat_batches: The FlatBatches to merge.
+        :type flat_batches: List[FlatBatch]
+        :param indices_list: The positions of the records of each FlatBatch in the merged one.
+        :type indices_list: List[List[int]]
+        :param size: The number of records of the merged FlatBatch.
+        :type size: int
+        :return: The merged FlatBatch.
+        :rtype: FlatBatch
+        """
+
+        columns = {}
+
+        for flat_batch, indices in zip(flat_batches, indices_list):
+            for key, column in flat_batch.columns.items():
+                if key not in columns:
+                    columns[key] = [EMPTY_SLOT] * size
+
+                merged_column = columns[key]
+                for index, value in zip(indices, column_as_list(column)):
+                    merged_column[index] = value
+
+        return FlatBatch(columns, size)
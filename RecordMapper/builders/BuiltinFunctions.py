@@ -2,21 +2,72 @@
 This module defines a set of built-in functions.
 """
 import math
-from datetime import datetime
-from typing import Union, List, Iterable
+import re
+from datetime import datetime, timedelta
+from typing import Union, List, Iterable, Pattern, Sequence, Tuple
 
-import dateparser
+from RecordMapper.builders.DateColumnConverter import DateColumnConverter
+from RecordMapper.builders.DateParseCache import DateParseCache
+
+# The parsed dates of this process (see DateParseCache).
+date_parse_cache = DateParseCache()
+
+# The offset of the second date that dateparser parses the values from, to find out the relative dates.
+_relative_base_offset = timedelta(days=400, hours=1, minutes=1, seconds=1, microseconds=1)
+
+# The patterns of the numeric directives of strptime (the other directives match any text).
+_numeric_directive_patterns = dict(
+    {directive: r"\d{1,2}" for directive in "HIMSUVWm"},
+    d=r" ?\d{1,2}", f=r"\d{1,6}", G=r"\d{4}", Y=r"\d{4}", y=r"\d{2}", j=r"\d{1,3}", u=r"\d", w=r"\d"
+)
+# The directives and separators of the formats that datetime.fromisoformat can parse.
+_iso_format_tokens = {"%Y", "%m", "%d", "%H", "%M", "%S", "%f", "-", ":", " ", "T", "."}
+
+
+def _as_list(column: Sequence) -> list:
+    # The batch functions receive lists or NumPy arrays, which are converted to lists of Python values.
+    return column if isinstance(column, list) else column.tolist() if hasattr(column, "tolist") else list(column)
+
+
+def _get_format_tokens(format: str) -> List[str]:
+    # The directives, whitespace runs and literal characters of a strptime format.
+    return re.findall(r"%.|\s+|.", format, re.DOTALL)
+
+
+def _get_format_pattern(format: str) -> Pattern:
+    # A regular expression that matches, at least, all the strings that strptime parses with the format.
+    pattern_parts = []
+
+    for token in _get_format_tokens(format):
+        if len(token) == 2 and token[0] == "%":
+            pattern_parts.append("%" if token == "%%" else _numeric_directive_patterns.get(token[1], ".*"))
+        elif token.isspace():
+            pattern_parts.append(r"\s+")
+        else:
+            pattern_parts.append(re.escape(token))
+
+    return re.compile("".join(pattern_parts), re.IGNORECASE | re.DOTALL)
+
+
+def _is_iso_format(format: str) -> bool:
+    return all(token in _iso_format_tokens for token in _get_format_tokens(format))
 
 
 def copyFrom(path_to_copy_from: str):
     """This built-in function returns the value of 'path_to_copy_from' key.
     """
 
+    composed_key = (path_to_copy_from,)
+
     def transform_function(current_value: object, record: dict, complete_transform_schema: dict,
                            custom_variables: dict):
-        composed_key = (path_to_copy_from,)
         return record.get(composed_key, None)
 
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        return batch_context.get_column(composed_key)
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
@@ -28,6 +79,11 @@ def toNull():
                            custom_variables: dict):
         return None
 
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        return [None] * len(column)
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
@@ -35,8 +91,7 @@ def toFloat():
     """This built-in function casts the current value to Float and returns the result.
     """
 
-    def transform_function(current_value: object, record: dict, complete_transform_schema: dict,
-                           custom_variables: dict):
+    def cast(current_value: object) -> Union[float, None]:
         value_to_return = None
 
         if current_value is not None:
@@ -47,6 +102,19 @@ def toFloat():
 
         return value_to_return
 
+    def transform_function(current_value: object, record: dict, complete_transform_schema: dict,
+                           custom_variables: dict):
+        return cast(current_value)
+
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        # The NumPy arrays of numbers are cast at once.
+        if not isinstance(column, list) and getattr(column, "dtype", None) is not None and column.dtype.kind in "biuf":
+            return column.astype(float)
+
+        return [cast(value) for value in column]
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
@@ -54,8 +122,7 @@ def toInt():
     """This built-in function casts the current value to Int and returns the result.
     """
 
-    def transform_function(current_value: object, record: dict, complete_transform_schema: dict,
-                           custom_variables: dict):
+    def cast(current_value: object) -> Union[int, None]:
         value_to_return = None
 
         if current_value is not None:
@@ -68,6 +135,15 @@ def toInt():
 
         return value_to_return
 
+    def transform_function(current_value: object, record: dict, complete_transform_schema: dict,
+                           custom_variables: dict):
+        return cast(current_value)
+
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        return [cast(value) for value in _as_list(column)]
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
@@ -77,8 +153,7 @@ def toRoundedInt(use_floor: bool):
     :type floor: str
    """
 
-    def transform_function(current_value: object, record: dict, complete_transform_schema: dict,
-                           custom_variables: dict):
+    def cast(current_value: object) -> Union[int, None]:
         value_to_return = None
 
         if current_value is not None:
@@ -90,6 +165,15 @@ def toRoundedInt(use_floor: bool):
 
         return value_to_return
 
+    def transform_function(current_value: object, record: dict, complete_transform_schema: dict,
+                           custom_variables: dict):
+        return cast(current_value)
+
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        return [cast(value) for value in _as_list(column)]
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
@@ -104,6 +188,11 @@ def toString():
         else:
             return str(current_value)
 
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        return [str(value) if value is not None else None for value in _as_list(column)]
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
@@ -118,30 +207,124 @@ def toBool(value_for_true: str):
         else:
             return value_for_true == current_value
 
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        return [value_for_true == value if value is not None else None for value in _as_list(column)]
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
 def toDate(*formats: Iterable[str]):
     """This built-in function casts the current value to Date and returns the result.
 
+    The date is parsed with the first given format that matches it. The formats are tried from the most
+    successful one, and the values that do not have the shape of a format are discarded with a regular
+    expression, so a value of a frequent format does not try the others. The ISO 8601 formats are parsed
+    by datetime.fromisoformat. The parsed dates are cached (see DateParseCache), which also counts the
+    dates of each format. The batch implementation converts the columns with NumPy (see
+    DateColumnConverter).
+
     :param formats: the passed format which will guide the parser to build the datetime correctly
     :type formats: Union[str, List[str]]
     """
 
-    def transform_function(current_value: object, record: dict, complete_transform_schema: dict, custom_variables: dict,
-                           is_nested_record: bool = False):
-        if current_value is None:
+    cache_key = ("toDate", formats)
+    format_patterns = [_get_format_pattern(format) for format in formats]
+    iso_formats = [_is_iso_format(format) for format in formats]
+    # The indexes of the formats, sorted by their number of parsed dates.
+    format_order = list(range(len(formats)))
+    format_hits = [0] * len(formats)
+    layouts = [DateColumnConverter.get_format_layout(format, parsed=True) for format in formats]
+    # The dates are written as str(datetime), without microseconds, as the parsed formats do not have them.
+    output_layout = DateColumnConverter.get_format_layout("%Y-%m-%d %H:%M:%S")
+
+    def parse_with_format(current_value: str, format_index: int) -> Union[datetime, None]:
+        if not format_patterns[format_index].fullmatch(current_value):
             return None
-        else:
+
+        format = formats[format_index]
+
+        if iso_formats[format_index]:
+            try:
+                date_time_obj = datetime.fromisoformat(current_value)
+            except ValueError:
+                pass
+            else:
+                # fromisoformat accepts other variants of the date, so it must be written as the value.
+                if date_time_obj.strftime(format) == current_value:
+                    return date_time_obj
+
+        try:
+            return datetime.strptime(current_value, format)
+        except ValueError:
+            return None
+
+    def parse(current_value: str) -> Tuple[Union[str, None], Union[str, None]]:
+        if not isinstance(current_value, str):
+            # strptime raises the error of the invalid values.
             for format in formats:
-                try:
-                    date_time_obj = datetime.strptime(current_value, format)
-                except ValueError:
-                    pass
-                else:
-                    return str(date_time_obj)
+                datetime.strptime(current_value, format)
 
+        for position, format_index in enumerate(format_order):
+            date_time_obj = parse_with_format(current_value, format_index)
+            if date_time_obj is None:
+                continue
+
+            # The formats given before have priority, so the ones that are not tried yet are tried.
+            for previous_index in range(format_index):
+                if previous_index not in format_order[:position]:
+                    previous_date_time_obj = parse_with_format(current_value, previous_index)
+                    if previous_date_time_obj is not None:
+                        date_time_obj, format_index = previous_date_time_obj, previous_index
+                        break
+
+            format_hits[format_index] += 1
+
+            order_position = format_order.index(format_index)
+            if order_position > 0 and format_hits[format_order[order_position - 1]] < format_hits[format_index]:
+                format_order.sort(key=lambda index: -format_hits[index])
+
+            return str(date_time_obj), formats[format_index]
+
+        return None, None
+
+    def convert(current_value: object) -> Union[str, None]:
+        if current_value is None:
             return None
+        else:
+            date_str, format = date_parse_cache.get((cache_key, current_value), parse, current_value)
+
+            if format is not None:
+                date_parse_cache.count_format(format)
+
+            return date_str
+
+    def convert_values(values: list) -> Tuple[list, list]:
+        fields, converted, format_counts = DateColumnConverter.get_string_fields_with_formats(
+            values, layouts, format_patterns
+        )
+
+        if fields is None:
+            return [None] * len(values), [False] * len(values)
+
+        for format, count in zip(formats, format_counts):
+            if count > 0:
+                date_parse_cache.count_format(format, count)
+
+        return DateColumnConverter.format_fields(fields, output_layout), converted.tolist()
+
+    def transform_function(current_value: object, record: dict, complete_transform_schema: dict, custom_variables: dict,
+                           is_nested_record: bool = False):
+        return convert(current_value)
+
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        if not layouts or layouts[0] is None:
+            return [convert(value) for value in _as_list(column)]
+
+        return DateColumnConverter.convert_column(column, convert_values, convert)
+
+    transform_function.batch_function = batch_function
 
     return transform_function
 
@@ -149,12 +332,15 @@ def toDate(*formats: Iterable[str]):
 def timestampToDate(format: str):
     """This built-in function casts the current value to Date and returns the result.
 
+    Its batch implementation converts the columns with NumPy (see DateColumnConverter).
+
     :param format: the passed format which will guide the parser to build the datetime correctly
     :type format: str
     """
 
-    def transform_function(current_value: object, record: dict, complete_transform_schema: dict, custom_variables: dict,
-                           is_nested_record: bool = False):
+    layout = DateColumnConverter.get_format_layout(format)
+
+    def convert(current_value: object) -> Union[str, None]:
         if current_value is None:
             return None
         else:
@@ -164,6 +350,24 @@ def timestampToDate(format: str):
 
             return str(formatted_time)
 
+    def convert_values(values: list) -> Tuple[list, list]:
+        fields, converted = DateColumnConverter.get_timestamp_fields(values)
+        # strftime does not pad the years before 1000.
+        converted &= fields["Y"] >= 1000
+        return DateColumnConverter.format_fields(fields, layout), converted.tolist()
+
+    def transform_function(current_value: object, record: dict, complete_transform_schema: dict, custom_variables: dict,
+                           is_nested_record: bool = False):
+        return convert(current_value)
+
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        if layout is None:
+            return [convert(value) for value in _as_list(column)]
+
+        return DateColumnConverter.convert_column(column, convert_values, convert)
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
@@ -178,28 +382,93 @@ def get_from_custom_variable(variable_name: str):
                            custom_variables: dict):
         return custom_variables[variable_name]
 
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        return [batch_context.custom_variables[variable_name] for _ in range(len(column))]
+
+    transform_function.batch_function = batch_function
+
     return transform_function
 
 
+def _is_absolute_date(parse_result: tuple) -> bool:
+    """Tell if a date parsed by transform_date_between_formats can be cached.
+
+    :param parse_result: The parsed date, if it was parsed by dateparser, and if it is absolute.
+    :type parse_result: tuple
+    :return: If the date is absolute.
+    :rtype: bool
+    """
+
+    return parse_result[2]
+
+
 def transform_date_between_formats(input_format: str, output_format: str):
     """This built-in function transform given date as str from an input_format to an output_format.
 
     If given input date does not match input format, it will try to parse input date with dateparser.
     You can force dateparser parsing giving any incorrect input_format like "ignore", anyway  if
     a correct format does not match the given date, it will use dateparser.
+    The parsed dates are cached (see DateParseCache), except the ones that dateparser parses from
+    the current date (like "yesterday"). A value is parsed by dateparser from two different dates,
+    and its date is absolute if both results are the same. The batch implementation converts the
+    columns with NumPy (see DateColumnConverter).
     """
 
-    def transform_function(current_value: str, record: dict, complete_transform_schema: dict, custom_variables: dict,
-                           is_nested_record: bool = False):
+    cache_key = ("transform_date_between_formats", input_format)
+    input_layout = DateColumnConverter.get_format_layout(input_format, parsed=True)
+    output_layout = DateColumnConverter.get_format_layout(output_format)
+
+    # The parsed date (or None), if it was parsed by dateparser, and if it is absolute (so it can be cached).
+    def parse(current_value: str) -> Tuple[Union[datetime, None], bool, bool]:
+        try:
+            return datetime.strptime(current_value, input_format), False, True
+        except ValueError:
+            pass
+
+        # dateparser takes a while to import, so it is imported when a date needs it.
+        import dateparser
+        now = datetime.now()
+        parsed_datetime = dateparser.parse(current_value, settings={"RELATIVE_BASE": now})
+
+        # The values that dateparser can not parse are slow to parse again, and do not depend on the date.
+        if parsed_datetime is None:
+            return None, True, True
+
+        other_datetime = dateparser.parse(current_value, settings={"RELATIVE_BASE": now - _relative_base_offset})
+
+        return parsed_datetime, True, parsed_datetime == other_datetime
+
+    def convert(current_value: str) -> Union[str, None]:
         if current_value:
-            try:
-                datetime_before_transform = datetime.strptime(current_value, input_format)
-            except ValueError:
-                datetime_before_transform = dateparser.parse(current_value)
+            datetime_before_transform, is_parsed_by_dateparser, _ = date_parse_cache.get(
+                (cache_key, current_value), parse, current_value, _is_absolute_date
+            )
+
+            if datetime_before_transform is None:
+                return None
 
-                if datetime_before_transform > datetime.now():
-                    datetime_before_transform = datetime_before_transform.replace(year=datetime_before_transform.year-1)
+            # The adjustment of the future dates depends on the current date, so it is not cached.
+            if is_parsed_by_dateparser and datetime_before_transform > datetime.now():
+                datetime_before_transform = datetime_before_transform.replace(year=datetime_before_transform.year-1)
 
             return datetime.strftime(datetime_before_transform, output_format)
 
+    def convert_values(values: list) -> Tuple[list, list]:
+        fields, converted = DateColumnConverter.get_string_fields(values, input_layout)
+        # strftime does not pad the years before 1000.
+        converted &= fields["Y"] >= 1000
+        return DateColumnConverter.format_fields(fields, output_layout), converted.tolist()
+
+    def transform_function(current_value: str, record: dict, complete_transform_schema: dict, custom_variables: dict,
+                           is_nested_record: bool = False):
+        return convert(current_value)
+
+    def batch_function(column: Sequence, batch_context: object) -> Sequence:
+        if input_layout is None or output_layout is None:
+            return [convert(value) for value in _as_list(column)]
+
+        return DateColumnConverter.convert_column(column, convert_values, convert)
+
+    transform_function.batch_function = batch_function
+
     return transform_function
@@ -0,0 +1,377 @@
+import re
+import time
+from typing import Callable, Dict, List, Pattern, Sequence, Tuple, Union
+
+# NumPy is imported on the first check of DateColumnConverter.is_available, since it takes a while.
+numpy = None
+numpy_import_tried = False
+
+# The directives supported by the DateColumnConverter, with their width.
+DIRECTIVE_WIDTHS = {"Y": 4, "y": 2, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2, "f": 6, "j": 3}
+# The directives that can be parsed (the others are only written).
+PARSED_DIRECTIVES = {"Y", "y", "m", "d", "H", "M", "S"}
+# The timestamps are converted only in this range of seconds, where the float arithmetic of
+# datetime.fromtimestamp gives the exact milliseconds.
+MAX_TIMESTAMP_SECONDS = 2 ** 31
+
+
+class DateColumnConverter(object):
+    """A converter of whole columns of dates with NumPy.
+
+    The epoch timestamps and the date strings of a fixed width are converted
+    into the fields of the dates (year, month, day...) with datetime64 and
+    integer arithmetic over the whole column, and the fields are written into
+    the strings of a format at once, digit by digit, in a matrix of bytes.
+
+    Only the numeric directives of fixed width are supported, and the values
+    that can not be converted exactly as datetime.strptime, datetime.strftime
+    or datetime.fromtimestamp would do are left to the scalar functions (see
+    convert_column). Without NumPy, every value is converted by them.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check if the columns can be converted (NumPy is installed).
+
+        :return: True if NumPy is installed.
+        :rtype: bool
+        """
+
+        global numpy, numpy_import_tried
+
+        if not numpy_import_tried:
+            numpy_import_tried = True
+            try:
+                import numpy
+            except ImportError:
+                numpy = None
+
+        return numpy is not None
+
+    @staticmethod
+    def get_format_layout(format: str, parsed: bool = False) -> Union[List[Tuple[str, str]], None]:
+        """Split a format in its directives and literal texts, if all of them are supported.
+
+        :param format: A strptime/strftime format.
+        :type format: str
+        :param parsed: If the format is used to parse dates (so fewer directives are supported). Defaults to False.
+        :type parsed: bool, optional
+        :return: A list of (directive, None) and (None, text) items, or None if the format is not supported.
+        :rtype: Union[List[Tuple[str, str]], None]
+        """
+
+        supported_directives = PARSED_DIRECTIVES if parsed else DIRECTIVE_WIDTHS
+        layout = []
+
+        for token in re.findall(r"%.|.", format, re.DOTALL):
+            if token == "%%":
+                layout.append((None, "%"))
+            elif token[0] == "%" and len(token) == 2:
+                if token[1] not in supported_directives:
+                    return None
+                layout.append((token[1], None))
+            # The literal texts must be ASCII. When parsing, they must be in the strings as they are, although
+            # strptime also accepts other whitespace and cases (those strings are left to strptime).
+            elif token == "%" or not token.isascii() or token == "\0":
+                return None
+            else:
+                layout.append((None, token))
+
+        directives = [directive for directive, _ in layout if directive is not None]
+        if not directives or len(set(directives)) != len(directives):
+            return None
+
+        return layout
+
+    @staticmethod
+    def convert_column(column: Sequence, convert_values: Callable[[list], Tuple[list, list]],
+                       convert_value: Callable[[object], object]) -> list:
+        """Convert a column with a column conversion and, for the values it does not convert, a scalar one.
+
+        :param column: A column (a list or a NumPy array).
+        :type column: Sequence
+        :param convert_values: The conversion of the column, which returns the results and a flag for each
+            converted value.
+        :type convert_values: Callable[[list], Tuple[list, list]]
+        :param convert_value: The scalar conversion.
+        :type convert_value: Callable[[object], object]
+        :return: The converted column.
+        :rtype: list
+        """
+
+        values = column if isinstance(column, list) else column.tolist() if hasattr(column, "tolist") else list(column)
+
+        if not values or not DateColumnConverter.is_available():
+            return [convert_value(value) for value in values]
+
+        results, converted = convert_values(values)
+
+        return [
+            result if is_converted else convert_value(value)
+            for value, result, is_converted in zip(values, results, converted)
+        ]
+
+    @staticmethod
+    def get_timestamp_fields(values: list) -> Tuple[Dict[str, "numpy.ndarray"], "numpy.ndarray"]:
+        """Convert epoch timestamps in milliseconds into the fields of their local dates.
+
+        The dates are the same as datetime.fromtimestamp(float(value) / 1000).
+        Only the integer values (or strings of digits) are converted.
+
+        :param values: The timestamps in milliseconds.
+        :type values: list
+        :return: The fields of the dates and the mask of the converted values.
+        :rtype: Tuple[Dict[str, numpy.ndarray], numpy.ndarray]
+        """
+
+        max_milliseconds = MAX_TIMESTAMP_SECONDS * 1000
+        milliseconds = []
+        converted = []
+
+        for value in values:
+            value_type = type(value)
+            if value_type is str and value.isascii() and (value.isdigit() or value[:1] == "-" and value[1:].isdigit()):
+                value = int(value)
+            elif value_type is float and value.is_integer():
+                value = int(value)
+            elif value_type is not int:
+                value = max_milliseconds
+
+            is_converted = -max_milliseconds < value < max_milliseconds
+            milliseconds.append(value if is_converted else 0)
+            converted.append(is_converted)
+
+        milliseconds = numpy.array(milliseconds, dtype=numpy.int64)
+        converted = numpy.array(converted, dtype=bool)
+
+        seconds = milliseconds // 1000
+        local_seconds, converted_offsets = DateColumnConverter.add_local_offsets(seconds)
+
+        fields = DateColumnConverter.get_date_fields(local_seconds // 86400)
+        seconds_of_day = local_seconds % 86400
+        fields["H"] = seconds_of_day // 3600
+        fields["M"] = seconds_of_day // 60 % 60
+        fields["S"] = seconds_of_day % 60
+        fields["f"] = (milliseconds - seconds * 1000) * 1000
+
+        return fields, converted & converted_offsets
+
+    @staticmethod
+    def add_local_offsets(seconds: "numpy.ndarray") -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+        """Convert UTC epoch seconds into local epoch seconds, with the offset of the local time zone.
+
+        The offset is found once for each day and, in the days with a change of
+        the offset (like the daylight saving time changes), once for each hour.
+        The hours with a change of the offset are not converted.
+
+        :param seconds: The UTC epoch seconds.
+        :type seconds: numpy.ndarray
+        :return: The local epoch seconds and the mask of the converted values.
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        offsets, converted = DateColumnConverter.get_local_offsets(seconds, 86400)
+
+        if not converted.all():
+            offsets[~converted], converted[~converted] = DateColumnConverter.get_local_offsets(
+                seconds[~converted], 3600
+            )
+
+        return seconds + offsets, converted
+
+    @staticmethod
+    def get_local_offsets(seconds: "numpy.ndarray", period: int) -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+        """Find the offset of the local time zone for some UTC epoch seconds, once for each period.
+
+        :param seconds: The UTC epoch seconds.
+        :type seconds: numpy.ndarray
+        :param period: The period, in seconds.
+        :type period: int
+        :return: The offset at the start of the period of each value, and the mask of the values whose
+            period has the same offset at its end.
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        periods, period_indexes = numpy.unique(seconds // period, return_inverse=True)
+        period_offsets = numpy.empty(len(periods), dtype=numpy.int64)
+        constant_periods = numpy.empty(len(periods), dtype=bool)
+
+        for index, period_start in enumerate((periods * period).tolist()):
+            period_offsets[index] = time.localtime(period_start).tm_gmtoff
+            constant_periods[index] = time.localtime(period_start + period - 1).tm_gmtoff == period_offsets[index]
+
+        period_indexes = period_indexes.reshape(-1)
+
+        return period_offsets[period_indexes], constant_periods[period_indexes]
+
+    @staticmethod
+    def get_date_fields(days: "numpy.ndarray") -> Dict[str, "numpy.ndarray"]:
+        """Convert epoch days into the year, the month, the day and the day of the year.
+
+        :param days: The days since 1970-01-01.
+        :type days: numpy.ndarray
+        :return: The fields of the dates ("Y", "m", "d" and "j").
+        :rtype: Dict[str, numpy.ndarray]
+        """
+
+        dates = days.astype("datetime64[D]")
+        months = dates.astype("datetime64[M]")
+        years = dates.astype("datetime64[Y]")
+
+        return {
+            "Y": years.astype(numpy.int64) + 1970,
+            "m": months.astype(numpy.int64) % 12 + 1,
+            "d": (dates - months).astype(numpy.int64) + 1,
+            "j": (dates - years).astype(numpy.int64) + 1
+        }
+
+    @staticmethod
+    def get_string_fields(values: list, layout: List[Tuple[str, str]]) -> Tuple[Dict[str, "numpy.ndarray"],
+                                                                               "numpy.ndarray"]:
+        """Parse date strings with a format of fixed width, as datetime.strptime.
+
+        The strings with other widths or characters, and the invalid dates,
+        are not converted (strptime may still parse them).
+
+        :param values: The date strings.
+        :type values: list
+        :param layout: The layout of the format (see get_format_layout, with parsed=True).
+        :type layout: List[Tuple[str, str]]
+        :return: The fields of the dates (with the default values of strptime for the missing ones) and the
+            mask of the converted values.
+        :rtype: Tuple[Dict[str, numpy.ndarray], numpy.ndarray]
+        """
+
+        width = sum(DIRECTIVE_WIDTHS[directive] if directive is not None else len(text) for directive, text in layout)
+        converted = numpy.array([type(value) is str and len(value) == width for value in values], dtype=bool)
+
+        # The code point of each character, in a row for each string.
+        strings = numpy.array([value if is_converted else "" for value, is_converted in zip(values, converted)],
+                              dtype=f"U{width}")
+        characters = strings.view(numpy.uint32).reshape(len(values), width).astype(numpy.int64)
+
+        fields = {}
+        position = 0
+
+        for directive, text in layout:
+            if directive is None:
+                for character in text:
+                    converted &= characters[:, position] == ord(character)
+                    position += 1
+                continue
+
+            digits = characters[:, position:position + DIRECTIVE_WIDTHS[directive]] - ord("0")
+            converted &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+            fields[directive] = digits @ (10 ** numpy.arange(digits.shape[1] - 1, -1, -1))
+            position += DIRECTIVE_WIDTHS[directive]
+
+        size = len(values)
+        # As in strptime, the years 69-99 are in the 20th century and 00-68 in the 21st.
+        if "y" in fields:
+            two_digit_years = fields.pop("y")
+            fields["Y"] = two_digit_years + numpy.where(two_digit_years < 69, 2000, 1900)
+        years = fields.setdefault("Y", numpy.full(size, 1900, dtype=numpy.int64))
+        months = fields.setdefault("m", numpy.ones(size, dtype=numpy.int64))
+        days = fields.setdefault("d", numpy.ones(size, dtype=numpy.int64))
+        fields.setdefault("H", numpy.zeros(size, dtype=numpy.int64))
+        fields.setdefault("M", numpy.zeros(size, dtype=numpy.int64))
+        fields.setdefault("S", numpy.zeros(size, dtype=numpy.int64))
+
+        # The days of each month, from the first day of the month to the first day of the next one.
+        month_starts = ((years - 1970) * 12 + numpy.clip(months, 1, 12) - 1).astype("datetime64[M]")
+        first_days = month_starts.astype("datetime64[D]")
+        month_days = ((month_starts + 1).astype("datetime64[D]") - first_days).astype(numpy.int64)
+
+        converted &= (years >= 1) & (months >= 1) & (months <= 12) & (days >= 1) & (days <= month_days)
+        converted &= (fields["H"] <= 23) & (fields["M"] <= 59) & (fields["S"] <= 59)
+
+        # The fields that are only written: the microseconds and the day of the year.
+        fields["f"] = numpy.zeros(size, dtype=numpy.int64)
+        dates = first_days + (days - 1)
+        fields["j"] = (dates - dates.astype("datetime64[Y]")).astype(numpy.int64) + 1
+
+        return fields, converted
+
+    @staticmethod
+    def get_string_fields_with_formats(values: list, layouts: List[Union[List[Tuple[str, str]], None]],
+                                       format_patterns: List[Pattern]) -> Tuple[Dict[str, "numpy.ndarray"],
+                                                                                "numpy.ndarray", List[int]]:
+        """Parse date strings with the first of several formats that parses them, as datetime.strptime.
+
+        A value is parsed with a format only if the previous formats can not
+        parse it, that is, if it does not match their patterns. The formats
+        after the first one that is not supported are not used.
+
+        :param values: The date strings.
+        :type values: list
+        :param layouts: The layout of each format (see get_format_layout, with parsed=True), or None if the
+            format is not supported.
+        :type layouts: List[Union[List[Tuple[str, str]], None]]
+        :param format_patterns: A regular expression of each format that matches, at least, all the strings
+            that strptime parses with it.
+        :type format_patterns: List[Pattern]
+        :return: The fields of the dates, the mask of the converted values and the number of values
+            converted with each format.
+        :rtype: Tuple[Dict[str, numpy.ndarray], numpy.ndarray, List[int]]
+        """
+
+        fields = None
+        converted = numpy.zeros(len(values), dtype=bool)
+        format_counts = [0] * len(layouts)
+        # The values that the previous formats can not parse.
+        pending = numpy.array([type(value) is str for value in values], dtype=bool)
+
+        for format_index, layout in enumerate(layouts):
+            if layout is None or not pending.any():
+                break
+
+            format_fields, format_converted = DateColumnConverter.get_string_fields(values, layout)
+            format_converted &= pending
+
+            if fields is None:
+                fields = format_fields
+            else:
+                for name, column in format_fields.items():
+                    fields[name] = numpy.where(format_converted, column, fields[name])
+
+            converted |= format_converted
+            format_counts[format_index] = int(format_converted.sum())
+
+            pending &= ~format_converted
+            pattern = format_patterns[format_index]
+            pending &= numpy.array([
+                is_pending and pattern.fullmatch(value) is None for value, is_pending in zip(values, pending.tolist())
+            ], dtype=bool)
+
+        return fields, converted, format_counts
+
+    @staticmethod
+    def format_fields(fields: Dict[str, "numpy.ndarray"], layout: List[Tuple[str, str]]) -> list:
+        """Write the fields of some dates with a format, as datetime.strftime (for years from 1000).
+
+        :param fields: The fields of the dates.
+        :type fields: Dict[str, numpy.ndarray]
+        :param layout: The layout of the format (see get_format_layout).
+        :type layout: List[Tuple[str, str]]
+        :return: The date strings.
+        :rtype: list
+        """
+
+        size = len(next(iter(fields.values())))
+        width = sum(DIRECTIVE_WIDTHS[directive] if directive is not None else len(text) for directive, text in layout)
+        characters = numpy.empty((size, width), dtype=numpy.uint8)
+        position = 0
+
+        for directive, text in layout:
+            if directive is None:
+                characters[:, position:position + len(text)] = numpy.frombuffer(text.encode("ascii"), numpy.uint8)
+                position += len(text)
+                continue
+
+            number = fields["Y"] % 100 if directive == "y" else fields[directive]
+            directive_width = DIRECTIVE_WIDTHS[directive]
+            for digit_index in range(directive_width):
+                characters[:, position + directive_width - 1 - digit_index] = number // 10 ** digit_index % 10 + 48
+            position += directive_width
+
+        return characters.view(f"S{width}").reshape(size).astype(f"U{width}").tolist()
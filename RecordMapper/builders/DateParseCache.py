@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+
+class DateParseCache(object):
+    """A bounded LRU cache of parsed dates.
+
+    The date built-in functions parse the same strings again and again, so
+    the results of their parsers are kept in this cache, indexed by a key
+    with the function, its formats and the parsed string. When the cache is
+    full, the least recently used result is removed.
+
+    There is a cache in each process (BuiltinFunctions.date_parse_cache),
+    shared by all the date functions, and it counts its hits and misses,
+    and the dates parsed with each format (see count_format).
+    Only the results that do not depend on the moment of the parsing can be
+    cached (see the is_cacheable argument of get): the relative dates parsed
+    by dateparser (like "yesterday" or a date without year) and the
+    adjustment of the future dates are computed again each time.
+    """
+
+    default_max_size = 65536
+
+    def __init__(self, max_size: int = default_max_size):
+        """The constructor of the DateParseCache.
+
+        :param max_size: The maximum number of parsed dates. Defaults to 65536 (0 disables the cache).
+        :type max_size: int, optional
+        :raises RuntimeError: The size is not valid.
+        """
+
+        self.entries = OrderedDict()
+        self.max_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.format_counts = {}
+
+        self.resize(max_size)
+
+    def get(self, key: Hashable, parse_function: Callable[[object], object], value: object,
+            is_cacheable: Callable[[object], bool] = None) -> object:
+        """Return the cached result of a key, or parse the value and cache its result.
+
+        :param key: The key of the result (it must include the value and everything that changes its result).
+        :type key: Hashable
+        :param parse_function: The function that parses the value.
+        :type parse_function: Callable[[object], object]
+        :param value: The value to parse.
+        :type value: object
+        :param is_cacheable: A function that tells if a result can be cached. Defaults to None (all of them).
+        :type is_cacheable: Callable[[object], bool], optional
+        :return: The result of parse_function for the value.
+        :rtype: object
+        """
+
+        try:
+            result = self.entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result
+
+        # The exceptions of the parser are not cached, so they are raised again for the same value.
+        result = parse_function(value)
+
+        if self.max_size > 0 and (is_cacheable is None or is_cacheable(result)):
+            self.entries[key] = result
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+        return result
+
+    def count_format(self, format: str, count: int = 1):
+        """Count the dates parsed with a format (from the cache or not).
+
+        :param format: The format.
+        :type format: str
+        :param count: The number of dates. Defaults to 1.
+        :type count: int, optional
+        """
+
+        self.format_counts[format] = self.format_counts.get(format, 0) + count
+
+    def resize(self, max_size: int):
+        """Change the maximum number of parsed dates, removing the least recently used ones if needed.
+
+        :param max_size: The maximum number of parsed dates (0 disables the cache).
+        :type max_size: int
+        :raises RuntimeError: The size is not valid.
+        """
+
+        if max_size < 0:
+            raise RuntimeError(f"Invalid date cache size: {max_size}")
+
+        self.max_size = max_size
+
+        while len(self.entries) > max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all the parsed dates and reset the counters."""
+
+        self.entries.clear()
+        self.reset_counts()
+
+    def get_counts(self) -> Dict[str, object]:
+        """Return the counters of the cache.
+
+        :return: The number of hits and misses, and the number of dates of each format ("formats").
+        :rtype: Dict[str, object]
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "formats": dict(self.format_counts)}
+
+    def reset_counts(self) -> Dict[str, object]:
+        """Reset the counters of hits, misses and formats.
+
+        :return: The counters before resetting them (see get_counts).
+        :rtype: Dict[str, object]
+        """
+
+        counts = self.get_counts()
+        self.hits = 0
+        self.misses = 0
+        self.format_counts = {}
+
+        return counts
+
+    @staticmethod
+    def add_counts(counts: Dict[str, object], other_counts: Dict[str, object]):
+        """Add the counters of another cache (for example, of a worker process) to some counters.
+
+        :param counts: The counters to update (see get_counts).
+        :type counts: Dict[str, object]
+        :param other_counts: The counters to add.
+        :type other_counts: Dict[str, object]
+        """
+
+        counts["hits"] += other_counts["hits"]
+        counts["misses"] += other_counts["misses"]
+
+        for format, count in other_counts["formats"].items():
+            counts["formats"][format] = counts["formats"].get(format, 0) + count
@@ -1,4 +1,4 @@
-from typing import Union, List, Callable
+from typing import Union, List, Callable, Tuple
 from collections import namedtuple
 
 from RecordMapper.builders import FunctionBuilder
@@ -46,6 +46,94 @@ class FlatSchemaBuilder(object):
         
         return flat_schema
 
+    @staticmethod
+    def get_schema_description(schema: dict) -> List[dict]:
+        """Describe the fields of a FlatSchema with JSON values, with the transform and selector
+        functions already split in their names and arguments.
+
+        :param schema: Standard Avro schema.
+        :type schema: dict
+        :raises RuntimeError: A function string is not valid.
+        :return: A description of each field (see get_flat_schema_from_description).
+        :rtype: List[dict]
+        """
+
+        description = []
+
+        for field in schema["fields"]:
+
+            transform_field = field.get("transform", None)
+            function_str_list = [] if transform_field is None else \
+                [transform_field] if isinstance(transform_field, str) else transform_field
+            selector_field = field.get("nestedSchemaSelector", None)
+
+            description.append({
+                "name": field["name"],
+                "types": field["type"] if not isinstance(field["type"], str) else [field["type"]],
+                "aliases": field["aliases"] if "aliases" in field else [],
+                "transforms": [FlatSchemaBuilder.split_function_str(function_str)
+                               for function_str in function_str_list],
+                "selector": FlatSchemaBuilder.split_function_str(selector_field)
+            })
+
+        return description
+
+    @staticmethod
+    def get_flat_schema_from_description(description: List[dict]) -> dict:
+        """Create a FlatSchema from the description of its fields (see get_schema_description),
+        without parsing the function strings again.
+
+        :param description: The description of the fields.
+        :type description: List[dict]
+        :raises InvalidFunctionError: The import path of a custom function is not valid.
+        :return: A FlatSchema.
+        :rtype: dict
+        """
+
+        flat_schema = {}
+
+        for field in description:
+
+            field_transforms = [FlatSchemaBuilder.build_function(function_parts)
+                                for function_parts in field["transforms"]]
+            field_selector = FlatSchemaBuilder.build_function(field["selector"])
+
+            flat_schema[(field["name"],)] = FieldData(field["types"], field["aliases"], field_transforms,
+                                                      field_selector)
+
+        return flat_schema
+
+    @staticmethod
+    def split_function_str(function_str: str) -> Union[Tuple[str, List[str]], None]:
+        """Split a function string in its name and arguments (see FunctionBuilder.split_function_str).
+
+        :param function_str: A string that represents a function, or None.
+        :type function_str: str
+        :raises RuntimeError: The string is not valid.
+        :return: The name of the function and its argument list, or None.
+        :rtype: Union[Tuple[str, List[str]], None]
+        """
+
+        return FunctionBuilder.split_function_str(function_str) if function_str is not None else None
+
+    @staticmethod
+    def build_function(function_parts: Union[Tuple[str, List[str]], None]) -> Callable:
+        """Build a function from its name and arguments (see split_function_str).
+
+        :param function_parts: The name of the function and its argument list, or None.
+        :type function_parts: Union[Tuple[str, List[str]], None]
+        :raises InvalidFunctionError: The import path of the custom function is not valid.
+        :return: The function, or None.
+        :rtype: Callable
+        """
+
+        if function_parts is None:
+            return None
+
+        function_name, args_list = function_parts
+
+        return FunctionBuilder.build_function_from_parts(function_name, args_list)
+
     @staticmethod
     def get_transform_functions_from_field(transform_field: Union[str, List[str]]) -> List[Callable]:
         """Generate a list of transform functions from a list of string
@@ -1,5 +1,7 @@
 import re
-from typing import Callable, List, Union
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Hashable, List, Sequence, Tuple, Union
 from inspect import getmembers, isfunction
 import importlib
 
@@ -14,7 +16,71 @@ class InvalidFunctionError(Exception):
 
 
 class FunctionBuilder(object):
-    """A Builder class of functions"""
+    """A Builder class of functions
+
+    A transform function can also have a batch implementation, in its
+    "batch_function" attribute (see FunctionBuilder.batch_implementation).
+    It receives the column of the transformed field (a list or a NumPy
+    array, with None for the records without a value) and a BatchContext,
+    and returns a column with the result for each record. When records are
+    transformed in batches, the batch implementation is used instead of
+    calling the transform function for each record.
+
+    The function strings are parsed once: the function that builds the
+    transform function of each string (with its arguments) is kept, so the
+    same string in other fields or mappings only calls it again. Each field
+    still gets a new transform function. The builders are kept in two LRU
+    caches (by function string, and by function name and arguments), of up
+    to max_function_builders builders each.
+    """
+
+    # The built-in functions, by name (the private helpers of the module are not).
+    builtin_functions = {name: obj for name, obj in getmembers(BuiltinFunctions, isfunction)
+                         if not name.startswith("_")}
+
+    # The maximum number of builders of each cache.
+    max_function_builders = 4096
+
+    # The builders of the transform functions, by function string, and by function name and arguments (a tuple).
+    function_builders = OrderedDict()
+    function_part_builders = OrderedDict()
+
+    @staticmethod
+    def batch_implementation(batch_function: Callable[[Sequence, object], Sequence]) -> Callable:
+        """A decorator that adds a batch implementation to a transform function.
+
+        For example, a custom function can be defined as:
+          def multiply(number_str: str):
+              factor = int(number_str)
+
+              def batch_function(column, batch_context):
+                  return [value * factor if value is not None else None for value in column]
+
+              @FunctionBuilder.batch_implementation(batch_function)
+              def transform_function(current_value, record, complete_transform_schema, custom_variables):
+                  return current_value * factor if current_value is not None else None
+
+              return transform_function
+
+        The batch function must give the same results as the transform function. The other
+        columns of the batch, the flat schema and the custom variables are available in the
+        BatchContext (for example, batch_context.get_column(("field_1",))).
+
+        :param batch_function: The batch implementation of the decorated transform function.
+        :type batch_function: Callable[[Sequence, object], Sequence]
+        :raises InvalidFunctionError: The batch implementation is not callable.
+        :return: The decorator.
+        :rtype: Callable
+        """
+
+        if not callable(batch_function):
+            raise InvalidFunctionError(f"Invalid batch implementation: '{batch_function}'")
+
+        def decorator(transform_function: Callable) -> Callable:
+            transform_function.batch_function = batch_function
+            return transform_function
+
+        return decorator
 
     @staticmethod
     def parse_function_str(function_str: str) -> Union[Callable[[object, dict], object], None]:
@@ -30,6 +96,76 @@ class FunctionBuilder(object):
         if function_str is None:
             return None
 
+        function_builder = FunctionBuilder.get_cached_function_builder(
+            FunctionBuilder.function_builders, function_str, FunctionBuilder.get_function_builder, function_str
+        )
+
+        return function_builder()
+
+    @staticmethod
+    def get_cached_function_builder(function_builders: OrderedDict, key: Hashable,
+                                    get_function_builder: Callable[..., Callable], *args) -> Callable:
+        """Return a builder of a cache, or get it and add it to the cache, removing the least recently used one.
+
+        :param function_builders: The cache (function_builders or function_part_builders).
+        :type function_builders: OrderedDict
+        :param key: The key of the builder.
+        :type key: Hashable
+        :param get_function_builder: The function that returns the builder, if it is not in the cache.
+        :type get_function_builder: Callable[..., Callable]
+        :raises RuntimeError: The string is not valid.
+        :raises InvalidFunctionError: The import path of the custom function is not valid.
+        :return: A function without arguments that returns a new transform function.
+        :rtype: Callable
+        """
+
+        function_builder = function_builders.get(key)
+
+        if function_builder is not None:
+            function_builders.move_to_end(key)
+            return function_builder
+
+        function_builder = get_function_builder(*args)
+        function_builders[key] = function_builder
+        if len(function_builders) > FunctionBuilder.max_function_builders:
+            function_builders.popitem(last=False)
+
+        return function_builder
+
+    @staticmethod
+    def clear_function_builders():
+        """Remove the builders of both caches, so the function strings are parsed again."""
+
+        FunctionBuilder.function_builders.clear()
+        FunctionBuilder.function_part_builders.clear()
+
+    @staticmethod
+    def get_function_builder(function_str: str) -> Callable[[], Callable[[object, dict], object]]:
+        """Parse a string that represents a function, and return a function that builds its transform function.
+
+        :param function_str: A string that represents a function.
+        :type function_str: str
+        :raises RuntimeError: The string is not valid.
+        :raises InvalidFunctionError: The import path of the custom function is not valid.
+        :return: A function without arguments that returns a new transform function.
+        :rtype: Callable[[], Callable[[object, dict], object]]
+        """
+
+        function_name, args_list = FunctionBuilder.split_function_str(function_str)
+
+        return FunctionBuilder.get_function_builder_from_parts(function_name, args_list)
+
+    @staticmethod
+    def split_function_str(function_str: str) -> Tuple[str, List[str]]:
+        """Split a string that represents a function in the name of the function and its arguments.
+
+        :param function_str: A string that represents a function.
+        :type function_str: str
+        :raises RuntimeError: The string is not valid.
+        :return: The name of the function and its argument list.
+        :rtype: Tuple[str, List[str]]
+        """
+
         parsed_function = re.match("^([\.\w]+)(?:\(([\w|,%\'-: ]*)\))?$", function_str)
         if not parsed_function:
             raise RuntimeError(f"Invalid name for a transform function: '{function_str}'")
@@ -37,14 +173,52 @@ class FunctionBuilder(object):
         function_name, args = parsed_function.groups()
         args_list = str(args).split(",") if (args is not None and args != '') else []
 
+        return function_name, args_list
+
+    @staticmethod
+    def build_function_from_parts(function_name: str, args_list: List[str]) -> Callable[[object, dict], object]:
+        """Build a transform function from a function name and its arguments (see split_function_str).
+
+        :param function_name: The name of a built-in function or the import path of a custom function.
+        :type function_name: str
+        :param args_list: Argument list for the function.
+        :type args_list: List[str]
+        :raises InvalidFunctionError: The import path of the custom function is not valid.
+        :return: A transform function.
+        :rtype: Callable[[object, dict], object]
+        """
+
+        function_builder = FunctionBuilder.get_cached_function_builder(
+            FunctionBuilder.function_part_builders, (function_name, *args_list),
+            FunctionBuilder.get_function_builder_from_parts, function_name, args_list
+        )
+
+        return function_builder()
+
+    @staticmethod
+    def get_function_builder_from_parts(function_name: str,
+                                        args_list: List[str]) -> Callable[[], Callable[[object, dict], object]]:
+        """Return a function that builds the transform function of a function name and its arguments.
+
+        :param function_name: The name of a built-in function or the import path of a custom function.
+        :type function_name: str
+        :param args_list: Argument list for the function.
+        :type args_list: List[str]
+        :raises InvalidFunctionError: The import path of the custom function is not valid.
+        :return: A function without arguments that returns a new transform function.
+        :rtype: Callable[[], Callable[[object, dict], object]]
+        """
+
         # Check if it is a built-in function
-        builtin_function = FunctionBuilder.get_builtin_function(function_name, args_list)
+        builtin_function = FunctionBuilder.builtin_functions.get(function_name)
 
         if builtin_function is not None:
-            return builtin_function
+            return partial(builtin_function, *args_list)
 
         # Get it as custom function
-        return FunctionBuilder.get_custom_function(function_name, args_list)
+        custom_function = FunctionBuilder.import_custom_function(function_name)
+
+        return partial(FunctionBuilder.build_custom_function, custom_function, function_name, args_list)
 
     @staticmethod
     def get_builtin_function(function_name: str, args_list: List[str]) -> Callable[[object, dict], object]:
@@ -58,12 +232,10 @@ class FunctionBuilder(object):
         :rtype: Callable[[object, dict], object]
 
         """
-        # Check if it is a built-in function
-        possible_function = [obj for name, obj in getmembers(BuiltinFunctions) if
-                             name == function_name and isfunction(obj)]
+        builtin_function = FunctionBuilder.builtin_functions.get(function_name)
 
-        if len(possible_function) == 1:
-            return possible_function[0](*args_list)
+        if builtin_function is not None:
+            return builtin_function(*args_list)
         else:
             return None
 
@@ -77,17 +249,33 @@ class FunctionBuilder(object):
         :type function_name: str
         :param args_list: Argument list for the function.
         :type args_list: List[str]
-        :raises InvalidFunctionError: It raises an exception when the import path of the function is invalid.
+        :raises InvalidFunctionError: It raises an exception when the import path of the function is invalid
+            or its batch implementation is not callable.
         :return: A custom Transform function. 
         :rtype: Callable[[object, dict], object]
         """
 
+        custom_function = FunctionBuilder.import_custom_function(function_name)
+
+        return FunctionBuilder.build_custom_function(custom_function, function_name, args_list)
+
+    @staticmethod
+    def import_custom_function(function_name: str) -> Callable:
+        """Import a custom function from its complete import path.
+
+        :param function_name: The name of the function (the complete import path).
+        :type function_name: str
+        :raises InvalidFunctionError: It raises an exception when the import path of the function is invalid.
+        :return: The custom function, that returns a transform function.
+        :rtype: Callable
+        """
+
         parts = function_name.split(".")
         module_path = ".".join(parts[:-1])
         function_name = parts[-1]
         try:
             mod = importlib.import_module(module_path)
-            transform_function = getattr(mod, function_name)
+            return getattr(mod, function_name)
         except ModuleNotFoundError:
             raise InvalidFunctionError(f"Invalid module for a custom function: '{function_name}'")
         except ValueError:
@@ -95,4 +283,28 @@ class FunctionBuilder(object):
         except AttributeError:
             raise InvalidFunctionError(f"Invalid name for a custom function: '{function_name}'")
 
-        return transform_function(*args_list)
\ No newline at end of file
+    @staticmethod
+    def build_custom_function(transform_function: Callable, function_name: str,
+                              args_list: List[str]) -> Callable[[object, dict], object]:
+        """Build a transform function with a custom function.
+
+        :param transform_function: The custom function.
+        :type transform_function: Callable
+        :param function_name: The name of the function (the complete import path).
+        :type function_name: str
+        :param args_list: Argument list for the function.
+        :type args_list: List[str]
+        :raises InvalidFunctionError: The batch implementation of the transform function is not callable.
+        :return: A custom Transform function.
+        :rtype: Callable[[object, dict], object]
+        """
+
+        function_name = function_name.split(".")[-1]
+        custom_function = transform_function(*args_list)
+
+        # The batch implementation, if any, must be a function too.
+        batch_function = getattr(custom_function, "batch_function", None)
+        if batch_function is not None and not callable(batch_function):
+            raise InvalidFunctionError(f"Invalid batch implementation for a custom function: '{function_name}'")
+
+        return custom_function
\ No newline at end of file
@@ -0,0 +1,329 @@
+import linecache
+from typing import Callable, Mapping
+
+from RecordMapper.builders.SchemaPlanBuilder import SchemaPlanBuilder
+from RecordMapper.builders.SlotRecordBuilder import SlotIndex, SlotRecord, EMPTY_SLOT
+
+
+class MapperFunctionBuilder(object):
+    """A builder of specialised mapper functions.
+
+    A 'mapper function' is the Python code of the rename, transform,
+    clean and unflatten steps for a single (complete) FlatSchema, generated
+    as straight-line code and compiled. It receives a FlatRecord, which is
+    modified in place, and returns the transformed normal record.
+
+    For example, for a FlatSchema which looks like this:
+      {
+        ("field_1",): FieldData(["int"], ["old_field"], [], None),
+        ("field_2", "nested_field"): FieldData(["int"], [], [toNull()], None)
+      }
+
+    The generated source will be similar to:
+      def build_mapper(flat_schema, custom_variables, merge_result, add_to_record, transform_0_0):
+          def mapper(flat_record):
+              if ('old_field',) in flat_record:
+                  flat_record[('field_1',)] = flat_record[('old_field',)]
+              new_values = {}
+              res = transform_0_0(flat_record.get(('field_2', 'nested_field')), flat_record, flat_schema,
+                                  custom_variables)
+              if type(res) is not tuple:
+                  new_values[('field_2', 'nested_field')] = res
+              else:
+                  merge_result(('field_2', 'nested_field'), res, new_values)
+              flat_record.update(new_values)
+              record = {}
+              if ('field_1',) in flat_record:
+                  record['field_1'] = flat_record[('field_1',)]
+              if ('field_2', 'nested_field') in flat_record:
+                  record.setdefault('field_2', {})['nested_field'] = flat_record[('field_2', 'nested_field')]
+              return record
+          return mapper
+
+    If a SlotIndex is given, the generated function receives a SlotRecord
+    instead, and it accesses the values of the fields directly by their slots.
+    """
+
+    generated_function_count = 0
+
+    @staticmethod
+    def get_mapper_function(flat_schema: Mapping, custom_variables: dict, name: str = "mapper",
+                            slot_index: SlotIndex = None) -> Callable:
+        """Generate and compile the mapper function of a FlatSchema.
+
+        The generated source is available in the "source" attribute
+        of the returned function.
+
+        :param flat_schema: A complete FlatSchema.
+        :type flat_schema: Mapping
+        :param custom_variables: A dict of custom variables, passed to the transform functions.
+        :type custom_variables: dict
+        :param name: The name of the generated function. Defaults to "mapper".
+        :type name: str, optional
+        :param slot_index: The SlotIndex of the input SlotRecords, or None if the
+            function receives FlatRecords. Defaults to None.
+        :type slot_index: SlotIndex, optional
+        :return: The mapper function.
+        :rtype: Callable
+        """
+
+        schema_plan = SchemaPlanBuilder.get_schema_plan(flat_schema)
+
+        if slot_index is None:
+            source = MapperFunctionBuilder.get_mapper_source(flat_schema, name)
+            helpers = [MapperFunctionBuilder.merge_result, MapperFunctionBuilder.add_to_record]
+        else:
+            source = MapperFunctionBuilder.get_slot_mapper_source(flat_schema, slot_index, name)
+            helpers = [MapperFunctionBuilder.merge_slot_result, MapperFunctionBuilder.add_to_record, EMPTY_SLOT]
+
+        # Register the source, so the tracebacks of the generated code show its lines.
+        MapperFunctionBuilder.generated_function_count += 1
+        filename = f"<RecordMapper generated {name} #{MapperFunctionBuilder.generated_function_count}>"
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+        namespace = {}
+        exec(compile(source, filename, "exec"), namespace)
+
+        transform_functions = [
+            transform_function
+            for transforms_by_key in schema_plan.phases
+            for _, transform_function in transforms_by_key
+        ]
+
+        mapper_function = namespace["build_" + name](flat_schema, custom_variables, *helpers, *transform_functions)
+        mapper_function.source = source
+
+        return mapper_function
+
+    @staticmethod
+    def get_mapper_source(flat_schema: Mapping, name: str = "mapper") -> str:
+        """Generate the Python source of the mapper function of a FlatSchema.
+
+        :param flat_schema: A complete FlatSchema.
+        :type flat_schema: Mapping
+        :param name: The name of the generated function. Defaults to "mapper".
+        :type name: str, optional
+        :return: The source of a "build_<name>" function, which returns the mapper function.
+        :rtype: str
+        """
+
+        schema_plan = SchemaPlanBuilder.get_schema_plan(flat_schema)
+
+        transform_names = [
+            f"transform_{phase_index}_{transform_index}"
+            for phase_index, transforms_by_key in enumerate(schema_plan.phases)
+            for transform_index in range(len(transforms_by_key))
+        ]
+
+        build_arguments = ["flat_schema", "custom_variables", "merge_result", "add_to_record"] + transform_names
+
+        lines = [
+            f"def build_{name}({', '.join(build_arguments)}):",
+            f"    def {name}(flat_record):"
+        ]
+
+        # Rename step.
+        if schema_plan.aliases:
+            lines.append("        # Rename step.")
+        for field_key, alias_key in schema_plan.aliases:
+            lines += [
+                f"        if {alias_key!r} in flat_record:",
+                f"            flat_record[{field_key!r}] = flat_record[{alias_key!r}]"
+            ]
+
+        # Transform step.
+        for phase_index, transforms_by_key in enumerate(schema_plan.phases):
+            lines += [
+                f"        # Transform phase {phase_index}.",
+                "        new_values = {}"
+            ]
+            for transform_index, (key, _) in enumerate(transforms_by_key):
+                lines += [
+                    f"        res = transform_{phase_index}_{transform_index}(flat_record.get({key!r}), flat_record, "
+                    f"flat_schema, custom_variables)",
+                    "        if type(res) is not tuple:",
+                    f"            new_values[{key!r}] = res",
+                    "        else:",
+                    f"            merge_result({key!r}, res, new_values)"
+                ]
+            lines.append("        flat_record.update(new_values)")
+
+        # Clean and unflatten steps.
+        lines += [
+            "        # Clean and unflatten steps.",
+            "        record = {}"
+        ]
+        for field_key in schema_plan.keys:
+            lines.append(f"        if {field_key!r} in flat_record:")
+            if len(field_key) == 1:
+                lines.append(f"            record[{field_key[0]!r}] = flat_record[{field_key!r}]")
+            elif len(field_key) == 2 and (field_key[0],) not in flat_schema:
+                lines.append(f"            record.setdefault({field_key[0]!r}, {{}})[{field_key[1]!r}] = "
+                             f"flat_record[{field_key!r}]")
+            else:
+                lines.append(f"            add_to_record(record, {field_key!r}, flat_record[{field_key!r}])")
+
+        lines += [
+            "        return record",
+            f"    return {name}",
+            ""
+        ]
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def get_slot_mapper_source(flat_schema: Mapping, slot_index: SlotIndex, name: str = "mapper") -> str:
+        """Generate the Python source of the mapper function of a FlatSchema, which receives SlotRecords.
+
+        The results of the transform functions of a phase are kept in local
+        variables and assigned to their slots at the end of the phase, in the
+        same order, so the results are the same as with a FlatRecord.
+
+        :param flat_schema: A complete FlatSchema.
+        :type flat_schema: Mapping
+        :param slot_index: The SlotIndex of the input SlotRecords. It must include
+            all the keys of the schema and its aliases.
+        :type slot_index: SlotIndex
+        :param name: The name of the generated function. Defaults to "mapper".
+        :type name: str, optional
+        :return: The source of a "build_<name>" function, which returns the mapper function.
+        :rtype: str
+        """
+
+        schema_plan = SchemaPlanBuilder.get_schema_plan(flat_schema)
+        slots = slot_index.slots
+
+        transform_names = [
+            f"transform_{phase_index}_{transform_index}"
+            for phase_index, transforms_by_key in enumerate(schema_plan.phases)
+            for transform_index in range(len(transforms_by_key))
+        ]
+
+        build_arguments = ["flat_schema", "custom_variables", "merge_slot_result", "add_to_record",
+                           "EMPTY_SLOT"] + transform_names
+
+        lines = [
+            f"def build_{name}({', '.join(build_arguments)}):",
+            f"    def {name}(slot_record):",
+            "        values = slot_record.values"
+        ]
+
+        # Rename step.
+        if schema_plan.aliases:
+            lines.append("        # Rename step.")
+        for field_key, alias_key in schema_plan.aliases:
+            lines += [
+                f"        value = values[{slots[alias_key]}]  # {alias_key!r}",
+                "        if value is not EMPTY_SLOT:",
+                f"            values[{slots[field_key]}] = value  # {field_key!r}"
+            ]
+
+        # Transform step.
+        for phase_index, transforms_by_key in enumerate(schema_plan.phases):
+            lines.append(f"        # Transform phase {phase_index}.")
+            for transform_index, (key, _) in enumerate(transforms_by_key):
+                lines += [
+                    f"        value = values[{slots[key]}]  # {key!r}",
+                    f"        res_{transform_index} = transform_{phase_index}_{transform_index}("
+                    f"value if value is not EMPTY_SLOT else None, slot_record, flat_schema, custom_variables)"
+                ]
+            for transform_index, (key, _) in enumerate(transforms_by_key):
+                lines += [
+                    f"        if type(res_{transform_index}) is not tuple:",
+                    f"            values[{slots[key]}] = res_{transform_index}",
+                    "        else:",
+                    f"            merge_slot_result(slot_record, {key!r}, res_{transform_index})"
+                ]
+
+        # Clean and unflatten steps.
+        lines += [
+            "        # Clean and unflatten steps.",
+            "        record = {}"
+        ]
+        for field_key in schema_plan.keys:
+            lines += [
+                f"        value = values[{slots[field_key]}]  # {field_key!r}",
+                "        if value is not EMPTY_SLOT:"
+            ]
+            if len(field_key) == 1:
+                lines.append(f"            record[{field_key[0]!r}] = value")
+            elif len(field_key) == 2 and (field_key[0],) not in flat_schema:
+                lines.append(f"            record.setdefault({field_key[0]!r}, {{}})[{field_key[1]!r}] = value")
+            else:
+                lines.append(f"            add_to_record(record, {field_key!r}, value)")
+
+        lines += [
+            "        return record",
+            f"    return {name}",
+            ""
+        ]
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def merge_result(key: tuple, res: tuple, new_values: dict):
+        """Add a tuple result of a transform function to the new values of a phase.
+
+        :param key: The key of the transformed field.
+        :type key: tuple
+        :param res: The result of the transform function.
+        :type res: tuple
+        :param new_values: The new values of the current phase.
+        :type new_values: dict
+        :raises RuntimeError: The result is not valid.
+        """
+
+        if len(res) == 2 and type(res[1]) is dict:
+            new_values[key] = res[0]
+            new_values.update(res[1])
+        else:
+            raise RuntimeError(f"Invalid result in a transform function of the key: '{key}'")
+
+    @staticmethod
+    def merge_slot_result(slot_record: SlotRecord, key: tuple, res: tuple):
+        """Add a tuple result of a transform function to a SlotRecord.
+
+        :param slot_record: The SlotRecord.
+        :type slot_record: SlotRecord
+        :param key: The key of the transformed field.
+        :type key: tuple
+        :param res: The result of the transform function.
+        :type res: tuple
+        :raises RuntimeError: The result is not valid.
+        """
+
+        if len(res) == 2 and type(res[1]) is dict:
+            slot_record[key] = res[0]
+            slot_record.update(res[1])
+        else:
+            raise RuntimeError(f"Invalid result in a transform function of the key: '{key}'")
+
+    @staticmethod
+    def add_to_record(record: dict, composed_key: tuple, value: object):
+        """Add a value of a FlatRecord to a normal record.
+
+        It is used for the keys that the generated code can not add directly,
+        with the same behaviour as FlatRecordBuilder.get_normal_record_from_flat_record.
+
+        :param record: The normal record.
+        :type record: dict
+        :param composed_key: The key of the value in the FlatRecord.
+        :type composed_key: tuple
+        :param value: The value to add.
+        :type value: object
+        :raises RuntimeError: The key is a nested key of a non-dict field.
+        :raises NotImplementedError: The key has more than two levels.
+        """
+
+        if len(composed_key) == 1:
+            record[composed_key[0]] = value
+        elif len(composed_key) == 2:
+            super_key, nested_key = composed_key
+            if super_key not in record:
+                record[super_key] = {}
+            if isinstance(record[super_key], dict):
+                record[super_key][nested_key] = value
+            else:
+                raise RuntimeError(f"Nested key in a non-dict field: {composed_key}")
+        else:
+            raise NotImplementedError(f"Three-depth record level is not supported -> {composed_key}")
@@ -0,0 +1,100 @@
+from collections import namedtuple
+
+SchemaPlan = namedtuple("SchemaPlan", ["keys", "aliases", "phases", "selectors"])
+
+
+class SchemaPlanBuilder(object):
+    """A builder of SchemaPlans.
+
+    A 'SchemaPlan' contains the information of a FlatSchema that the
+    appliers need for every record, computed only once:
+      - keys: The field keys, in schema order.
+      - aliases: A list of (field_key, alias_key) pairs, in schema order.
+      - phases: A list with the (field_key, transform_function) pairs
+        to execute in each transform phase.
+      - selectors: A list of (field_key, selector_function) pairs of the
+        fields with a nested schema selector, in schema order.
+
+    For example, for a FlatSchema which looks like this:
+      {
+        ("field_1",): FieldData(["int"], ["old_field"], [], None),
+        ("field_2",): FieldData(["int"], [], [None, toNull()], None)
+      }
+
+    The SchemaPlan will be:
+      SchemaPlan(
+        keys=[("field_1",), ("field_2",)],
+        aliases=[(("field_1",), ("old_field",))],
+        phases=[[], [(("field_2",), toNull())]],
+        selectors=[]
+      )
+
+    The plans are cached by the identity of the FlatSchema, so FlatSchemas
+    must not be modified once they are built.
+    """
+
+    max_cached_plans = 256
+    cached_plans = {}
+
+    @staticmethod
+    def get_schema_plan(flat_schema: dict) -> SchemaPlan:
+        """Return the SchemaPlan of a FlatSchema, building it if it is not cached.
+
+        :param flat_schema: A FlatSchema.
+        :type flat_schema: dict
+        :return: The SchemaPlan of the FlatSchema.
+        :rtype: SchemaPlan
+        """
+
+        cached_plans = SchemaPlanBuilder.cached_plans
+
+        # The cached entry keeps a reference to the schema, so its id cannot be reused.
+        cached_entry = cached_plans.get(id(flat_schema))
+        if cached_entry is not None and cached_entry[0] is flat_schema:
+            return cached_entry[1]
+
+        schema_plan = SchemaPlanBuilder.build_schema_plan(flat_schema)
+
+        # Discard the oldest plan when the cache is full.
+        if len(cached_plans) >= SchemaPlanBuilder.max_cached_plans:
+            del cached_plans[next(iter(cached_plans))]
+        cached_plans[id(flat_schema)] = (flat_schema, schema_plan)
+
+        return schema_plan
+
+    @staticmethod
+    def build_schema_plan(flat_schema: dict) -> SchemaPlan:
+        """Build the SchemaPlan of a FlatSchema.
+
+        :param flat_schema: A FlatSchema.
+        :type flat_schema: dict
+        :return: The SchemaPlan of the FlatSchema.
+        :rtype: SchemaPlan
+        """
+
+        keys = list(flat_schema.keys())
+
+        aliases = [
+            (field_key, (alias,))
+            for field_key, field_data in flat_schema.items()
+            for alias in field_data.aliases
+        ]
+
+        max_phases = max([len(field_data.transforms) for field_data in flat_schema.values()], default=0)
+
+        phases = [
+            [
+                (field_key, field_data.transforms[phase_index])
+                for field_key, field_data in flat_schema.items()
+                if phase_index < len(field_data.transforms) and field_data.transforms[phase_index] is not None
+            ]
+            for phase_index in range(max_phases)
+        ]
+
+        selectors = [
+            (field_key, field_data.selector)
+            for field_key, field_data in flat_schema.items()
+            if field_data.selector is not None
+        ]
+
+        return SchemaPlan(keys, aliases, phases, selectors)
@@ -0,0 +1,226 @@
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator
+
+from RecordMapper.builders.FlatRecordBuilder import FlatRecordBuilder
+
+# The value of the slots without a value. It is not None, as None is a valid value.
+EMPTY_SLOT = object()
+
+
+class SlotIndex(object):
+    """An index that assigns a fixed integer slot to each flat key.
+
+    Besides the slot of each flat key, it includes lookups by field
+    name, which allow to flatten a record without building the tuple
+    keys of its fields.
+    """
+
+    def __init__(self, keys: Iterable[tuple]):
+        """The constructor of the SlotIndex.
+
+        :param keys: The flat keys that will have a slot, in slot order.
+        :type keys: Iterable[tuple]
+        """
+
+        # The slot of each flat key.
+        self.slots = {}
+        # The slot of each one-level key, by field name.
+        self.top_slots = {}
+        # The slot of each two-level key, by field name and nested field name.
+        self.nested_slots = {}
+
+        for key in keys:
+            if key in self.slots:
+                continue
+
+            slot = len(self.slots)
+            self.slots[key] = slot
+
+            if len(key) == 1:
+                self.top_slots[key[0]] = slot
+            elif len(key) == 2:
+                self.nested_slots.setdefault(key[0], {})[key[1]] = slot
+
+        self.size = len(self.slots)
+
+
+class SlotRecord(MutableMapping):
+    """A FlatRecord stored in a list, using the slots of a SlotIndex.
+
+    A SlotRecord can be used as a mapping with the same keys of
+    a FlatRecord, so the appliers and the transform functions work
+    with it. The values of the keys without a slot (for example,
+    unknown fields of the input record) are stored in an extra dict.
+    """
+
+    __slots__ = ("slot_index", "values", "extra")
+
+    def __init__(self, slot_index: SlotIndex, values: list = None):
+        """The constructor of the SlotRecord.
+
+        :param slot_index: The SlotIndex of the record.
+        :type slot_index: SlotIndex
+        :param values: The list of values, with EMPTY_SLOT for the keys without
+            a value. Defaults to None (an empty record).
+        :type values: list, optional
+        """
+
+        self.slot_index = slot_index
+        self.values = values if values is not None else [EMPTY_SLOT] * slot_index.size
+        self.extra = None
+
+    def __getitem__(self, key: tuple) -> object:
+        slot = self.slot_index.slots.get(key)
+
+        if slot is not None:
+            value = self.values[slot]
+            if value is not EMPTY_SLOT:
+                return value
+        elif self.extra is not None:
+            return self.extra[key]
+
+        raise KeyError(key)
+
+    def get(self, key: tuple, default: object = None) -> object:
+        slot = self.slot_index.slots.get(key)
+
+        if slot is not None:
+            value = self.values[slot]
+            return value if value is not EMPTY_SLOT else default
+        elif self.extra is not None:
+            return self.extra.get(key, default)
+
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        slot = self.slot_index.slots.get(key)
+
+        if slot is not None:
+            return self.values[slot] is not EMPTY_SLOT
+
+        return self.extra is not None and key in self.extra
+
+    def __setitem__(self, key: tuple, value: object):
+        slot = self.slot_index.slots.get(key)
+
+        if slot is not None:
+            self.values[slot] = value
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: tuple):
+        slot = self.slot_index.slots.get(key)
+
+        if slot is not None:
+            if self.values[slot] is EMPTY_SLOT:
+                raise KeyError(key)
+            self.values[slot] = EMPTY_SLOT
+        elif self.extra is not None:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[tuple]:
+        values = self.values
+
+        for key, slot in self.slot_index.slots.items():
+            if values[slot] is not EMPTY_SLOT:
+                yield key
+
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for value in self.values if value is not EMPTY_SLOT) + \
+            (len(self.extra) if self.extra is not None else 0)
+
+    def __repr__(self) -> str:
+        return f"SlotRecord({dict(self.items())})"
+
+
+class SlotRecordBuilder(object):
+    """A builder of SlotRecords.
+
+    A 'SlotRecord' is a FlatRecord where each flat key has a fixed
+    integer slot, given by a SlotIndex built from the FlatSchemas.
+    Its values are stored in a list, so there is no tuple key to
+    build or to hash for the fields of the schemas.
+    """
+
+    @staticmethod
+    def get_slot_index(flat_schemas: Dict[str, dict], base_schema_name: str) -> SlotIndex:
+        """Create the SlotIndex of a base schema.
+
+        The index includes every key that a complete FlatSchema of the
+        base schema can have (its fields, and the fields of any nested
+        schema under a field with a selector) and the keys of the aliases.
+
+        :param flat_schemas: A dict with the FlatSchemas, indexed by schema name.
+        :type flat_schemas: Dict[str, dict]
+        :param base_schema_name: The name of the base schema.
+        :type base_schema_name: str
+        :return: The SlotIndex.
+        :rtype: SlotIndex
+        """
+
+        base_flat_schema = flat_schemas[base_schema_name]
+
+        complete_flat_schema = {**base_flat_schema}
+        for field_key, field_data in base_flat_schema.items():
+            if field_data.selector is not None:
+                for nested_flat_schema in flat_schemas.values():
+                    for nested_key, nested_field_data in nested_flat_schema.items():
+                        complete_flat_schema[field_key + nested_key] = nested_field_data
+
+        keys = list(complete_flat_schema.keys()) + [
+            (alias,)
+            for field_data in complete_flat_schema.values()
+            for alias in field_data.aliases
+        ]
+
+        return SlotIndex(keys)
+
+    @staticmethod
+    def get_slot_record_from_normal_record(record: dict, slot_index: SlotIndex) -> SlotRecord:
+        """Flatten a record into a SlotRecord.
+
+        It gives the same keys and values as
+        FlatRecordBuilder.get_flat_record_from_normal_record.
+
+        :param record: The input record.
+        :type record: dict
+        :param slot_index: The SlotIndex of the record.
+        :type slot_index: SlotIndex
+        :return: The SlotRecord.
+        :rtype: SlotRecord
+        """
+
+        values = [EMPTY_SLOT] * slot_index.size
+        slot_record = SlotRecord(slot_index, values)
+
+        top_slots = slot_index.top_slots
+        nested_slots = slot_index.nested_slots
+
+        for key, value in record.items():
+            if isinstance(value, dict):
+                slots = nested_slots.get(key, {})
+
+                for nested_key, nested_value in value.items():
+                    slot = slots.get(nested_key)
+                    if slot is not None and not isinstance(nested_value, dict):
+                        values[slot] = nested_value
+                    else:
+                        # A key without slot, stored using its tuple key.
+                        flat_subrecord = FlatRecordBuilder.get_flat_record_from_normal_record({nested_key: nested_value})
+                        for flat_subkey, subvalue in flat_subrecord.items():
+                            slot_record[(key,) + flat_subkey] = subvalue
+            else:
+                slot = top_slots.get(key)
+                if slot is not None:
+                    values[slot] = value
+                else:
+                    slot_record[(key,)] = value
+
+        return slot_record
@@ -1,3 +1,9 @@
 from .FunctionBuilder import FunctionBuilder
 from .FlatSchemaBuilder import FlatSchemaBuilder
-from .FlatRecordBuilder import FlatRecordBuilder
\ No newline at end of file
+from .FlatRecordBuilder import FlatRecordBuilder
+from .SlotRecordBuilder import SlotRecordBuilder
+from .BatchBuilder import BatchBuilder
+from .SchemaPlanBuilder import SchemaPlanBuilder
+from .MapperFunctionBuilder import MapperFunctionBuilder
+from .DateParseCache import DateParseCache
+from .DateColumnConverter import DateColumnConverter
\ No newline at end of file
@@ -0,0 +1,43 @@
+import io
+
+
+class ByteRangeReader(io.RawIOBase):
+    """A raw binary stream over a range of bytes of a file.
+
+    It reads the file from the start of the range, and it reaches the end
+    of the stream at the end of the range, so it can be wrapped by a
+    BufferedReader and a TextIOWrapper as any other file.
+    """
+
+    def __init__(self, file_path: str, start: int, end: int):
+        """The constructor of the ByteRangeReader.
+
+        :param file_path: Path of the file to read.
+        :type file_path: str
+        :param start: The offset of the first byte of the range.
+        :type start: int
+        :param end: The offset of the end of the range (not included).
+        :type end: int
+        """
+
+        super().__init__()
+        self.file = open(file_path, "rb")
+        self.file.seek(start)
+        self.remaining = max(end - start, 0)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        if self.remaining <= 0:
+            return 0
+
+        size = self.file.readinto(memoryview(buffer)[:min(len(buffer), self.remaining)])
+        self.remaining -= size
+
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.file.close()
+        super().close()
@@ -0,0 +1,137 @@
+import itertools
+import os
+from typing import Callable, Dict, Iterable, List
+
+from RecordMapper.common.Writer import Writer
+
+
+class FanOutWriter(object):
+    """A writer that sends each record to several writers (sinks) in a single pass.
+
+    Each sink is a Writer that supports writing records one by one (see
+    Writer.write_record), with its own output options and, optionally, a
+    projection function that converts the records before writing them
+    (for example, an AvroProjector). The records are buffered in chunks
+    of a bounded size, and each chunk is written to every sink, in the
+    order in which the sinks were added.
+
+    If the writing fails, the outputs of the sinks added with remove_on_error
+    (for example, the ones derived from another output) are removed, so no
+    partial file is left for them.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        """The constructor of the FanOutWriter.
+
+        :param buffer_size: The maximum number of buffered records. Defaults to 1000.
+        :type buffer_size: int, optional
+        :raises RuntimeError: The buffer size is not valid.
+        """
+
+        if buffer_size < 1:
+            raise RuntimeError(f"Invalid buffer size: {buffer_size}")
+
+        self.buffer_size = buffer_size
+        self.sinks = []
+        self.removed_on_error = []
+
+    def add_sink(self, name: str, writer: Writer, output_opts: dict = {},
+                 projection: Callable[[dict], dict] = None, remove_on_error: bool = False):
+        """Add a sink.
+
+        :param name: The name of the sink, used in the write counts.
+        :type name: str
+        :param writer: The writer of the sink.
+        :type writer: Writer
+        :param output_opts: A dict-like set of options of the output of the writer. Defaults to {}.
+        :type output_opts: dict, optional
+        :param projection: A function applied to each record before writing it. Defaults to None.
+        :type projection: Callable[[dict], dict], optional
+        :param remove_on_error: If the output of the writer is removed when the writing fails. Defaults to False.
+        :type remove_on_error: bool, optional
+        :raises RuntimeError: There is another sink with the same name.
+        """
+
+        if name in self.get_write_counts():
+            raise RuntimeError(f"Duplicated sink: {name}")
+
+        self.sinks.append((name, writer, output_opts, projection))
+
+        if remove_on_error:
+            self.removed_on_error.append(writer)
+
+    def write_records(self, records: Iterable[dict]):
+        """Write the records to all the sinks, and close them.
+
+        :param records: An iterable of records.
+        :type records: Iterable[dict]
+        """
+
+        opened_writers = []
+
+        try:
+            try:
+                for _, writer, output_opts, _ in self.sinks:
+                    writer.open(output_opts)
+                    opened_writers.append(writer)
+
+                record_iterator = iter(records)
+
+                for chunk in iter(lambda: list(itertools.islice(record_iterator, self.buffer_size)), []):
+                    for _, writer, _, projection in self.sinks:
+                        write_record = writer.write_record
+
+                        if projection is None:
+                            for record in chunk:
+                                write_record(record)
+                        else:
+                            for record in chunk:
+                                write_record(projection(record))
+            finally:
+                self.close_writers(opened_writers)
+        except BaseException:
+            # The errors of the closing (like the ones of the encoding workers of the avro files) count too.
+            self.remove_outputs(self.removed_on_error)
+            raise
+
+    @staticmethod
+    def close_writers(writers: List[Writer]):
+        """Close all the writers, even if some of them fail, and raise the first error.
+
+        :param writers: The writers.
+        :type writers: List[Writer]
+        """
+
+        close_error = None
+
+        for writer in writers:
+            try:
+                writer.close()
+            except Exception as error:
+                close_error = close_error or error
+
+        if close_error is not None:
+            raise close_error
+
+    @staticmethod
+    def remove_outputs(writers: List[Writer]):
+        """Remove the output files of some writers (already closed), if they exist.
+
+        :param writers: The writers.
+        :type writers: List[Writer]
+        """
+
+        for writer in writers:
+            try:
+                os.remove(writer.file_path)
+            except FileNotFoundError:
+                pass
+
+    def get_write_counts(self) -> Dict[str, int]:
+        """Return the number of records written by each sink.
+
+        :return: A dict with the number of written records, by sink name.
+        :rtype: Dict[str, int]
+        """
+
+        return {name: writer.write_count for name, writer, _, _ in self.sinks}
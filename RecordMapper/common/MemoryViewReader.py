@@ -0,0 +1,77 @@
+import io
+from typing import List
+
+
+class MemoryViewReader(io.RawIOBase):
+    """A raw binary stream over a sequence of memoryviews.
+
+    The memoryviews are read one after another, as a single stream, without
+    joining them, so several slices of a memory-mapped file can be read as
+    if they were a file. The data is copied once: read copies the slices
+    into the bytes it returns, and readinto copies them directly into the
+    given buffer.
+    """
+
+    def __init__(self, buffers: List[memoryview]):
+        """The constructor of the MemoryViewReader.
+
+        :param buffers: The memoryviews to read, in order.
+        :type buffers: List[memoryview]
+        """
+
+        super().__init__()
+        self.buffers = [buffer for buffer in buffers if len(buffer) > 0]
+        self.buffer_index = 0
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = sum(len(buffer) for buffer in self.buffers[self.buffer_index:]) - self.position
+
+        chunks = self.read_slices(size)
+
+        if not chunks:
+            return b""
+
+        return chunks[0].tobytes() if len(chunks) == 1 else b"".join(chunks)
+
+    def readinto(self, buffer: bytearray) -> int:
+        output = memoryview(buffer).cast("B")
+        count = 0
+
+        for chunk in self.read_slices(len(output)):
+            output[count:count + len(chunk)] = chunk
+            count += len(chunk)
+
+        return count
+
+    def read_slices(self, size: int) -> List[memoryview]:
+        """Advance the stream, and return the slices of the memoryviews with the next bytes.
+
+        :param size: The maximum number of bytes.
+        :type size: int
+        :return: The slices (without copying them).
+        :rtype: List[memoryview]
+        """
+
+        chunks = []
+
+        while size > 0 and self.buffer_index < len(self.buffers):
+            buffer = self.buffers[self.buffer_index]
+            chunk = buffer[self.position:self.position + size]
+            chunks.append(chunk)
+            size -= len(chunk)
+            self.position += len(chunk)
+
+            if self.position >= len(buffer):
+                self.buffer_index += 1
+                self.position = 0
+
+        return chunks
+
+    def close(self):
+        self.buffers = []
+        super().close()
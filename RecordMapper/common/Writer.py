@@ -33,6 +33,44 @@ class Writer(object):
 
         return self.write_records_to_output(records, self.output_stream, output_opts)
 
+    def open(self, output_opts: dict):
+        """Open the output file to write records one by one with write_record.
+
+        :param output_opts: A dict-like set of options to be able to handle the
+            behaviour of the output.
+        :type output_opts: dict
+        """
+
+        self.output_stream = open(self.file_path, self.write_options)
+        self.start_output(self.output_stream, output_opts)
+
+    def start_output(self, output: BinaryIO, output_opts: dict):
+        """Prepare an output stream to write records one by one.
+
+        This method has to be implemented by a child class that supports write_record.
+
+        :param output: An output stream.
+        :type output: BinaryIO
+        :param output_opts: A dict-like set of options to be able to handle the
+            behaviour of the output.
+        :type output_opts: dict
+        :raises NotImplementedError: The method has to be implemented by a child class.
+        """
+
+        raise NotImplementedError("This method has to be implemented to write records one by one!")
+
+    def write_record(self, record: dict):
+        """Write a single record to the output opened with the open method.
+
+        This method has to be implemented by a child class that supports it.
+
+        :param record: A record.
+        :type record: dict
+        :raises NotImplementedError: The method has to be implemented by a child class.
+        """
+
+        raise NotImplementedError("This method has to be implemented to write records one by one!")
+
     def write_records_to_output(self, records: Iterable, output: BinaryIO, output_opts: dict):
         """Write the records to an output file.
 
@@ -1,2 +1,5 @@
 from .Reader import Reader
-from .Writer import Writer
\ No newline at end of file
+from .Writer import Writer
+from .ByteRangeReader import ByteRangeReader
+from .MemoryViewReader import MemoryViewReader
+from .FanOutWriter import FanOutWriter
@@ -1,5 +1,5 @@
 import csv
-from typing import BinaryIO, Iterator
+from typing import BinaryIO, Iterable, Iterator, List
 
 from RecordMapper.common import Reader
 
@@ -29,8 +29,58 @@ class CSVReader(Reader):
         :rtype: Iterator[dict]
         """
 
-        self.reader = csv.DictReader(input_stream)
+        self.reader = csv.reader(input_stream)
 
-        for record in self.reader:
-            formatted_record = dict([(key, value if value != '' else None) for key, value in record.items()])
-            yield formatted_record
+        # The first row is the header, as in csv.DictReader.
+        fieldnames = next(self.reader, None)
+        if fieldnames is None:
+            return
+
+        yield from self.get_records_from_rows(self.reader, fieldnames)
+
+    @staticmethod
+    def get_records_from_rows(rows: Iterable[List[str]], fieldnames: List[str]) -> Iterator[dict]:
+        """Build the records of the rows of a csv file.
+
+        :param rows: The rows of the file, after the header.
+        :type rows: Iterable[List[str]]
+        :param fieldnames: The names of the columns.
+        :type fieldnames: List[str]
+        :yield: A record.
+        :rtype: Iterator[dict]
+        """
+
+        # A blank header (no columns) does not match any row, as the blank rows are skipped.
+        fieldnames_count = len(fieldnames) if fieldnames else -1
+
+        for row in rows:
+            # The empty values are returned as None.
+            if len(row) == fieldnames_count:
+                yield {key: value if value != '' else None for key, value in zip(fieldnames, row)}
+            elif row:
+                yield CSVReader.get_record_from_ragged_row(fieldnames, row)
+
+    @staticmethod
+    def get_record_from_ragged_row(fieldnames: List[str], row: List[str]) -> dict:
+        """Build the record of a row with a different number of values than the header.
+
+        As in csv.DictReader, the extra values are stored as a list in the None key,
+        and the missing values are None.
+
+        :param fieldnames: The names of the columns.
+        :type fieldnames: List[str]
+        :param row: The values of the row.
+        :type row: List[str]
+        :return: The record.
+        :rtype: dict
+        """
+
+        record = {key: value if value != '' else None for key, value in zip(fieldnames, row)}
+
+        if len(row) > len(fieldnames):
+            record[None] = row[len(fieldnames):]
+        else:
+            for key in fieldnames[len(row):]:
+                record[key] = None
+
+        return record
@@ -0,0 +1,247 @@
+import csv
+import io
+import os
+from typing import BinaryIO, Iterator, List, Tuple
+
+from RecordMapper.common import ByteRangeReader
+from RecordMapper.csv.CSVReader import CSVReader
+
+
+class CSVRangeError(Exception):
+    """
+        An exception that represents a byte range of a csv file that does not end at a record boundary.
+    """
+
+    def __init__(self, start: int):
+        super().__init__(start)
+        self.start = start
+
+    def __str__(self) -> str:
+        return f"The csv range at offset {self.start} does not end at a record boundary"
+
+
+class CSVSplitter(object):
+    """A splitter of csv files in byte ranges that can be read independently.
+
+    Each range starts at the beginning of a record and ends after the
+    newline of a record, so it can be read by a different process. As a
+    quoted field can contain newlines, a newline is a record boundary only
+    if there is an even number of quote characters before it. The splitter
+    counts the quotes from the beginning of the file (a fast sequential
+    scan, much cheaper than parsing), so the quote characters must only be
+    used in quoted fields, as in RFC 4180. Otherwise, a range may end inside
+    a quoted field: the reader of the range checks that its last record is
+    complete, and raises a CSVRangeError if it is not.
+
+    The file must use an encoding where the quote and the newline bytes are
+    always those characters (for example, UTF-8 or Latin-1).
+    """
+
+    scan_size = 1024 * 1024
+
+    def __init__(self, file_path: str):
+        """The constructor of the CSVSplitter.
+
+        :param file_path: Path of the csv file.
+        :type file_path: str
+        """
+
+        self.file_path = file_path
+
+    def get_fieldnames(self) -> Tuple[List[str], int]:
+        """Read the header of the file.
+
+        :return: The names of the columns (None if the file is empty) and the
+            offset of the first record after the header.
+        :rtype: Tuple[List[str], int]
+        """
+
+        with open(self.file_path, "rb") as input_file:
+            data_offset = self.find_record_end(input_file, 0, False)
+
+        records_reader = self.get_reader_of_range(self.file_path, 0, data_offset)
+        fieldnames = next(csv.reader(records_reader), None)
+        records_reader.close()
+
+        return fieldnames, data_offset
+
+    def get_byte_ranges(self, range_size: int) -> Iterator[Tuple[int, int]]:
+        """Split the records of the file (after the header) in byte ranges.
+
+        The ranges are found while they are consumed, so the first ones are
+        available before scanning the whole file.
+
+        :param range_size: The approximate size of each range, in bytes.
+        :type range_size: int
+        :raises RuntimeError: The range size is not valid.
+        :yield: The start and end offsets of a range.
+        :rtype: Iterator[Tuple[int, int]]
+        """
+
+        if range_size < 1:
+            raise RuntimeError(f"Invalid range size: {range_size}")
+
+        _, position = self.get_fieldnames()
+        file_size = os.path.getsize(self.file_path)
+
+        with open(self.file_path, "rb") as input_file:
+            while position < file_size:
+                target = position + range_size
+
+                if target >= file_size:
+                    yield position, file_size
+                    break
+
+                # Each range starts out of quotes, so the quotes until the target tell if it is in a quoted field.
+                in_quotes = self.count_quotes(input_file, position, target) % 2 == 1
+                end = self.find_record_end(input_file, target, in_quotes)
+
+                yield position, end
+                position = end
+
+    def count_quotes(self, input_file: BinaryIO, start: int, end: int) -> int:
+        """Count the quote characters in a range of the file.
+
+        :param input_file: The file, opened in binary mode.
+        :type input_file: BinaryIO
+        :param start: The start offset of the range.
+        :type start: int
+        :param end: The end offset of the range.
+        :type end: int
+        :return: The number of quote characters.
+        :rtype: int
+        """
+
+        input_file.seek(start)
+        quotes = 0
+        remaining = end - start
+
+        while remaining > 0:
+            chunk = input_file.read(min(self.scan_size, remaining))
+            if not chunk:
+                break
+            quotes += chunk.count(b'"')
+            remaining -= len(chunk)
+
+        return quotes
+
+    def find_record_end(self, input_file: BinaryIO, offset: int, in_quotes: bool) -> int:
+        """Find the end of the record that contains an offset of the file.
+
+        :param input_file: The file, opened in binary mode.
+        :type input_file: BinaryIO
+        :param offset: The offset.
+        :type offset: int
+        :param in_quotes: If the offset is inside a quoted field.
+        :type in_quotes: bool
+        :return: The offset after the newline of the record, or the size of the file.
+        :rtype: int
+        """
+
+        input_file.seek(offset)
+        chunk_offset = offset
+
+        while True:
+            chunk = input_file.read(self.scan_size)
+            if not chunk:
+                return chunk_offset
+
+            position = 0
+            while True:
+                newline = chunk.find(b"\n", position)
+                if newline == -1:
+                    in_quotes ^= chunk.count(b'"', position) % 2 == 1
+                    break
+
+                in_quotes ^= chunk.count(b'"', position, newline) % 2 == 1
+                if not in_quotes:
+                    return chunk_offset + newline + 1
+
+                position = newline + 1
+
+            chunk_offset += len(chunk)
+
+    @staticmethod
+    def get_reader_of_range(file_path: str, start: int, end: int) -> io.TextIOWrapper:
+        """Open a range of a file as a text stream, as the readers open the files.
+
+        :param file_path: Path of the file.
+        :type file_path: str
+        :param start: The start offset of the range.
+        :type start: int
+        :param end: The end offset of the range.
+        :type end: int
+        :return: The text stream.
+        :rtype: io.TextIOWrapper
+        """
+
+        return io.TextIOWrapper(io.BufferedReader(ByteRangeReader(file_path, start, end)))
+
+    @staticmethod
+    def read_records_in_range(file_path: str, start: int, end: int, fieldnames: List[str]) -> Iterator[dict]:
+        """Read the records of a byte range of a csv file, as CSVReader does.
+
+        If the range starts at a record boundary, it ends at another one
+        unless its last row ends inside a quoted field: its last value keeps
+        the newline before the end of the range. A complete record only has
+        it if its last field is quoted and ends with a newline, so then the
+        range is checked again (see is_complete_range).
+
+        :param file_path: Path of the file.
+        :type file_path: str
+        :param start: The start offset of the range.
+        :type start: int
+        :param end: The end offset of the range.
+        :type end: int
+        :param fieldnames: The names of the columns, from the header of the file.
+        :type fieldnames: List[str]
+        :raises CSVRangeError: The last row of the range ends inside a quoted field (after its records).
+        :yield: A record.
+        :rtype: Iterator[dict]
+        """
+
+        records_reader = CSVSplitter.get_reader_of_range(file_path, start, end)
+        last_row = []
+
+        def get_rows() -> Iterator[List[str]]:
+            nonlocal last_row
+            for last_row in csv.reader(records_reader):
+                yield last_row
+
+        try:
+            yield from CSVReader.get_records_from_rows(get_rows(), fieldnames)
+        finally:
+            records_reader.close()
+
+        if last_row and last_row[-1].endswith("\n") and not CSVSplitter.is_complete_range(file_path, start, end):
+            raise CSVRangeError(start)
+
+    @staticmethod
+    def is_complete_range(file_path: str, start: int, end: int) -> bool:
+        """Check that the last record of a byte range of a csv file, which starts at a record boundary, is complete.
+
+        The range is parsed in strict mode, which fails at the end of a
+        quoted field without its closing quote (and with any bad quoting,
+        so some valid ranges are rejected too).
+
+        :param file_path: Path of the file.
+        :type file_path: str
+        :param start: The start offset of the range.
+        :type start: int
+        :param end: The end offset of the range.
+        :type end: int
+        :return: If the range ends at a record boundary.
+        :rtype: bool
+        """
+
+        records_reader = CSVSplitter.get_reader_of_range(file_path, start, end)
+
+        try:
+            for _ in csv.reader(records_reader, strict=True):
+                pass
+        except csv.Error:
+            return False
+        finally:
+            records_reader.close()
+
+        return True
@@ -21,6 +21,8 @@ class CSVWriter(Writer):
         super().__init__(file_path)
         self.fieldnames = fieldnames
         self.write_count = 0
+        self.fields_to_flat = set()
+        self.csv_writer = None
 
     def write_records_to_output(self, records: Iterable[dict], output: BinaryIO, output_opts: dict):
         """Write the records to the output file.
@@ -36,20 +38,41 @@ class CSVWriter(Writer):
         :type output_opts: dict
         """
 
-        fields_to_flat = set(output_opts.get("flat_nested_schema_on_csv", dict()).keys())
+        self.start_output(output, output_opts)
+
+        for record in records:
+            self.write_record(record)
+
+    def start_output(self, output: BinaryIO, output_opts: dict):
+        """Prepare an output stream to write records one by one, writing the header.
+
+        :param output: The object to write.
+        :type output: BinaryIO
+        :param output_opts: A dict-like set of options to be able to handle the
+            behaviour of the output.
+        :type output_opts: dict
+        """
+
+        self.fields_to_flat = set(output_opts.get("flat_nested_schema_on_csv", dict()).keys())
 
         available_fieldnames = [
             fieldname
             for fieldname in self.fieldnames
-            if fieldname not in fields_to_flat
+            if fieldname not in self.fields_to_flat
         ]
 
-        csv_writer = csv.DictWriter(output, fieldnames=available_fieldnames)
-        csv_writer.writeheader()
+        self.csv_writer = csv.DictWriter(output, fieldnames=available_fieldnames)
+        self.csv_writer.writeheader()
 
-        for record in records:
-            csv_writer.writerow(self.format_record(record, fields_to_flat))
-            self.write_count += 1
+    def write_record(self, record: dict):
+        """Write a single record.
+
+        :param record: A record.
+        :type record: dict
+        """
+
+        self.csv_writer.writerow(self.format_record(record, self.fields_to_flat))
+        self.write_count += 1
 
     def format_record(self, record: dict, fields_to_flat: set) -> dict:
         """Format a record to be written.
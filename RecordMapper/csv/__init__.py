@@ -1,2 +1,3 @@
 from .CSVReader import CSVReader
-from .CSVWriter import CSVWriter
\ No newline at end of file
+from .CSVSplitter import CSVSplitter
+from .CSVWriter import CSVWriter
@@ -1,21 +1,31 @@
 from typing import BinaryIO, Iterator
 
-from defusedxml.ElementTree import parse as parse_xml
+from defusedxml.ElementTree import iterparse, parse as parse_xml
 
 from RecordMapper.common import Reader
 
 
 class XMLReader(Reader):
-    """A Record reader for xml format."""
+    """A Record reader for xml format.
 
-    def __init__(self, file_path: str):
+    Each child of the root element is a record, and the children of a
+    record are its fields. By default, the whole document is parsed
+    before reading the first record. In streaming mode, each record is
+    read as soon as its element is parsed, and the parsed elements are
+    removed, so the memory does not depend on the size of the file.
+    """
+
+    def __init__(self, file_path: str, streaming: bool = False):
         """The constructor of the XMLReader.
 
         :param file_path: Path of the file to read.
         :type file_path: str
+        :param streaming: Read the records while the document is parsed. Defaults to False.
+        :type streaming: bool, optional
         """
 
         super().__init__(file_path)
+        self.streaming = streaming
         self.reader = None
 
     def read_records_from_input(self, input_stream: BinaryIO) -> Iterator[dict]:
@@ -27,7 +37,40 @@ class XMLReader(Reader):
         :rtype: Iterator[dict]
         """
 
+        if self.streaming:
+            yield from self.read_records_while_parsing(input_stream)
+            return
+
         self.reader = parse_xml(input_stream).getroot()
 
         for record in self.reader:
             yield {attribute.tag: attribute.text for attribute in record}
+
+    def read_records_while_parsing(self, input_stream: BinaryIO) -> Iterator[dict]:
+        """Read records from an input stream in xml format, while it is parsed.
+
+        :param input_stream: The input stream of the records.
+        :type input_stream: BinaryIO
+        :yield: A record.
+        :rtype: Iterator[dict]
+        """
+
+        self.reader = iterparse(input_stream, events=("start", "end"))
+        root = None
+        depth = 0
+
+        for event, element in self.reader:
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = element
+                continue
+
+            depth -= 1
+
+            # A record (a child of the root) has been parsed.
+            if depth == 1:
+                yield {attribute.tag: attribute.text for attribute in element}
+
+                # Remove the parsed records from the tree.
+                root.clear()
@@ -0,0 +1,95 @@
+"""
+Benchmark of the AvroReader.
+
+It compares the time to read a generated avro file through a buffered file
+and mapped in memory, and the time to read the records of the last block,
+scanning the whole file and with random access from the block offsets.
+
+Run it from the root directory of the project:
+
+    python -m benchmarks.bench_avro_reader [number of records]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import fastavro
+
+from RecordMapper.avro.AvroReader import AvroReader
+
+SCHEMA = {
+    "type": "record",
+    "name": "BenchSchema",
+    "fields": [{"name": f"field_{index}", "type": ["string", "null"]} for index in range(10)] +
+              [{"name": "number", "type": "long"}, {"name": "amount", "type": ["null", "double"]}]
+}
+
+
+def write_avro_file(file_path: str, records: int, codec: str):
+    """Write an avro file with the given number of records."""
+
+    generated_records = (
+        dict({f"field_{index}": f"value_{record_index}_{index}" for index in range(10)},
+             number=record_index, amount=record_index / 3)
+        for record_index in range(records)
+    )
+
+    with open(file_path, "wb") as avro_file:
+        fastavro.writer(avro_file, fastavro.parse_schema(SCHEMA), generated_records, codec=codec)
+
+
+def read_avro_file(file_path: str, memory_map: bool) -> float:
+    """Read all the records of an avro file, returning the seconds."""
+
+    start = time.perf_counter()
+
+    reader = AvroReader(file_path, memory_map)
+    for _ in reader.read_records():
+        pass
+    reader.close()
+
+    return time.perf_counter() - start
+
+
+def read_last_block(file_path: str, random_access: bool) -> float:
+    """Read the records of the last block of an avro file, returning the seconds."""
+
+    start = time.perf_counter()
+
+    if random_access:
+        reader = AvroReader(file_path, memory_map=True)
+        list(reader.read_records_from_block(reader.get_block_offsets()[-1]))
+    else:
+        reader = AvroReader(file_path)
+        # Without the block offsets, all the previous records must be decoded.
+        for _ in reader.read_records():
+            pass
+    reader.close()
+
+    return time.perf_counter() - start
+
+
+def main():
+
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    file_path = os.path.join(tempfile.mkdtemp(), "bench.avro")
+
+    for codec in ("null", "deflate"):
+        write_avro_file(file_path, records, codec)
+        print(f"Records: {records}, codec: {codec} ({os.path.getsize(file_path) / 1024 / 1024:.1f} MB)")
+
+        for memory_map in (False, True):
+            seconds = min(read_avro_file(file_path, memory_map) for _ in range(3))
+            print(f"{'memory map' if memory_map else 'buffered':>12}: all records {seconds:.3f}s")
+
+        for random_access in (False, True):
+            seconds = read_last_block(file_path, random_access)
+            print(f"{'block offset' if random_access else 'scan':>12}: last block {seconds:.3f}s")
+
+    os.remove(file_path)
+    os.rmdir(os.path.dirname(file_path))
+
+
+if __name__ == "__main__":
+    main()
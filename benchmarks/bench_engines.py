@@ -0,0 +1,98 @@
+"""
+Benchmark of the engines of RecordMapper.
+
+It compares the time to transform a set of records with the generic pipeline
+(building the chain of appliers with chain_functions for every record, as the
+RecordMapper used to do) and with the "chain", "fused", "codegen" and "slots" engines.
+
+Run it from the root directory of the project:
+
+    python -m benchmarks.bench_engines
+"""
+import timeit
+
+from RecordMapper import RecordMapper
+from RecordMapper.builders import FlatRecordBuilder
+from RecordMapper.utils import chain_functions
+
+BASE_SCHEMA = {
+    "type": "record",
+    "name": "BenchSchema",
+    "fields": [
+        {"name": f"field_{index}", "type": ["string", "null"], "aliases": [f"old_field_{index}"]}
+        for index in range(10)
+    ] + [
+        {"name": f"int_field_{index}", "type": ["int", "null"], "transform": "toInt"}
+        for index in range(10)
+    ] + [
+        {"name": f"copy_field_{index}", "type": ["string", "null"], "transform": [None, f"copyFrom(field_{index})"]}
+        for index in range(5)
+    ] + [
+        {"name": "nested_field", "type": ["BenchNestedSchema", "null"],
+         "nestedSchemaSelector": "tests.custom_functions_for_tests.selectSchema(BenchNestedSchema)"}
+    ]
+}
+
+NESTED_SCHEMA = {
+    "type": "record",
+    "name": "BenchNestedSchema",
+    "fields": [
+        {"name": f"nested_{index}", "type": ["string", "null"], "transform": f"copyFrom(field_{index})"}
+        for index in range(5)
+    ]
+}
+
+RECORDS = [
+    {
+        **{f"old_field_{index}": f"value_{record_index}_{index}" for index in range(10)},
+        **{f"int_field_{index}": str(record_index * index) for index in range(10)},
+        "unused_field": "unused"
+    }
+    for record_index in range(10_000)
+]
+
+
+def transform_with_chain_functions(record_mapper: RecordMapper, records: list) -> list:
+    """Transform the records building the pipeline for every record."""
+
+    res = []
+    base_flat_schema = record_mapper.flat_schemas[BASE_SCHEMA["name"]]
+
+    for record in records:
+        flat_record = FlatRecordBuilder.get_flat_record_from_normal_record(record)
+        all_functions = chain_functions(
+            record_mapper.selector_applier.apply,
+            record_mapper.rename_applier.apply,
+            record_mapper.transform_applier.apply,
+            record_mapper.clean_applier.apply
+        )
+        transformed_record, _ = all_functions(flat_record, base_flat_schema)
+        res.append(FlatRecordBuilder.get_normal_record_from_flat_record(transformed_record))
+
+    return res
+
+
+def main():
+
+    chain_mapper = RecordMapper(BASE_SCHEMA, [NESTED_SCHEMA])
+    expected_records = transform_with_chain_functions(chain_mapper, RECORDS)
+
+    results = {
+        "chain_functions": min(timeit.repeat(lambda: transform_with_chain_functions(chain_mapper, RECORDS),
+                                             number=1, repeat=3))
+    }
+
+    for engine in ("chain", "fused", "codegen", "slots"):
+        record_mapper = RecordMapper(BASE_SCHEMA, [NESTED_SCHEMA], engine=engine)
+        assert list(record_mapper.transform_records(RECORDS)) == expected_records
+
+        results[engine] = min(timeit.repeat(lambda: list(record_mapper.transform_records(RECORDS)),
+                                            number=1, repeat=3))
+
+    print(f"Records: {len(RECORDS)}")
+    for name, seconds in results.items():
+        print(f"{name:>16}: {seconds:.3f}s ({results['chain_functions'] / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark of the import of RecordMapper.
+
+It measures, with "python -X importtime" in new processes, the time to import
+the RecordMapper package and to build a RecordMapper, and lists the modules
+that take most of it. The readers, the writers and the heavy dependencies
+(fastavro, dateparser, NumPy) are only imported when they are used.
+
+Run it from the root directory of the project:
+
+    python -m benchmarks.bench_import
+"""
+import subprocess
+import sys
+
+CODE = (
+    "from RecordMapper import RecordMapper\n"
+    "RecordMapper({'type': 'record', 'name': 'BenchSchema', "
+    "'fields': [{'name': 'field_1', 'type': 'string', 'transform': 'toDate(%Y-%m-%d)'}]})\n"
+)
+
+
+def get_import_times(code: str) -> dict:
+    """Run the code in a new process and return the cumulative import time of each module, in microseconds."""
+
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                         check=True)
+    import_times = {}
+
+    for line in res.stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("package"):
+            _, cumulative_time, module = line[len("import time:"):].split("|")
+            import_times[module.strip()] = int(cumulative_time)
+
+    return import_times
+
+
+def main():
+
+    runs = [get_import_times(CODE) for _ in range(5)]
+    import_times = {module: min(run.get(module, 0) for run in runs) for module in runs[0]}
+
+    print(f"RecordMapper: {import_times['RecordMapper'] / 1000:.2f}ms")
+    for module, microseconds in sorted(import_times.items(), key=lambda item: -item[1])[1:11]:
+        print(f"{module:>48}: {microseconds / 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark of the initialization of RecordMapper.
+
+It measures the time to build a RecordMapper (flattening the schemas and
+parsing their transform functions) for schemas with more and more fields,
+the first time a set of function strings is parsed and once they are
+already parsed (see FunctionBuilder.function_builders), and with a
+MappingRegistry, reusing the MappingPlan in memory or building the
+FlatSchemas from their description on disk.
+
+Run it from the root directory of the project:
+
+    python -m benchmarks.bench_init
+"""
+import tempfile
+import timeit
+
+from RecordMapper import RecordMapper
+from RecordMapper.MappingRegistry import MappingRegistry
+from RecordMapper.builders import FunctionBuilder
+
+FUNCTION_STRS = ["toInt", "toString", "toDate(%Y-%m-%d|%d/%m/%Y)", "copyFrom(field_0)",
+                 "tests.custom_functions_for_tests.sum(2)"]
+
+
+def get_schemas(field_count: int) -> tuple:
+    """Return a base schema with field_count fields (a tenth of them in a nested schema), and the nested schema."""
+
+    nested_count = field_count // 10
+
+    base_schema = {
+        "type": "record",
+        "name": "BenchSchema",
+        "fields": [
+            {"name": f"field_{index}", "type": ["string", "null"], "aliases": [f"old_field_{index}"],
+             "transform": FUNCTION_STRS[index % len(FUNCTION_STRS)]}
+            for index in range(field_count - nested_count)
+        ] + [
+            {"name": "nested_field", "type": ["BenchNestedSchema", "null"],
+             "nestedSchemaSelector": "tests.custom_functions_for_tests.selectSchema(BenchNestedSchema)"}
+        ]
+    }
+
+    nested_schema = {
+        "type": "record",
+        "name": "BenchNestedSchema",
+        "fields": [
+            {"name": f"nested_{index}", "type": ["string", "null"], "transform": "copyFrom(field_0)"}
+            for index in range(nested_count)
+        ]
+    }
+
+    return base_schema, nested_schema
+
+
+def build_record_mapper(base_schema: dict, nested_schema: dict, clear_cache: bool) -> RecordMapper:
+    """Build a RecordMapper, parsing the function strings again if clear_cache."""
+
+    if clear_cache:
+        FunctionBuilder.clear_function_builders()
+
+    return RecordMapper(base_schema, [nested_schema])
+
+
+def build_record_mapper_with_registry(base_schema: dict, nested_schema: dict,
+                                      mapping_registry: MappingRegistry) -> RecordMapper:
+    """Build a RecordMapper with a registry, removing the mappings kept in memory if it has a directory."""
+
+    if mapping_registry.directory is not None:
+        mapping_registry.clear()
+
+    return RecordMapper(base_schema, [nested_schema], mapping_registry=mapping_registry)
+
+
+def main():
+
+    with tempfile.TemporaryDirectory() as directory:
+        for field_count in (10, 100, 1000, 10_000):
+            base_schema, nested_schema = get_schemas(field_count)
+
+            results = {
+                name: min(timeit.repeat(build_function, number=1, repeat=5))
+                for name, build_function in (
+                    ("cold", lambda: build_record_mapper(base_schema, nested_schema, True)),
+                    ("warm", lambda: build_record_mapper(base_schema, nested_schema, False)),
+                    ("registry", lambda: build_record_mapper_with_registry(base_schema, nested_schema,
+                                                                           MappingRegistry())),
+                    ("registry hit", lambda registry=MappingRegistry(): build_record_mapper_with_registry(
+                        base_schema, nested_schema, registry
+                    )),
+                    ("disk", lambda registry=MappingRegistry(directory): build_record_mapper_with_registry(
+                        base_schema, nested_schema, registry
+                    ))
+                )
+            }
+
+            print(f"Fields: {field_count:>6}  " +
+                  "  ".join(f"{name}: {seconds * 1000:8.2f}ms" for name, seconds in results.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the XMLReader.
+
+It compares the peak memory (measured with tracemalloc), the time to the
+first record and the total time to read a generated xml file, parsing the
+whole document first and in streaming mode.
+
+Run it from the root directory of the project:
+
+    python -m benchmarks.bench_xml_reader [number of records]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from RecordMapper.xml.XMLReader import XMLReader
+
+
+def write_xml_file(file_path: str, records: int):
+    """Write an xml file with the given number of records."""
+
+    with open(file_path, "w") as xml_file:
+        xml_file.write('<?xml version="1.0" encoding="UTF-8"?>\n<records>\n')
+        for record_index in range(records):
+            fields = "".join(f"<field_{index}>value_{record_index}_{index}</field_{index}>" for index in range(20))
+            xml_file.write(f"  <record>{fields}</record>\n")
+        xml_file.write("</records>\n")
+
+
+def read_xml_file(file_path: str, streaming: bool) -> dict:
+    """Read an xml file, measuring the peak memory, the time to the first record and the total time."""
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_record_seconds = None
+    read_count = 0
+
+    reader = XMLReader(file_path, streaming)
+    for _ in reader.read_records():
+        if first_record_seconds is None:
+            first_record_seconds = time.perf_counter() - start
+        read_count += 1
+    reader.close()
+
+    total_seconds = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "read_count": read_count,
+        "first_record_seconds": first_record_seconds,
+        "total_seconds": total_seconds,
+        "peak_memory_mb": peak_memory / 1024 / 1024
+    }
+
+
+def main():
+
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    file_path = os.path.join(tempfile.mkdtemp(), "bench.xml")
+    write_xml_file(file_path, records)
+
+    print(f"Records: {records} ({os.path.getsize(file_path) / 1024 / 1024:.1f} MB)")
+    for streaming in (False, True):
+        results = read_xml_file(file_path, streaming)
+        print(f"{'streaming' if streaming else 'parse':>10}: first record {results['first_record_seconds']:.3f}s, "
+              f"total {results['total_seconds']:.3f}s, peak memory {results['peak_memory_mb']:.1f} MB")
+
+    os.remove(file_path)
+    os.rmdir(os.path.dirname(file_path))
+
+
+if __name__ == "__main__":
+    main()
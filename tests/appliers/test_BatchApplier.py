@@ -0,0 +1,106 @@
+import unittest
+
+from RecordMapper.appliers import BatchApplier, RenameApplier, TransformApplier, CleanApplier
+from RecordMapper.builders import BatchBuilder, FlatRecordBuilder
+from RecordMapper.builders.FlatSchemaBuilder import FieldData
+from RecordMapper.builders.BuiltinFunctions import copyFrom, toNull, toString, get_from_custom_variable
+
+from tests import custom_functions_for_tests
+
+
+class test_BatchApplier(unittest.TestCase):
+
+    def apply_chain(self, record, flat_schema, custom_variables):
+
+        flat_record = FlatRecordBuilder.get_flat_record_from_normal_record(record)
+
+        for applier in [RenameApplier(custom_variables), TransformApplier(custom_variables),
+                        CleanApplier(custom_variables)]:
+            flat_record, flat_schema = applier.apply(flat_record, flat_schema)
+
+        return FlatRecordBuilder.get_normal_record_from_flat_record(flat_record)
+
+    def test_same_results_as_the_chained_appliers(self):
+
+        # Arrange
+        test_schema = {
+            ("field_1", ): FieldData(["string"], ["old_field"], [], None),
+            ("field_2", ): FieldData(["int"], ["field_x"], [None, copyFrom("field_3"),
+                                     custom_functions_for_tests.collapse_values("field_2", "collapse_dict")], None),
+            ("field_3", ): FieldData(["int"], [], [custom_functions_for_tests.sum(1), copyFrom("field_2")], None),
+            ("field_4", "nested_field_1"): FieldData(["int"], ["field_6"], [toNull()], None),
+            ("field_4", "nested_field_2"): FieldData(["int"], [], [get_from_custom_variable("variable")], None),
+            ("field_5", ): FieldData(["string"], [], [toString()], None),
+            ("collapse_dict", ): FieldData(["string"], [], [], None)
+        }
+
+        input_batch = {
+            "old_field": ["hola", None, "adios"],
+            "field_x": [56, 1, None],
+            "field_3": [7, None, 3],
+            "field_5": [1, 2, None],
+            "field_6": [8, 9, 10],
+            "field_7": [1, 2, 3]
+        }
+
+        input_records = [
+            {key: column[index] for key, column in input_batch.items()}
+            for index in range(3)
+        ]
+
+        expected_records = [self.apply_chain(record, test_schema, {"variable": 9}) for record in input_records]
+
+        # Act
+        res_flat_batch, res_schema = BatchApplier({"variable": 9}).apply(
+            BatchBuilder.get_flat_batch_from_batch(input_batch), test_schema
+        )
+        res_records = res_flat_batch.get_records()
+
+        # Assert
+        self.assertListEqual(res_records, expected_records)
+        self.assertListEqual([repr(record) for record in res_records], [repr(record) for record in expected_records])
+        self.assertDictEqual(res_schema, test_schema)
+
+    def test_missing_values_in_some_records(self):
+
+        # Arrange
+        test_schema = {
+            ("field_1", ): FieldData(["string"], ["old_field"], [], None),
+            ("field_2", ): FieldData(["string"], [], [copyFrom("field_1")], None),
+        }
+
+        input_batch = {
+            "field_1": [None, "adios"],
+            "old_field": [{"nested": 1}, None]
+        }
+
+        flat_batch = BatchBuilder.get_flat_batch_from_batch(input_batch)
+        input_records = [
+            {"field_1": None, "old_field": {"nested": 1}},
+            {"field_1": "adios", "old_field": None}
+        ]
+
+        expected_records = [self.apply_chain(record, test_schema, {}) for record in input_records]
+
+        # Act
+        res_flat_batch, _ = BatchApplier({}).apply(flat_batch, test_schema)
+
+        # Assert
+        self.assertListEqual(res_flat_batch.get_records(), expected_records)
+
+    def test_invalid_transform_result(self):
+
+        # Arrange
+        def invalid_function(current_value, record, schema, custom_variables):
+            return 1, 2, 3
+
+        test_schema = {
+            ("field_1", ): FieldData(["int"], [], [invalid_function], None)
+        }
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            BatchApplier({}).apply(BatchBuilder.get_flat_batch_from_batch({"field_1": [1]}), test_schema)
+
+        # Assert
+        self.assertTrue("Invalid result in a transform function" in str(context.exception))
@@ -0,0 +1,97 @@
+import unittest
+
+from RecordMapper.appliers import FusedApplier, RenameApplier, TransformApplier, CleanApplier
+from RecordMapper.builders.FlatSchemaBuilder import FieldData
+from RecordMapper.builders.BuiltinFunctions import copyFrom, toNull, get_from_custom_variable
+
+from tests import custom_functions_for_tests
+
+
+class test_FusedApplier(unittest.TestCase):
+
+    def apply_chain(self, flat_record, flat_schema, custom_variables):
+
+        for applier in [RenameApplier(custom_variables), TransformApplier(custom_variables),
+                        CleanApplier(custom_variables)]:
+            flat_record, flat_schema = applier.apply(flat_record, flat_schema)
+
+        return flat_record
+
+    def test_apply(self):
+
+        # Arrange
+        test_schema = {
+            ("field_1", ): FieldData(["string"], ["old_field"], [], None),
+            ("field_2", ): FieldData(["int"], [], [None, copyFrom("field_3")], None),
+            ("field_3", ): FieldData(["int"], [], [custom_functions_for_tests.sum(1), copyFrom("field_2")], None),
+            ("field_4", "nested_field_1"): FieldData(["int"], ["field_6"], [toNull()], None),
+            ("field_4", "nested_field_2"): FieldData(["int"], [], [get_from_custom_variable("variable")], None)
+        }
+
+        input_record = {
+            ("old_field",): "hola",
+            ("field_2",): 56,
+            ("field_3",): 7,
+            ("field_6",): 8
+        }
+
+        expected_record = {
+            ("field_1",): "hola",
+            ("field_2",): 8,
+            ("field_3",): 56,
+            ("field_4", "nested_field_1"): None,
+            ("field_4", "nested_field_2"): 9
+        }
+
+        # Act
+        res_record, res_schema = FusedApplier({"variable": 9}).apply(input_record, test_schema)
+
+        # Assert
+        self.assertDictEqual(res_record, expected_record)
+        self.assertListEqual(list(res_record.keys()), list(expected_record.keys()))
+        self.assertDictEqual(res_schema, test_schema)
+
+    def test_same_results_as_the_chained_appliers(self):
+
+        # Arrange
+        test_schema = {
+            ("field_1", ): FieldData(["string"], [], [], None),
+            ("field_2", ): FieldData(["int"], ["field_x"], [None, copyFrom("field_3"),
+                                     custom_functions_for_tests.collapse_values("field_2", "collapse_dict")], None),
+            ("field_3", ): FieldData(["int"], [], [], None),
+            ("field_5", ): FieldData(["int"], [], [custom_functions_for_tests.collapse_values("field_5",
+                                                                                            "collapse_dict")], None),
+            ("collapse_dict", ): FieldData(["string"], [], [], None)
+        }
+
+        input_records = [
+            {("field_1",): "hola", ("field_x",): 56, ("field_3",): 7, ("field_7",): 1},
+            {("field_2",): 5, ("field_5",): 3},
+            {}
+        ]
+
+        for input_record in input_records:
+            # Act
+            chain_record = self.apply_chain({**input_record}, test_schema, {})
+            fused_record, _ = FusedApplier({}).apply({**input_record}, test_schema)
+
+            # Assert
+            self.assertDictEqual(fused_record, chain_record)
+            self.assertListEqual(list(fused_record.keys()), list(chain_record.keys()))
+
+    def test_invalid_transform_result(self):
+
+        # Arrange
+        def invalid_function(current_value, record, schema, custom_variables):
+            return 1, 2, 3
+
+        test_schema = {
+            ("field_1", ): FieldData(["int"], [], [invalid_function], None)
+        }
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            FusedApplier({}).apply({}, test_schema)
+
+        # Assert
+        self.assertTrue("Invalid result in a transform function" in str(context.exception))
@@ -68,3 +68,64 @@ class test_NestedSchemaSelectorApplier(unittest.TestCase):
         
         self.assertListEqual(list(res_complete_flat_schema.keys()), [("field_1",) ])
 
+    def test_apply_calls_selector_once_and_caches_the_schema(self):
+
+        # Arrange
+        calls = []
+
+        def test_selector(key, record, custom_variables):
+
+            calls.append(key)
+            return record[("schema",)]
+
+        test_flat_schemas = {
+            "base_schema": {
+                ("schema", ): FieldData(["string"], [], [], None),
+                ("field_2", ): FieldData(["NestSchema1", "NestSchema2"], [], [], test_selector),
+            },
+            "NestSchema1": {
+                ("nested_field_1", ): FieldData(["int"], [], [], None)
+            },
+            "NestSchema2": {
+                ("nested_field_2", ): FieldData(["int"], [], [], None)
+            }
+        }
+
+        ne = NestedSchemaSelectorApplier(test_flat_schemas, {})
+
+        # Act
+        _, res_schema_1 = ne.apply({("schema",): "NestSchema1"}, test_flat_schemas["base_schema"])
+        _, res_schema_2 = ne.apply({("schema",): "NestSchema2"}, test_flat_schemas["base_schema"])
+        _, res_schema_3 = ne.apply({("schema",): "NestSchema1"}, test_flat_schemas["base_schema"])
+
+        # Assert
+        self.assertEqual(len(calls), 3)
+        self.assertListEqual(list(res_schema_1.keys()), [("schema",), ("field_2", "nested_field_1")])
+        self.assertListEqual(list(res_schema_2.keys()), [("schema",), ("field_2", "nested_field_2")])
+        self.assertIs(res_schema_1, res_schema_3)
+
+        with self.assertRaises(TypeError):
+            res_schema_1[("field_3",)] = FieldData(["int"], [], [], None)
+
+    def test_apply_with_invalid_schema_name(self):
+
+        # Arrange
+        def test_selector(key, record, custom_variables):
+
+            return "NestSchemaNope"
+
+        test_flat_schemas = {
+            "base_schema": {
+                ("field_2", ): FieldData(["NestSchema1"], [], [], test_selector),
+            },
+            "NestSchema1": {
+                ("nested_field_1", ): FieldData(["int"], [], [], None)
+            }
+        }
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            NestedSchemaSelectorApplier(test_flat_schemas, {}).apply({}, test_flat_schemas["base_schema"])
+
+        # Assert
+        self.assertTrue("Invalid nested schema name" in str(context.exception))
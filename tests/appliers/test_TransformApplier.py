@@ -183,4 +183,31 @@ class test_TransformApplier(unittest.TestCase):
         
         # Assert
         self.assertDictEqual(res_record, expected_record)
-        self.assertDictEqual(res_schema, test_schema)
\ No newline at end of file
+        self.assertDictEqual(res_schema, test_schema)
+
+    def test_transform_does_not_modify_the_input_record(self):
+        # Arrange
+        test_schema = {
+            ("field_1", ) : FieldData(["int"], [], [copyFrom("field_2"), custom_functions_for_tests.sum(1)], None),
+            ("field_2", ) : FieldData(["int"], [], [copyFrom("field_1")], None)
+        }
+
+        input_record = {
+            ("field_1",): 1,
+            ("field_2",): 2
+        }
+
+        expected_record = {
+            ("field_1",): 3,
+            ("field_2",): 1
+        }
+
+        # Act
+        transform_applier = TransformApplier({})
+        res_record_1, _ = transform_applier.apply(input_record, test_schema)
+        res_record_2, _ = transform_applier.apply(input_record, test_schema)
+
+        # Assert
+        self.assertDictEqual(res_record_1, expected_record)
+        self.assertDictEqual(res_record_2, expected_record)
+        self.assertDictEqual(input_record, {("field_1",): 1, ("field_2",): 2})
@@ -1,9 +1,16 @@
+import io
 import unittest
 import tempfile
 import os
 
 from RecordMapper.avro import AvroWriter
+from RecordMapper.avro.AvroWriter import AvroMatchingException
 from RecordMapper.avro import AvroReader
+from RecordMapper.avro.AvroProjector import AvroProjector
+from RecordMapper.avro import AvroSplitter
+from RecordMapper.avro import AvroBlockWriter
+
+import fastavro
 
 class test_AvroWriter(unittest.TestCase):
 
@@ -142,3 +149,426 @@ class test_AvroWriter(unittest.TestCase):
 
         # Assert
         self.assertListEqual(res_records, expected_records)
+
+    def test_write_with_codecs(self):
+
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+               {"name": "field_1", "type": ["string", "null"]},
+               {"name": "field_2", "type": ["int", "null"]}
+            ]
+        }
+
+        test_records = [{"field_1": f"value_{index}", "field_2": index} for index in range(300)]
+
+        test_output_opts = [
+            {"avro_codec": "deflate", "avro_compression_level": 9, "avro_sync_interval": 500},
+            {"avro_codec": "bzip2", "avro_sync_interval": 500, "avro_compression_threads": 2},
+            {"avro_codec": "xz", "avro_compression_threads": 1},
+        ]
+
+        for output_opts in test_output_opts:
+            temp_file = tempfile.NamedTemporaryFile(delete=False)
+            temp_file.close()
+
+            # Act
+            writer = AvroWriter(temp_file.name, test_schema)
+            writer.write_records(test_records, output_opts)
+            writer.close()
+
+            # Assert
+            with open(temp_file.name, "rb") as avro_file:
+                avro_reader = fastavro.reader(avro_file)
+                self.assertListEqual(list(avro_reader), test_records)
+                self.assertEqual(avro_reader.codec, output_opts["avro_codec"])
+
+            if "avro_sync_interval" in output_opts:
+                self.assertGreater(len(list(AvroSplitter(temp_file.name).get_byte_ranges(1))), 1)
+
+            os.remove(temp_file.name)
+
+    def test_write_with_an_invalid_codec(self):
+
+        # Arrange
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        temp_file.close()
+
+        writer = AvroWriter(temp_file.name, {"type": "record", "name": "TestSchema", "fields": []})
+
+        # Act & Assert
+        with self.assertRaises(RuntimeError) as context:
+            writer.open({"avro_codec": "invalid"})
+        self.assertTrue("Invalid avro codec" in str(context.exception))
+
+        writer.output_stream.close()
+        os.remove(temp_file.name)
+
+    def test_write_with_encoding_workers(self):
+
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+               {"name": "field_1", "type": "string"},
+               {"name": "field_2", "type": ["int", "null"]}
+            ]
+        }
+
+        test_records = [{"field_1": f"value_{index}", "field_2": index} for index in range(500)]
+        invalid_record = {"field_2": 1}
+        output_opts = {"avro_encoding_workers": 2, "avro_encoding_chunk_size": 30, "avro_codec": "deflate",
+                       "avro_sync_interval": 200}
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        temp_file.close()
+
+        # Act
+        writer = AvroWriter(temp_file.name, test_schema)
+        writer.write_records(test_records, output_opts)
+        writer.close()
+
+        with open(temp_file.name, "rb") as avro_file:
+            res_records = list(fastavro.reader(avro_file))
+
+        invalid_writer = AvroWriter(temp_file.name, test_schema)
+        with self.assertRaises(AvroMatchingException) as context:
+            try:
+                invalid_writer.write_records(test_records[:245] + [invalid_record] + test_records[245:], output_opts)
+            finally:
+                invalid_writer.close()
+
+        with open(temp_file.name, "rb") as avro_file:
+            res_invalid_records = list(fastavro.reader(avro_file))
+
+        os.remove(temp_file.name)
+
+        # Assert
+        self.assertListEqual(res_records, test_records)
+        self.assertEqual(writer.write_count, 500)
+
+        self.assertTrue(f"for row -> {invalid_record}" in str(context.exception))
+        self.assertListEqual(res_invalid_records, test_records[:245])
+        self.assertEqual(invalid_writer.write_count, 245)
+
+    def test_write_with_encoding_workers_and_a_record_of_another_type(self):
+
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+               {"name": "field_1", "type": "int"}
+            ]
+        }
+
+        # fastavro raises a TypeError for this record, instead of a ValueError.
+        invalid_record = {"field_1": "not an int"}
+        test_records = [{"field_1": index} for index in range(5000)]
+        output_opts = {"avro_encoding_workers": 2, "avro_encoding_chunk_size": 100}
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        temp_file.close()
+
+        # Act
+        writer = AvroWriter(temp_file.name, test_schema)
+        with self.assertRaises(AvroMatchingException) as context:
+            try:
+                writer.write_records(test_records[:3333] + [invalid_record] + test_records[3333:], output_opts)
+            finally:
+                writer.close()
+
+        with open(temp_file.name, "rb") as avro_file:
+            res_records = list(fastavro.reader(avro_file))
+
+        os.remove(temp_file.name)
+
+        # Assert
+        self.assertTrue(f"for row -> {invalid_record}" in str(context.exception))
+        self.assertListEqual(res_records, test_records[:3333])
+        self.assertEqual(writer.write_count, 3333)
+
+    def test_write_a_record_of_another_type(self):
+
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+               {"name": "field_1", "type": "int"}
+            ]
+        }
+
+        # fastavro raises a TypeError for this record, instead of a ValueError.
+        invalid_record = {"field_1": "not an int"}
+        test_records = [{"field_1": index} for index in range(500)]
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        temp_file.close()
+
+        # Act
+        writer = AvroWriter(temp_file.name, test_schema)
+        with self.assertRaises(AvroMatchingException) as context:
+            try:
+                writer.write_records(test_records[:245] + [invalid_record] + test_records[245:], {})
+            finally:
+                writer.close()
+
+        os.remove(temp_file.name)
+
+        # Assert
+        self.assertTrue(f"for row -> {invalid_record}" in str(context.exception))
+        self.assertEqual(writer.write_count, 245)
+
+
+class test_AvroBlockWriter(unittest.TestCase):
+
+    test_schema = {
+        "type": "record",
+        "name": "TestSchema",
+        "fields": [
+           {"name": "field_1", "type": ["string", "null"]},
+           {"name": "field_2", "type": ["int", "null"]}
+        ]
+    }
+
+    def test_write_records_and_blocks_in_order(self):
+
+        # Arrange
+        parsed_schema = fastavro.parse_schema(self.test_schema)
+        test_records = [{"field_1": f"value_{index}", "field_2": index} for index in range(100)]
+
+        encoded_block = io.BytesIO()
+        for record in test_records[40:60]:
+            fastavro.schemaless_writer(encoded_block, parsed_schema, record)
+
+        for compression_threads in (0, 2):
+            output = io.BytesIO()
+
+            # Act
+            writer = AvroBlockWriter(output, parsed_schema, "deflate", sync_interval=100,
+                                     compression_threads=compression_threads)
+            for record in test_records[:40]:
+                writer.write(record)
+            writer.write_block(20, encoded_block.getvalue())
+            writer.write_compressed_block(
+                20, AvroBlockWriter.get_compression_function("deflate")(encoded_block.getvalue())
+            )
+            for record in test_records[60:]:
+                writer.write(record)
+            writer.flush()
+
+            # Assert
+            output.seek(0)
+            self.assertListEqual(list(fastavro.reader(output)), test_records[:60] + test_records[40:])
+
+    def test_encode_long(self):
+
+        # Arrange
+        test_values = [0, 1, -1, 63, -64, 64, 300, 2 ** 40, -(2 ** 40)]
+
+        for value in test_values:
+
+            # Act
+            encoded_value = AvroBlockWriter.encode_long(value)
+
+            # Assert
+            self.assertEqual(fastavro.schemaless_reader(io.BytesIO(encoded_value), "long"), value)
+            self.assertEqual(AvroBlockWriter.decode_long(encoded_value, 0), (value, len(encoded_value)))
+
+
+class test_AvroProjector(unittest.TestCase):
+
+    def test_project_as_read_from_avro(self):
+
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+               {"name": "field_1", "type": ["string", "null"]},
+               {"name": "field_2", "type": ["null", "int", "string"]},
+               {"name": "field_3", "type": ["null", "float", "double"]},
+               {"name": "field_4", "type": "float", "default": 1.1},
+               {"name": "field_5", "type": {"type": "map", "values": ["float", "null"]}, "default": {}},
+               {"name": "field_6", "type": ["null", {"type": "long", "logicalType": "timestamp-millis"}]},
+               {"name": "field_7", "type": ["null", "NestedSchema", "NestedSchema2"]},
+               {"name": "field_8", "type": "boolean", "default": False}
+            ]
+        }
+
+        test_nested_schema = {
+            "type": "record",
+            "name": "NestedSchema",
+            "fields": [
+               {"name": "nested_field_1", "type": ["int", "null"]},
+               {"name": "nested_field_2", "type": ["float", "null"]}
+            ]
+        }
+
+        test_nested_schema_2 = {
+            "type": "record",
+            "name": "NestedSchema2",
+            "fields": [
+               {"name": "nested_field_2", "type": ["float", "null"]},
+               {"name": "nested_field_3", "type": ["int", "null"]},
+            ]
+        }
+
+        test_records = [
+            {"field_1": "campo 1", "field_2": 5, "field_3": 1, "field_5": {"a": 0.3}, "field_6": 1600000000000,
+             "field_7": {"nested_field_3": 1, "nested_field_2": 0.7}, "field_9": "ignored"},
+            {"field_2": "5", "field_3": 0.1, "field_4": 2, "field_7": {"nested_field_1": 2}, "field_8": 1},
+            {"field_7": {}}
+        ]
+
+        avro_temp_file = tempfile.NamedTemporaryFile(delete=False)
+        avro_writer = AvroWriter(avro_temp_file.name, test_schema, [test_nested_schema, test_nested_schema_2])
+        avro_writer.write_records(test_records, {})
+        avro_writer.close()
+
+        avro_reader = AvroReader(avro_temp_file.name)
+        expected_records = list(avro_reader.read_records())
+        avro_reader.close()
+
+        # Act
+        projector = AvroProjector(test_schema, [test_nested_schema, test_nested_schema_2])
+        res_records = [projector.project(record) for record in test_records]
+
+        # Assert
+        self.assertListEqual(res_records, expected_records)
+        self.assertListEqual([repr(record) for record in res_records], [repr(record) for record in expected_records])
+
+        os.remove(avro_temp_file.name)
+
+
+class test_AvroReader(unittest.TestCase):
+
+    test_schema = {
+        "type": "record",
+        "name": "TestSchema",
+        "fields": [
+           {"name": "field_1", "type": ["string", "null"]},
+           {"name": "field_2", "type": ["int", "null"]}
+        ]
+    }
+
+    def test_memory_map(self):
+
+        # Arrange
+        test_records = [{"field_1": f"value_{index}", "field_2": index} for index in range(200)]
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        fastavro.writer(temp_file, fastavro.parse_schema(self.test_schema), test_records, sync_interval=100)
+        temp_file.close()
+
+        # Act
+        reader = AvroReader(temp_file.name, memory_map=True)
+        res_records = list(reader.read_records())
+        block_offsets = reader.get_block_offsets()
+        res_block_records = [list(reader.read_records_from_block(offset)) for offset in block_offsets]
+        reader.close()
+
+        # Assert
+        self.assertListEqual(res_records, test_records)
+        self.assertGreater(len(block_offsets), 1)
+        for block_records in res_block_records:
+            self.assertListEqual(block_records, test_records[-len(block_records):])
+        self.assertListEqual(res_block_records[0], test_records)
+
+        os.remove(temp_file.name)
+
+
+class test_AvroSplitter(unittest.TestCase):
+
+    test_schema = {
+        "type": "record",
+        "name": "TestSchema",
+        "fields": [
+           {"name": "field_1", "type": ["string", "null"]},
+           {"name": "field_2", "type": ["int", "null"]}
+        ]
+    }
+
+    def write_avro_file(self, records, codec="null", sync_interval=100):
+
+        temp_file = tempfile.NamedTemporaryFile(delete=False)
+        fastavro.writer(temp_file, fastavro.parse_schema(self.test_schema), records, codec=codec,
+                        sync_interval=sync_interval)
+        temp_file.close()
+
+        return temp_file.name
+
+    def test_same_records_as_avro_reader(self):
+
+        # Arrange
+        test_records = [{"field_1": f"value_{index}", "field_2": index} for index in range(200)]
+
+        for codec in ("null", "deflate"):
+            file_path = self.write_avro_file(test_records, codec)
+            file_size = os.path.getsize(file_path)
+
+            for range_size in (1, 100, 1000, file_size):
+
+                # Act
+                splitter = AvroSplitter(file_path)
+                header_size = splitter.get_header_size()
+                byte_ranges = list(splitter.get_byte_ranges(range_size))
+
+                reader = AvroReader(file_path, memory_map=True)
+                res_records = [
+                    record
+                    for start, end in byte_ranges
+                    for record in reader.read_records_from_block(start, end)
+                ]
+                reader.close()
+
+                # Assert
+                self.assertListEqual(res_records, test_records)
+                self.assertEqual(byte_ranges[0][0], header_size)
+                self.assertEqual(byte_ranges[-1][1], file_size)
+                for (_, end), (start, _) in zip(byte_ranges, byte_ranges[1:]):
+                    self.assertEqual(end, start)
+
+            os.remove(file_path)
+
+    def test_empty_file(self):
+
+        # Arrange
+        file_path = self.write_avro_file([])
+
+        # Act
+        byte_ranges = list(AvroSplitter(file_path).get_byte_ranges(100))
+
+        # Assert
+        self.assertListEqual(byte_ranges, [])
+
+        os.remove(file_path)
+
+    def test_invalid_files(self):
+
+        # Arrange
+        not_avro_file = tempfile.NamedTemporaryFile("w", delete=False)
+        not_avro_file.write("field_1,field_2\n1,2\n")
+        not_avro_file.close()
+
+        corrupted_file_path = self.write_avro_file([{"field_1": "value", "field_2": 1}])
+        with open(corrupted_file_path, "r+b") as corrupted_file:
+            corrupted_file.seek(-1, os.SEEK_END)
+            last_byte = corrupted_file.read(1)
+            corrupted_file.seek(-1, os.SEEK_END)
+            corrupted_file.write(b"\x00" if last_byte != b"\x00" else b"\x01")
+
+        # Act & Assert
+        with self.assertRaises(RuntimeError):
+            AvroSplitter(not_avro_file.name).get_header_size()
+
+        with self.assertRaises(RuntimeError) as context:
+            list(AvroSplitter(corrupted_file_path).get_byte_ranges(100))
+        self.assertTrue("Invalid sync marker" in str(context.exception))
+
+        os.remove(not_avro_file.name)
+        os.remove(corrupted_file_path)
@@ -0,0 +1,91 @@
+import unittest
+
+from RecordMapper.builders import BatchBuilder, FlatRecordBuilder
+from RecordMapper.builders.BatchBuilder import FlatBatch
+from RecordMapper.builders.SlotRecordBuilder import EMPTY_SLOT
+
+
+class test_BatchBuilder(unittest.TestCase):
+
+    def test_get_flat_batch_from_batch(self):
+
+        # Arrange
+        input_batch = {
+            "field_1": [5, 6, 7],
+            "field_2": [{"field_x": 7}, None, {"field_x": 8, "field_y": 9}]
+        }
+
+        expected_columns = {
+            ("field_1",): [5, 6, 7],
+            ("field_2", "field_x"): [7, EMPTY_SLOT, 8],
+            ("field_2",): [EMPTY_SLOT, None, EMPTY_SLOT],
+            ("field_2", "field_y"): [EMPTY_SLOT, EMPTY_SLOT, 9]
+        }
+
+        # Act
+        res_flat_batch = BatchBuilder.get_flat_batch_from_batch(input_batch)
+
+        # Assert
+        self.assertEqual(res_flat_batch.size, 3)
+        self.assertDictEqual(res_flat_batch.columns, expected_columns)
+
+    def test_get_flat_batch_from_batch_with_different_lengths(self):
+
+        # Arrange
+        input_batch = {
+            "field_1": [5, 6, 7],
+            "field_2": [1, 2]
+        }
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            BatchBuilder.get_flat_batch_from_batch(input_batch)
+
+        # Assert
+        self.assertTrue("same length" in str(context.exception))
+
+    def test_get_records_from_flat_batch(self):
+
+        # Arrange
+        input_records = [
+            {"field_1": 5, "field_2": {"field_x": 7}},
+            {"field_1": 6, "field_2": None},
+            {"field_2": {"field_x": 8, "field_y": 9}}
+        ]
+
+        flat_batch = FlatBatch({
+            ("field_1",): [5, 6, EMPTY_SLOT],
+            ("field_2", "field_x"): [7, EMPTY_SLOT, 8],
+            ("field_2",): [EMPTY_SLOT, None, EMPTY_SLOT],
+            ("field_2", "field_y"): [EMPTY_SLOT, EMPTY_SLOT, 9]
+        }, 3)
+
+        expected_records = [
+            FlatRecordBuilder.get_normal_record_from_flat_record(
+                FlatRecordBuilder.get_flat_record_from_normal_record(record))
+            for record in input_records
+        ]
+
+        # Act
+        res_records = flat_batch.get_records()
+
+        # Assert
+        self.assertListEqual(res_records, expected_records)
+
+    def test_take_and_merge(self):
+
+        # Arrange
+        flat_batch = FlatBatch({
+            ("field_1",): [5, 6, 7, 8],
+            ("field_2",): [EMPTY_SLOT, 1, EMPTY_SLOT, 2]
+        }, 4)
+
+        # Act
+        even_batch = BatchBuilder.take(flat_batch, [0, 2])
+        odd_batch = BatchBuilder.take(flat_batch, [1, 3])
+        res_flat_batch = BatchBuilder.merge([even_batch, odd_batch], [[0, 2], [1, 3]], 4)
+
+        # Assert
+        self.assertDictEqual(even_batch.columns, {("field_1",): [5, 7]})
+        self.assertDictEqual(odd_batch.columns, {("field_1",): [6, 8], ("field_2",): [1, 2]})
+        self.assertDictEqual(res_flat_batch.columns, flat_batch.columns)
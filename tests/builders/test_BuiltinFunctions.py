@@ -1,6 +1,15 @@
+import time
 import unittest
+from datetime import datetime
 
 from RecordMapper.builders import BuiltinFunctions
+from RecordMapper.builders.BatchBuilder import BatchContext, column_as_list
+from RecordMapper.builders.SlotRecordBuilder import EMPTY_SLOT
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class test_transform_functions(unittest.TestCase):
@@ -109,4 +118,220 @@ class test_transform_functions(unittest.TestCase):
         except:
             assert False
         else:
-            assert True
\ No newline at end of file
+            assert True
+
+    def test_dates_are_cached(self):
+
+        # Arrange
+        BuiltinFunctions.date_parse_cache.clear()
+        to_date_function = BuiltinFunctions.toDate("%d/%m/%Y", "%Y-%m-%d")
+        transform_date_function = BuiltinFunctions.transform_date_between_formats("%d/%m/%Y", "%Y-%m-%d")
+
+        # A date without year is parsed by dateparser in the current year, which is the previous one if it is future.
+        now = datetime.now()
+        expected_year = now.year - 1 if datetime(now.year, 12, 31) > now else now.year
+
+        # Act
+        res_to_date = [to_date_function(value, {}, None, {}) for value in ["2019-07-17", "17/07/2019", "2019-07-17"]]
+        res_transform_date = [transform_date_function(value, {}, None, {}) for value in ["31 December"] * 2]
+        res_counts = BuiltinFunctions.date_parse_cache.reset_counts()
+
+        # Assert
+        self.assertListEqual(res_to_date, ["2019-07-17 00:00:00", "2019-07-17 00:00:00", "2019-07-17 00:00:00"])
+        self.assertListEqual(res_transform_date, [f"{expected_year}-12-31"] * 2)
+        # The date without year depends on the current date, so it is not cached.
+        self.assertDictEqual(res_counts, {"hits": 1, "misses": 4, "formats": {"%Y-%m-%d": 2, "%d/%m/%Y": 1}})
+
+    def test_absolute_dates_parsed_by_dateparser_are_cached(self):
+
+        # Arrange
+        BuiltinFunctions.date_parse_cache.clear()
+        transform_function = BuiltinFunctions.transform_date_between_formats("%d/%m/%Y", "%Y-%m-%d")
+
+        # Act
+        res_dates = [transform_function(value, {}, None, {}) for value in ["31 December 2019", "-"] * 2]
+        res_counts = BuiltinFunctions.date_parse_cache.reset_counts()
+
+        # Assert
+        # The values that dateparser can not parse do not depend on the current date either.
+        self.assertListEqual(res_dates, ["2019-12-31", None] * 2)
+        self.assertDictEqual(res_counts, {"hits": 2, "misses": 2, "formats": {}})
+
+    def test_relative_dates_are_not_cached(self):
+
+        # Arrange
+        BuiltinFunctions.date_parse_cache.clear()
+        transform_function = BuiltinFunctions.transform_date_between_formats("%d/%m/%Y", "%Y-%m-%d %H:%M:%S.%f")
+
+        # Act
+        res_first_date = transform_function("1 second ago", {}, None, {})
+        time.sleep(0.01)
+        res_second_date = transform_function("1 second ago", {}, None, {})
+
+        # Assert
+        # The relative dates are parsed by dateparser from the current date each time.
+        self.assertLess(res_first_date, res_second_date)
+
+    def test_toDate_with_several_formats(self):
+
+        # Arrange
+        formats = ["%d/%m/%Y", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%d %b %Y", "%Y-%m-%d"]
+        values = ["07/17/2019"] * 5 + ["01/02/2019", "2019-07-17 10:51:57.0", "2019-07-17 10:51:57.000001",
+                                       "2019-07-17T10:51:57", "2019-07-17T10:51:57+01:00", "17 jul 2019", "17 Jul",
+                                       "2019-07-17", "20190717", "2019-7-17", " 1/07/2019", "", "hola"]
+
+        def parse_in_order(value):
+            for format in formats:
+                try:
+                    return str(datetime.strptime(value, format))
+                except ValueError:
+                    pass
+
+            return None
+
+        BuiltinFunctions.date_parse_cache.clear()
+        transform_function = BuiltinFunctions.toDate(*formats)
+
+        # Act
+        res = [transform_function(value, {}, None, {}) for value in values]
+        res_counts = BuiltinFunctions.date_parse_cache.reset_counts()
+
+        # Assert
+        # The most successful format is tried first, but "01/02/2019" is still parsed with the first format.
+        self.assertListEqual(res, [parse_in_order(value) for value in values])
+        self.assertEqual(res[5], "2019-02-01 00:00:00")
+        self.assertDictEqual(res_counts["formats"], {"%m/%d/%Y": 5, "%d/%m/%Y": 2, "%Y-%m-%d %H:%M:%S.%f": 2,
+                                                     "%Y-%m-%dT%H:%M:%S": 1, "%d %b %Y": 1, "%Y-%m-%d": 2})
+        with self.assertRaises(TypeError):
+            transform_function(20190717, {}, None, {})
+
+
+class test_batch_functions(unittest.TestCase):
+
+    values = [None, 5, -3, 2.5, -2.5, "7", "7,9", "-1.5", " 3 ", "hola", "", "nan", "inf", True, "1e3", [1], {"a": 1}]
+
+    def apply_scalar(self, transform_function, column, record_list, custom_variables):
+        return [
+            transform_function(value, record, {}, custom_variables)
+            for value, record in zip(column, record_list)
+        ]
+
+    def apply_batch(self, transform_function, column, columns, custom_variables):
+        batch_context = BatchContext(columns, len(column), {}, custom_variables)
+        return column_as_list(transform_function.batch_function(column, batch_context))
+
+    def assertSameResults(self, res_batch, res_scalar):
+        self.assertListEqual([repr(res) for res in res_batch], [repr(res) for res in res_scalar])
+
+    def test_batch_functions_give_the_same_results(self):
+
+        # Arrange
+        transform_functions = [
+            BuiltinFunctions.copyFrom("field_2"),
+            BuiltinFunctions.toNull(),
+            BuiltinFunctions.toFloat(),
+            BuiltinFunctions.toInt(),
+            BuiltinFunctions.toRoundedInt(True),
+            BuiltinFunctions.toRoundedInt(False),
+            BuiltinFunctions.toString(),
+            BuiltinFunctions.toBool("7"),
+            BuiltinFunctions.get_from_custom_variable("variable")
+        ]
+
+        column = self.values
+        columns = {
+            ("field_1",): column,
+            ("field_2",): list(reversed(column))
+        }
+        record_list = [
+            {key: other_column[index] for key, other_column in columns.items()}
+            for index in range(len(column))
+        ]
+
+        for transform_function in transform_functions:
+            # Act
+            res_scalar = self.apply_scalar(transform_function, column, record_list, {"variable": 9})
+            res_batch = self.apply_batch(transform_function, column, columns, {"variable": 9})
+
+            # Assert
+            self.assertSameResults(res_batch, res_scalar)
+
+    def test_date_batch_functions_give_the_same_results(self):
+
+        # Arrange
+        BuiltinFunctions.date_parse_cache.clear()
+        timestamps = [None, 0, -1500, 1563360717123, "1563360717123", 1563360717123.0, 1563360717123.5,
+                      1553994000000, 1572138000000, 2 ** 40]
+        dates = [None, "17/07/2019", "07/17/2019", "01/02/2019", "30/02/2019", "29/02/2020", "7/17/2019",
+                 "2019-07-17 10:51:57", "2019-07-17 24:51:57", "0999-07-17 10:51:57", "17/07/19", "17/07/70",
+                 "Jul 2019", "20190717", "17-07-2019", " 17/07/2019"]
+        # The dates that are not parsed with the input format are parsed by dateparser.
+        transformed_dates = [None, "", "2019-07-17 10:51:57", "0999-07-17 10:51:57", "2020-02-29 00:00:00",
+                             "17/07/2019", "7/7/2019", "17-07-2019"]
+
+        transform_functions = [
+            (BuiltinFunctions.timestampToDate("%Y-%m-%d %H:%M:%S.%f"), timestamps),
+            (BuiltinFunctions.timestampToDate("%d/%m/%y %j"), timestamps),
+            (BuiltinFunctions.timestampToDate("%b %Y"), timestamps),
+            (BuiltinFunctions.toDate("%d/%m/%Y", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S"), dates),
+            (BuiltinFunctions.toDate("%d/%m/%y", "%b %Y", "%Y%m%d"), dates),
+            (BuiltinFunctions.transform_date_between_formats("%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M"), transformed_dates),
+            (BuiltinFunctions.transform_date_between_formats("%d/%m/%Y", "%Y%m%d %j"), transformed_dates)
+        ]
+
+        for transform_function, column in transform_functions:
+            # Act
+            res_scalar = self.apply_scalar(transform_function, column, [{}] * len(column), {})
+            res_batch = self.apply_batch(transform_function, column, {}, {})
+
+            # Assert
+            self.assertSameResults(res_batch, res_scalar)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_batch_functions_with_numpy_columns(self):
+
+        # Arrange
+        transform_functions = [
+            BuiltinFunctions.toFloat(),
+            BuiltinFunctions.toInt(),
+            BuiltinFunctions.toRoundedInt(True),
+            BuiltinFunctions.toRoundedInt(False),
+            BuiltinFunctions.toString(),
+            BuiltinFunctions.toBool("1")
+        ]
+
+        numpy_columns = [
+            numpy.array([1, -2, 3]),
+            numpy.array([1.5, -2.5, numpy.nan]),
+            numpy.array([0.1, 2.7, -1], dtype=numpy.float32),
+            numpy.array(["1", "2,5", "hola"]),
+            numpy.array([True, False, True])
+        ]
+
+        for transform_function in transform_functions:
+            for numpy_column in numpy_columns:
+                # The scalar functions receive the Python values of the column.
+                column = numpy_column.tolist()
+
+                # Act
+                res_scalar = self.apply_scalar(transform_function, column, [{}] * len(column), {})
+                res_batch = self.apply_batch(transform_function, numpy_column, {}, {})
+
+                # Assert
+                self.assertSameResults(res_batch, res_scalar)
+
+    def test_copyFrom_missing_values(self):
+
+        # Arrange
+        transform_function = BuiltinFunctions.copyFrom("field_2")
+        columns = {
+            ("field_2",): [EMPTY_SLOT, 5]
+        }
+
+        # Act
+        res_batch = self.apply_batch(transform_function, [1, 2], columns, {})
+        res_missing_column = self.apply_batch(transform_function, [1, 2], {}, {})
+
+        # Assert
+        self.assertListEqual(res_batch, [None, 5])
+        self.assertListEqual(res_missing_column, [None, None])
@@ -0,0 +1,57 @@
+import re
+import unittest
+
+from RecordMapper.builders import DateColumnConverter
+
+
+@unittest.skipIf(not DateColumnConverter.is_available(), "NumPy is not installed")
+class test_DateColumnConverter(unittest.TestCase):
+
+    def test_get_format_layout(self):
+
+        # Act
+        res_layout = DateColumnConverter.get_format_layout("%Y-%m-%d %%%j")
+        res_parsed_layout = DateColumnConverter.get_format_layout("%Y-%m-%d %j", parsed=True)
+        res_other_directive_layout = DateColumnConverter.get_format_layout("%d %b %Y")
+        res_repeated_directive_layout = DateColumnConverter.get_format_layout("%Y %Y")
+
+        # Assert
+        self.assertListEqual(res_layout, [("Y", None), (None, "-"), ("m", None), (None, "-"), ("d", None),
+                                          (None, " "), (None, "%"), ("j", None)])
+        self.assertIsNone(res_parsed_layout)
+        self.assertIsNone(res_other_directive_layout)
+        self.assertIsNone(res_repeated_directive_layout)
+
+    def test_parse_and_format_strings(self):
+
+        # Arrange
+        values = ["17/07/2019", "29/02/2020", "29/02/2019", "7/7/2019", "17-07-2019", None, "17/07/0000"]
+        layout = DateColumnConverter.get_format_layout("%d/%m/%Y", parsed=True)
+
+        # Act
+        fields, converted = DateColumnConverter.get_string_fields(values, layout)
+        res = DateColumnConverter.format_fields(fields, DateColumnConverter.get_format_layout("%Y%m%d %j"))
+
+        # Assert
+        self.assertListEqual(converted.tolist(), [True, True, False, False, False, False, False])
+        self.assertListEqual(res[:2], ["20190717 198", "20200229 060"])
+
+    def test_parse_strings_with_formats(self):
+
+        # Arrange
+        formats = ["%d/%m/%Y", "%m/%d/%Y", "%Y%m%d"]
+        values = ["17/07/2019", "07/17/2019", "01/02/2019", "20190717", "7/17/2019"]
+        layouts = [DateColumnConverter.get_format_layout(format, parsed=True) for format in formats]
+        format_patterns = [re.compile(r"\d{1,2}/\d{1,2}/\d{4}"), re.compile(r"\d{1,2}/\d{1,2}/\d{4}"),
+                           re.compile(r"\d{8}")]
+
+        # Act
+        fields, converted, format_counts = DateColumnConverter.get_string_fields_with_formats(
+            values, layouts, format_patterns
+        )
+
+        # Assert
+        # "07/17/2019" has the shape of the first format, so it is left to strptime, which tries it first.
+        self.assertListEqual(converted.tolist(), [True, False, True, True, False])
+        self.assertListEqual(format_counts, [2, 0, 1])
+        self.assertListEqual(fields["m"][converted].tolist(), [7, 2, 7])
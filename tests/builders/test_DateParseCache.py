@@ -0,0 +1,64 @@
+import unittest
+
+from RecordMapper.builders import DateParseCache
+
+
+class test_DateParseCache(unittest.TestCase):
+
+    def test_least_recently_used_dates_are_removed(self):
+
+        # Arrange
+        parsed_values = []
+
+        def parse(value):
+            parsed_values.append(value)
+            return value.upper()
+
+        date_parse_cache = DateParseCache(2)
+
+        # Act
+        res = [date_parse_cache.get(("f", value), parse, value) for value in ["a", "b", "a", "c", "b", "a"]]
+        res_counts = date_parse_cache.reset_counts()
+
+        # Assert
+        self.assertListEqual(res, ["A", "B", "A", "C", "B", "A"])
+        # "b" is removed by "c", and then "a" by "b".
+        self.assertListEqual(parsed_values, ["a", "b", "c", "b", "a"])
+        self.assertDictEqual(res_counts, {"hits": 1, "misses": 5, "formats": {}})
+        self.assertDictEqual(date_parse_cache.get_counts(), {"hits": 0, "misses": 0, "formats": {}})
+
+    def test_resize_and_disable(self):
+
+        # Arrange
+        date_parse_cache = DateParseCache(3)
+        for value in ["a", "b", "c"]:
+            date_parse_cache.get(value, str.upper, value)
+
+        # Act
+        date_parse_cache.resize(1)
+        res_kept = list(date_parse_cache.entries)
+        date_parse_cache.resize(0)
+        date_parse_cache.get("d", str.upper, "d")
+        date_parse_cache.get("d", str.upper, "d")
+
+        # Assert
+        self.assertListEqual(res_kept, ["c"])
+        self.assertEqual(len(date_parse_cache.entries), 0)
+        self.assertDictEqual(date_parse_cache.get_counts(), {"hits": 0, "misses": 5, "formats": {}})
+        with self.assertRaises(RuntimeError):
+            date_parse_cache.resize(-1)
+
+    def test_add_counts(self):
+
+        # Arrange
+        date_parse_cache = DateParseCache()
+        date_parse_cache.get("a", str.upper, "a")
+        date_parse_cache.count_format("%Y")
+        date_parse_cache.count_format("%Y")
+        counts = {"hits": 1, "misses": 0, "formats": {"%Y": 1, "%d": 3}}
+
+        # Act
+        DateParseCache.add_counts(counts, date_parse_cache.get_counts())
+
+        # Assert
+        self.assertDictEqual(counts, {"hits": 1, "misses": 1, "formats": {"%Y": 3, "%d": 3}})
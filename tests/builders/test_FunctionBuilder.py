@@ -45,6 +45,28 @@ class test_FunctionBuilder(unittest.TestCase):
         # Assert
         self.assertEqual(parsed_function(7, input_record, None, {}), expected_res)
 
+    def test_custom_function_with_batch_implementation(self):
+
+        # Arrange
+        test_function_name = "tests.custom_functions_for_tests.multiply"
+        args_list = ["3"]
+
+        # Act
+        parsed_function = FunctionBuilder.get_custom_function(test_function_name, args_list)
+
+        # Assert
+        self.assertEqual(parsed_function(7, {}, None, {}), 21)
+        self.assertListEqual(parsed_function.batch_function([7, None], None), [21, None])
+
+    def test_invalid_batch_implementation(self):
+
+        # Act
+        with self.assertRaises(InvalidFunctionError) as context:
+            FunctionBuilder.batch_implementation("not a function")
+
+        # Assert
+        self.assertTrue("Invalid batch implementation" in str(context.exception))
+
     def test_parsed_function_str(self):
 
         builtin_function_test = "copyFrom(field_to_copy)"
@@ -69,6 +91,42 @@ class test_FunctionBuilder(unittest.TestCase):
 
 
     
+    def test_parsed_function_str_is_reused(self):
+
+        # Arrange
+        function_str = "tests.custom_functions_for_tests.sum(3)"
+
+        # Act
+        first_function = FunctionBuilder.parse_function_str(function_str)
+        second_function = FunctionBuilder.parse_function_str(function_str)
+
+        # Assert
+        self.assertIn(function_str, FunctionBuilder.function_builders)
+        # Each field gets its own transform function, with the same behaviour.
+        self.assertIsNot(first_function, second_function)
+        self.assertEqual(first_function(2, {}, None, {}), 5)
+        self.assertEqual(second_function(2, {}, None, {}), 5)
+
+    def test_function_builders_are_bounded(self):
+
+        # Arrange
+        max_function_builders = FunctionBuilder.max_function_builders
+        FunctionBuilder.max_function_builders = 2
+        FunctionBuilder.clear_function_builders()
+
+        # Act
+        try:
+            for function_str in ["copyFrom(a)", "copyFrom(b)", "copyFrom(a)", "copyFrom(c)"]:
+                FunctionBuilder.parse_function_str(function_str)
+            FunctionBuilder.build_function_from_parts("copyFrom", ["a"])
+        finally:
+            FunctionBuilder.max_function_builders = max_function_builders
+
+        # Assert
+        # The least recently used string is removed, and the parsed parts are kept in another cache.
+        self.assertListEqual(list(FunctionBuilder.function_builders), ["copyFrom(a)", "copyFrom(c)"])
+        self.assertListEqual(list(FunctionBuilder.function_part_builders), [("copyFrom", "a")])
+
     def test_invalid_function_name(self):
 
         # Arrange/Assert/act
@@ -0,0 +1,129 @@
+import unittest
+
+from RecordMapper.builders import MapperFunctionBuilder, SlotRecordBuilder, FlatRecordBuilder
+from RecordMapper.builders.FlatSchemaBuilder import FieldData
+from RecordMapper.builders.BuiltinFunctions import copyFrom, toNull, get_from_custom_variable
+
+from tests import custom_functions_for_tests
+
+
+class test_MapperFunctionBuilder(unittest.TestCase):
+
+    def test_get_mapper_function(self):
+
+        # Arrange
+        test_schema = {
+            ("field_1", ): FieldData(["string"], ["old_field"], [], None),
+            ("field_2", ): FieldData(["int"], [], [None, copyFrom("field_3")], None),
+            ("field_3", ): FieldData(["int"], [], [custom_functions_for_tests.sum(1), copyFrom("field_2")], None),
+            ("field_4", "nested_field_1"): FieldData(["int"], [], [toNull()], None),
+            ("field_4", "nested_field_2"): FieldData(["int"], [], [get_from_custom_variable("variable")], None),
+            ("collapse_dict", ): FieldData(["string"], [], [
+                None, None, custom_functions_for_tests.collapse_values("field_3", "collapse_dict")
+            ], None)
+        }
+
+        input_record = {
+            ("old_field",): "hola",
+            ("field_2",): 56,
+            ("field_3",): 7,
+            ("field_6",): 8
+        }
+
+        expected_record = {
+            "field_1": "hola",
+            "field_2": 8,
+            "field_3": 56,
+            "field_4": {
+                "nested_field_1": None,
+                "nested_field_2": 9
+            },
+            "collapse_dict": {
+                "field_3": None
+            }
+        }
+
+        # Act
+        mapper_function = MapperFunctionBuilder.get_mapper_function(test_schema, {"variable": 9})
+        res_record = mapper_function(input_record)
+
+        # Assert
+        self.assertDictEqual(res_record, expected_record)
+        self.assertListEqual(list(res_record.keys()), list(expected_record.keys()))
+        self.assertTrue("def mapper(flat_record):" in mapper_function.source)
+
+    def test_get_mapper_function_with_invalid_transform_result(self):
+
+        # Arrange
+        def invalid_function(current_value, record, schema, custom_variables):
+            return 1, 2, 3
+
+        test_schema = {
+            ("field_1", ): FieldData(["int"], [], [invalid_function], None)
+        }
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            MapperFunctionBuilder.get_mapper_function(test_schema, {})({})
+
+        # Assert
+        self.assertTrue("Invalid result in a transform function" in str(context.exception))
+
+    def test_get_mapper_function_with_nested_key_in_a_non_dict_field(self):
+
+        # Arrange
+        test_schema = {
+            ("field_1", ): FieldData(["int"], [], [], None),
+            ("field_1", "nested_field_1"): FieldData(["int"], [], [], None)
+        }
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            MapperFunctionBuilder.get_mapper_function(test_schema, {})({
+                ("field_1",): 5,
+                ("field_1", "nested_field_1"): 6
+            })
+
+        # Assert
+        self.assertTrue("Nested key in a non-dict field" in str(context.exception))
+
+    def test_get_mapper_function_with_slot_index(self):
+
+        # Arrange
+        test_schema = {
+            ("field_1", ): FieldData(["string"], ["old_field"], [], None),
+            ("field_2", ): FieldData(["int"], [], [None, copyFrom("field_3")], None),
+            ("field_3", ): FieldData(["int"], [], [custom_functions_for_tests.sum(1), copyFrom("field_2")], None),
+            ("collapse_dict", ): FieldData(["string"], [], [
+                custom_functions_for_tests.collapse_values("field_3", "collapse_dict")
+            ], None)
+        }
+
+        input_record = {
+            "old_field": "hola",
+            "field_2": 56,
+            "field_3": 7,
+            "field_6": 8
+        }
+
+        slot_index = SlotRecordBuilder.get_slot_index({"base_schema": test_schema}, "base_schema")
+
+        # Act
+        mapper_function = MapperFunctionBuilder.get_mapper_function(test_schema, {}, slot_index=slot_index)
+        slot_mapper_record = mapper_function(SlotRecordBuilder.get_slot_record_from_normal_record(input_record,
+                                                                                                   slot_index))
+        flat_mapper_record = MapperFunctionBuilder.get_mapper_function(test_schema, {})(
+            FlatRecordBuilder.get_flat_record_from_normal_record(input_record)
+        )
+
+        # Assert
+        self.assertDictEqual(slot_mapper_record, flat_mapper_record)
+        self.assertDictEqual(slot_mapper_record, {
+            "field_1": "hola",
+            "field_2": 8,
+            "field_3": 56,
+            "collapse_dict": {
+                "field_3": None
+            }
+        })
+        self.assertTrue("values = slot_record.values" in mapper_function.source)
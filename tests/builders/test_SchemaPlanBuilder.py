@@ -0,0 +1,66 @@
+import unittest
+
+from RecordMapper.builders import SchemaPlanBuilder
+from RecordMapper.builders.FlatSchemaBuilder import FieldData
+from RecordMapper.builders.BuiltinFunctions import copyFrom, toNull
+
+
+class test_SchemaPlanBuilder(unittest.TestCase):
+
+    def test_build_schema_plan(self):
+
+        # Arrange
+        copy_function = copyFrom("field_1")
+        null_function = toNull()
+
+        test_flat_schema = {
+            ("field_1",): FieldData(["int"], ["old_field", "older_field"], [], None),
+            ("field_2",): FieldData(["int"], [], [copy_function, null_function], None),
+            ("field_3",): FieldData(["int"], ["field_x"], [None, copy_function], None)
+        }
+
+        # Act
+        res = SchemaPlanBuilder.build_schema_plan(test_flat_schema)
+
+        # Assert
+        self.assertListEqual(res.keys, [("field_1",), ("field_2",), ("field_3",)])
+        self.assertListEqual(res.aliases, [
+            (("field_1",), ("old_field",)),
+            (("field_1",), ("older_field",)),
+            (("field_3",), ("field_x",))
+        ])
+        self.assertListEqual(res.phases, [
+            [(("field_2",), copy_function)],
+            [(("field_2",), null_function), (("field_3",), copy_function)]
+        ])
+
+    def test_build_schema_plan_without_transforms(self):
+
+        # Arrange
+        test_flat_schema = {
+            ("field_1",): FieldData(["int"], [], [], None)
+        }
+
+        # Act
+        res = SchemaPlanBuilder.build_schema_plan(test_flat_schema)
+
+        # Assert
+        self.assertListEqual(res.phases, [])
+
+    def test_get_schema_plan_is_cached_by_identity(self):
+
+        # Arrange
+        test_flat_schema = {
+            ("field_1",): FieldData(["int"], [], [], None)
+        }
+        equal_flat_schema = {**test_flat_schema}
+
+        # Act
+        res_1 = SchemaPlanBuilder.get_schema_plan(test_flat_schema)
+        res_2 = SchemaPlanBuilder.get_schema_plan(test_flat_schema)
+        res_3 = SchemaPlanBuilder.get_schema_plan(equal_flat_schema)
+
+        # Assert
+        self.assertIs(res_1, res_2)
+        self.assertIsNot(res_1, res_3)
+        self.assertEqual(res_1, res_3)
@@ -0,0 +1,84 @@
+import unittest
+
+from RecordMapper.builders import SlotRecordBuilder, FlatRecordBuilder
+from RecordMapper.builders.FlatSchemaBuilder import FieldData
+from RecordMapper.builders.SlotRecordBuilder import SlotIndex, SlotRecord
+
+
+class test_SlotRecordBuilder(unittest.TestCase):
+
+    def setUp(self):
+
+        self.flat_schemas = {
+            "base_schema": {
+                ("field_1", ): FieldData(["string"], ["another_field"], [], None),
+                ("field_2", ): FieldData(["NestSchema1"], [], [], lambda key, record, custom_variables: None),
+            },
+            "NestSchema1": {
+                ("nested_field_1", ): FieldData(["int"], [], [], None)
+            }
+        }
+
+    def test_get_slot_index(self):
+
+        # Act
+        res = SlotRecordBuilder.get_slot_index(self.flat_schemas, "base_schema")
+
+        # Assert
+        self.assertEqual(res.slots[("field_1",)], 0)
+        self.assertEqual(res.slots[("field_2",)], 1)
+        self.assertEqual(res.nested_slots["field_2"]["nested_field_1"], res.slots[("field_2", "nested_field_1")])
+        self.assertEqual(res.top_slots["another_field"], res.slots[("another_field",)])
+        self.assertEqual(res.size, len(res.slots))
+
+    def test_get_slot_record_from_normal_record(self):
+
+        # Arrange
+        input_record = {
+            "field_1": 5,
+            "field_2": {
+                "nested_field_1": 7,
+                "nested_field_x": 8,
+                "nested_field_y": {"a": 1}
+            },
+            "field_3": None
+        }
+
+        slot_index = SlotRecordBuilder.get_slot_index(self.flat_schemas, "base_schema")
+
+        # Act
+        res = SlotRecordBuilder.get_slot_record_from_normal_record(input_record, slot_index)
+
+        # Assert
+        self.assertDictEqual(dict(res), FlatRecordBuilder.get_flat_record_from_normal_record(input_record))
+        self.assertEqual(res.values[slot_index.slots[("field_1",)]], 5)
+        self.assertDictEqual(res.extra, {
+            ("field_2", "nested_field_x"): 8,
+            ("field_2", "nested_field_y", "a"): 1,
+            ("field_3",): None
+        })
+
+    def test_slot_record_as_a_mapping(self):
+
+        # Arrange
+        slot_record = SlotRecord(SlotIndex([("field_1",), ("field_2",)]))
+
+        # Act
+        slot_record[("field_1",)] = None
+        slot_record[("field_3",)] = 3
+        slot_record.update({("field_2",): 2})
+        del slot_record[("field_1",)]
+
+        # Assert
+        self.assertEqual(len(slot_record), 2)
+        self.assertTrue(("field_2",) in slot_record)
+        self.assertFalse(("field_1",) in slot_record)
+        self.assertEqual(slot_record.get(("field_1",)), None)
+        self.assertEqual(slot_record[("field_3",)], 3)
+        self.assertDictEqual({**slot_record}, {("field_2",): 2, ("field_3",): 3})
+
+        with self.assertRaises(KeyError):
+            slot_record[("field_1",)]
+
+        with self.assertRaises(KeyError):
+            del slot_record[("field_4",)]
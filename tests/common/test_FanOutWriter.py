@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from RecordMapper.common import FanOutWriter
+from RecordMapper.csv import CSVWriter
+
+
+class test_FanOutWriter(unittest.TestCase):
+
+    def test_write_records(self):
+
+        # Arrange
+        test_records = [
+            {"field_1": "campo 11", "field_2": 10},
+            {"field_2": 11},
+            {"field_1": "campo 13", "field_2": 12}
+        ]
+
+        def projection(record):
+            return {"field_2": record["field_2"] * 2}
+
+        temp_file_1 = tempfile.NamedTemporaryFile("w", delete=False)
+        temp_file_2 = tempfile.NamedTemporaryFile("w", delete=False)
+
+        fan_out_writer = FanOutWriter(buffer_size=2)
+        fan_out_writer.add_sink("csv_1", CSVWriter(temp_file_1.name, ["field_1", "field_2"]))
+        fan_out_writer.add_sink("csv_2", CSVWriter(temp_file_2.name, ["field_2"]), projection=projection)
+
+        # Act
+        fan_out_writer.write_records(iter(test_records))
+
+        # Assert
+        with open(temp_file_1.name) as csv_file_1, open(temp_file_2.name) as csv_file_2:
+            self.assertEqual(csv_file_1.read(), "field_1,field_2\ncampo 11,10\n,11\ncampo 13,12\n")
+            self.assertEqual(csv_file_2.read(), "field_2\n20\n22\n24\n")
+
+        self.assertDictEqual(fan_out_writer.get_write_counts(), {"csv_1": 3, "csv_2": 3})
+
+        os.remove(temp_file_1.name)
+        os.remove(temp_file_2.name)
+
+    def test_remove_outputs_on_error(self):
+
+        # Arrange
+        test_records = [{"field_1": index} for index in range(5)]
+
+        def projection(record):
+            if record["field_1"] == 3:
+                raise RuntimeError("Invalid record")
+            return record
+
+        temp_file_1 = tempfile.NamedTemporaryFile("w", delete=False)
+        temp_file_2 = tempfile.NamedTemporaryFile("w", delete=False)
+
+        fan_out_writer = FanOutWriter(buffer_size=2)
+        fan_out_writer.add_sink("csv_1", CSVWriter(temp_file_1.name, ["field_1"]))
+        fan_out_writer.add_sink("csv_2", CSVWriter(temp_file_2.name, ["field_1"]), projection=projection,
+                                remove_on_error=True)
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            fan_out_writer.write_records(iter(test_records))
+
+        # Assert
+        with open(temp_file_1.name) as csv_file_1:
+            self.assertEqual(csv_file_1.read(), "field_1\n0\n1\n2\n3\n")
+        self.assertFalse(os.path.exists(temp_file_2.name))
+
+        os.remove(temp_file_1.name)
+
+    def test_duplicated_sink(self):
+
+        # Arrange
+        fan_out_writer = FanOutWriter()
+        fan_out_writer.add_sink("csv", CSVWriter("unused.csv", ["field_1"]))
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            fan_out_writer.add_sink("csv", CSVWriter("unused.csv", ["field_1"]))
+
+        # Assert
+        self.assertTrue("Duplicated sink" in str(context.exception))
@@ -0,0 +1,49 @@
+import io
+import unittest
+
+from RecordMapper.common import MemoryViewReader
+
+
+class test_MemoryViewReader(unittest.TestCase):
+
+    def test_read_buffers_as_a_stream(self):
+
+        # Arrange
+        data = b"0123456789abcdefghij"
+        buffer = memoryview(data)
+
+        # Act
+        reader = MemoryViewReader([buffer[:3], buffer[3:3], buffer[10:]])
+        res_chunks = [reader.read(2), reader.read(4), reader.read(1)]
+        res_rest = reader.read()
+        res_end = reader.read(1)
+        reader.close()
+
+        buffered_reader = io.BufferedReader(MemoryViewReader([buffer[:5], buffer[5:]]), buffer_size=3)
+        res_buffered = buffered_reader.read()
+
+        # Assert
+        self.assertListEqual(res_chunks, [b"01", b"2abc", b"d"])
+        self.assertEqual(res_rest, b"efghij")
+        self.assertEqual(res_end, b"")
+        self.assertEqual(res_buffered, data)
+
+    def test_readinto_buffers(self):
+
+        # Arrange
+        data = b"0123456789abcdefghij"
+        buffer = memoryview(data)
+        reader = MemoryViewReader([buffer[:3], buffer[3:3], buffer[10:]])
+        output = bytearray(8)
+
+        # Act
+        res_count = reader.readinto(output)
+        res_end_count = reader.readinto(bytearray(8))
+        res_last_count = reader.readinto(bytearray(8))
+        reader.close()
+
+        # Assert
+        self.assertEqual(res_count, 8)
+        self.assertEqual(bytes(output), b"012abcde")
+        self.assertEqual(res_end_count, 5)
+        self.assertEqual(res_last_count, 0)
@@ -1,11 +1,14 @@
 import unittest
 import tempfile
 import os
+import csv
 
 import fastavro
 
 from RecordMapper.csv import CSVWriter
 from RecordMapper.csv import CSVReader
+from RecordMapper.csv import CSVSplitter
+from RecordMapper.csv.CSVSplitter import CSVRangeError
 
 class test_AvroWriter(unittest.TestCase):
 
@@ -34,3 +37,122 @@ class test_AvroWriter(unittest.TestCase):
 
         # Assert
         self.assertListEqual(test_records, test_records) # Without changes
+
+
+class test_CSVReader(unittest.TestCase):
+
+    def read_with_dict_reader(self, file_path):
+
+        with open(file_path) as input_stream:
+            return [
+                dict([(key, value if value != '' else None) for key, value in record.items()])
+                for record in csv.DictReader(input_stream)
+            ]
+
+    def test_same_records_as_dict_reader(self):
+
+        # Arrange
+        test_csv_texts = [
+            "field_1,field_2\n1,2\n3,\n,\n",
+            "field_1,field_2\n1,2,3,\n4\n\n5,6\n",
+            "field_1,field_1,field_2\n1,2,3\n4,,6\n7,8\n9\n",
+            'field_1,field_2\n"multi\nline","with ""quotes"""\n\n\n"",x\n',
+            "field_1\n",
+            "",
+            "\nfield_1,field_2\n1,2\n\n"
+        ]
+
+        for test_csv_text in test_csv_texts:
+            temp_file = tempfile.NamedTemporaryFile("w", delete=False)
+            temp_file.write(test_csv_text)
+            temp_file.close()
+
+            expected_records = self.read_with_dict_reader(temp_file.name)
+
+            # Act
+            reader = CSVReader(temp_file.name)
+            res_records = list(reader.read_records())
+            reader.close()
+
+            os.remove(temp_file.name)
+
+            # Assert
+            self.assertListEqual(res_records, expected_records)
+            self.assertListEqual([list(record.keys()) for record in res_records],
+                                 [list(record.keys()) for record in expected_records])
+
+
+class test_CSVSplitter(unittest.TestCase):
+
+    def test_same_records_as_csv_reader(self):
+
+        # Arrange
+        test_csv_texts = [
+            "field_1,field_2\n1,2\n3,\n,\n",
+            "field_1,field_2\n1,2,3,\n4\n\n5,6\n",
+            'field_1,field_2\n"multi\nline","with ""quotes"""\n\n\n"",x\n"a\n\nb",""""\n',
+            'field_1,field_2\r\n"1\r\n2",3\r\n4,"5\n"\r\n6,7',
+            "field_1\n",
+            "",
+            "\nfield_1,field_2\n1,2\n\n"
+        ]
+
+        for test_csv_text in test_csv_texts:
+            temp_file = tempfile.NamedTemporaryFile("w", newline="", delete=False)
+            temp_file.write(test_csv_text)
+            temp_file.close()
+
+            reader = CSVReader(temp_file.name)
+            expected_records = list(reader.read_records())
+            reader.close()
+
+            for range_size in range(1, len(test_csv_text) + 2):
+
+                # Act
+                splitter = CSVSplitter(temp_file.name)
+                fieldnames, _ = splitter.get_fieldnames()
+                byte_ranges = list(splitter.get_byte_ranges(range_size))
+                res_records = [
+                    record
+                    for start, end in byte_ranges
+                    for record in CSVSplitter.read_records_in_range(temp_file.name, start, end, fieldnames)
+                ]
+
+                # Assert
+                self.assertListEqual(res_records, expected_records)
+                for (_, end), (start, _) in zip(byte_ranges, byte_ranges[1:]):
+                    self.assertEqual(end, start)
+
+            os.remove(temp_file.name)
+
+    def test_invalid_range_size(self):
+
+        # Arrange
+        splitter = CSVSplitter("unused.csv")
+
+        # Act & Assert
+        with self.assertRaises(RuntimeError):
+            next(splitter.get_byte_ranges(0))
+
+    def test_range_that_ends_inside_a_quoted_field(self):
+
+        # Arrange
+        # The quote of the unquoted field 5" makes the splitter cut the next record inside its quoted field.
+        test_csv_text = 'field_1,field_2\n5",plain\n1,"multi\nline"\n'
+        temp_file = tempfile.NamedTemporaryFile("w", newline="", delete=False)
+        temp_file.write(test_csv_text)
+        temp_file.close()
+
+        splitter = CSVSplitter(temp_file.name)
+        fieldnames, _ = splitter.get_fieldnames()
+        start, end = next(splitter.get_byte_ranges(len("5\",plain\n1,")))
+
+        # Act
+        with self.assertRaises(CSVRangeError) as context:
+            list(CSVSplitter.read_records_in_range(temp_file.name, start, end, fieldnames))
+
+        os.remove(temp_file.name)
+
+        # Assert
+        self.assertEqual(end, test_csv_text.index("line"))
+        self.assertEqual(context.exception.start, start)
@@ -1,3 +1,5 @@
+from RecordMapper.builders import FunctionBuilder
+
 
 def sum(number_str: str):
 
@@ -30,3 +32,28 @@ def selectSchema(schema_str: str):
 
     return selectFunction
 
+
+def selectSchemaFromField(field_name: str):
+
+    def selectFunction(key, record, custom_variables):
+        return record.get((field_name,))
+
+    return selectFunction
+
+
+def multiply(number_str: str):
+    """Multiply the current value, with a batch implementation that counts its calls."""
+
+    factor = int(number_str)
+
+    def batch_function(column, batch_context):
+        batch_function.calls += 1
+        return [value * factor if value is not None else None for value in column]
+
+    batch_function.calls = 0
+
+    @FunctionBuilder.batch_implementation(batch_function)
+    def transform_function(current_value: object, record: dict, complete_transform_schema: dict, custom_variables: dict):
+        return current_value * factor if current_value is not None else None
+
+    return transform_function
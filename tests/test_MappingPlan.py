@@ -0,0 +1,100 @@
+import unittest
+
+from RecordMapper.MappingPlan import MappingPlan
+from RecordMapper.builders import FlatSchemaBuilder
+
+
+class test_MappingPlan(unittest.TestCase):
+
+    def setUp(self):
+
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": ["string", "null"], "aliases": ["another_field"]},
+                {"name": "field_2", "type": ["int", "null"], "transform": "toInt"},
+                {"name": "field_3", "type": ["TestNestedSchema", "null"],
+                 "nestedSchemaSelector": "tests.custom_functions_for_tests.selectSchema(TestNestedSchema)"}
+            ]
+        }
+
+        test_nested_schema = {
+            "type": "record",
+            "name": "TestNestedSchema",
+            "fields": [
+                {"name": "nested_field_1", "type": ["string", "null"], "transform": "copyFrom(field_1)"}
+            ]
+        }
+
+        self.flat_schemas = {
+            schema["name"]: FlatSchemaBuilder.get_flat_schema(schema)
+            for schema in [test_schema, test_nested_schema]
+        }
+
+    def test_transform_records(self):
+
+        # Arrange
+        input_records = [
+            {"another_field": "hola", "field_2": "5", "field_4": "unused"},
+            {"field_1": "adios"}
+        ]
+
+        expected_records = [
+            {"field_1": "hola", "field_2": 5, "field_3": {"nested_field_1": "hola"}},
+            {"field_1": "adios", "field_2": None, "field_3": {"nested_field_1": "adios"}}
+        ]
+
+        # Act
+        mapping_plan = MappingPlan(self.flat_schemas, "TestSchema", {})
+        res_records = list(mapping_plan.transform_records(input_records))
+
+        # Assert
+        self.assertListEqual(res_records, expected_records)
+
+    def test_selector_applier_is_skipped_without_selectors(self):
+
+        # Arrange
+        flat_schemas = {"TestNestedSchema": self.flat_schemas["TestNestedSchema"]}
+
+        # Act
+        with_selectors = MappingPlan(self.flat_schemas, "TestSchema", {})
+        without_selectors = MappingPlan(flat_schemas, "TestNestedSchema", {})
+
+        # Assert
+        self.assertEqual(len(with_selectors.applier_functions), 4)
+        self.assertEqual(len(without_selectors.applier_functions), 3)
+
+    def test_is_identity(self):
+
+        # Arrange
+        identity_schema = {
+            "type": "record",
+            "name": "IdentitySchema",
+            "fields": [
+                {"name": "field_1", "type": ["string", "null"]},
+                {"name": "field_2", "type": "long"},
+                {"name": "field_3", "type": {"type": "array", "items": "int"}}
+            ]
+        }
+
+        map_schema = {
+            "type": "record",
+            "name": "MapSchema",
+            "fields": [
+                {"name": "field_1", "type": {"type": "map", "values": "string"}}
+            ]
+        }
+
+        # Act
+        identity_plan = MappingPlan({"IdentitySchema": FlatSchemaBuilder.get_flat_schema(identity_schema)},
+                                    "IdentitySchema", {})
+        map_plan = MappingPlan({"MapSchema": FlatSchemaBuilder.get_flat_schema(map_schema)}, "MapSchema", {})
+        nested_plan = MappingPlan({"TestNestedSchema": self.flat_schemas["TestNestedSchema"]}, "TestNestedSchema", {})
+        selectors_plan = MappingPlan(self.flat_schemas, "TestSchema", {})
+
+        # Assert
+        self.assertTrue(identity_plan.is_identity)
+        self.assertFalse(map_plan.is_identity)
+        self.assertFalse(nested_plan.is_identity)
+        self.assertFalse(selectors_plan.is_identity)
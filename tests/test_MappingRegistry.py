@@ -0,0 +1,164 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+
+from RecordMapper import RecordMapper
+from RecordMapper.MappingRegistry import MappingRegistry
+from RecordMapper.ParallelTransformer import ParallelTransformer
+
+
+class test_MappingRegistry(unittest.TestCase):
+
+    def setUp(self):
+
+        self.test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": ["string", "null"], "aliases": ["another_field"]},
+                {"name": "field_2", "type": ["int", "null"],
+                 "transform": ["toInt", "tests.custom_functions_for_tests.sum(2)"]},
+                {"name": "field_3", "type": ["TestNestedSchema", "null"],
+                 "nestedSchemaSelector": "tests.custom_functions_for_tests.selectSchema(TestNestedSchema)"}
+            ]
+        }
+
+        self.test_nested_schema = {
+            "type": "record",
+            "name": "TestNestedSchema",
+            "fields": [
+                {"name": "nested_field_1", "type": ["string", "null"], "transform": "copyFrom(field_1)"}
+            ]
+        }
+
+        self.input_record = {"another_field": "hola", "field_2": "5"}
+        self.expected_record = {"field_1": "hola", "field_2": 7, "field_3": {"nested_field_1": "hola"}}
+
+    def test_flat_schemas_are_reused(self):
+
+        # Arrange
+        mapping_registry = MappingRegistry()
+
+        # Act
+        first_record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema],
+                                           mapping_registry=mapping_registry)
+        second_record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema], {"variable": 1},
+                                            mapping_registry=mapping_registry)
+
+        # Assert
+        self.assertIs(first_record_mapper.flat_schemas["TestSchema"], second_record_mapper.flat_schemas["TestSchema"])
+        self.assertIsNot(first_record_mapper.mapping_plan, second_record_mapper.mapping_plan)
+        self.assertDictEqual(second_record_mapper.transform_record(self.input_record), self.expected_record)
+        self.assertDictEqual(mapping_registry.get_counts(), {"hits": 1, "loads": 0, "builds": 1, "plan_hits": 0})
+
+    def test_mapping_plans_are_reused(self):
+
+        # Arrange
+        mapping_registry = MappingRegistry()
+        custom_variables = {"variable": 1}
+
+        # Act
+        first_record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema], custom_variables, "codegen",
+                                           mapping_registry=mapping_registry)
+        first_record_mapper.transform_record(self.input_record)
+        second_record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema], {"variable": 1}, "codegen",
+                                            mapping_registry=mapping_registry)
+        # The plan keeps a copy of the custom variables.
+        custom_variables["variable"] = 2
+        other_engine_record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema], {"variable": 1},
+                                                  mapping_registry=mapping_registry)
+        other_variables_record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema], {"variable": 1.5},
+                                                     "codegen", mapping_registry=mapping_registry)
+
+        # Assert
+        self.assertIs(first_record_mapper.mapping_plan, second_record_mapper.mapping_plan)
+        self.assertEqual(len(second_record_mapper.mapping_plan.mapper_functions), 1)
+        self.assertDictEqual(second_record_mapper.mapping_plan.custom_variables, {"variable": 1})
+        self.assertIsNot(first_record_mapper.mapping_plan, other_engine_record_mapper.mapping_plan)
+        self.assertIsNot(first_record_mapper.mapping_plan, other_variables_record_mapper.mapping_plan)
+        self.assertDictEqual(second_record_mapper.transform_record(self.input_record), self.expected_record)
+        self.assertDictEqual(mapping_registry.get_counts(), {"hits": 2, "loads": 0, "builds": 1, "plan_hits": 1})
+
+    def test_flat_schemas_are_loaded_from_their_description(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            # Arrange
+            fingerprint = MappingRegistry.get_fingerprint(self.test_schema, [self.test_nested_schema])
+            RecordMapper(self.test_schema, [self.test_nested_schema], mapping_registry=MappingRegistry(directory))
+            mapping_registry = MappingRegistry(directory)
+
+            # Act
+            record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema],
+                                         mapping_registry=mapping_registry)
+
+            # Assert
+            self.assertListEqual(os.listdir(directory), [f"{fingerprint}.json"])
+            self.assertDictEqual(mapping_registry.get_counts(), {"hits": 0, "loads": 1, "builds": 0, "plan_hits": 0})
+            self.assertDictEqual(record_mapper.transform_record(self.input_record), self.expected_record)
+
+    def test_invalid_description_is_rebuilt(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            # Arrange
+            fingerprint = MappingRegistry.get_fingerprint(self.test_schema, [self.test_nested_schema])
+            description_path = os.path.join(directory, f"{fingerprint}.json")
+            mapping_registry = MappingRegistry(directory)
+
+            # A well-formed description with a malformed schema.
+            with open(description_path, "w") as description_file:
+                json.dump({"description_version": MappingRegistry.description_version,
+                           "schemas": {"TestSchema": ["field_1"]}}, description_file)
+
+            # Act
+            record_mapper = RecordMapper(self.test_schema, [self.test_nested_schema],
+                                         mapping_registry=mapping_registry)
+
+            with open(description_path, "r") as description_file:
+                res_description = json.load(description_file)
+
+            # Assert
+            self.assertDictEqual(mapping_registry.get_counts(), {"hits": 0, "loads": 0, "builds": 1, "plan_hits": 0})
+            self.assertDictEqual(record_mapper.transform_record(self.input_record), self.expected_record)
+            self.assertListEqual(sorted(res_description["schemas"]), ["TestNestedSchema", "TestSchema"])
+
+    def test_workers_use_the_registry(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            # Arrange
+            mapping_registry = MappingRegistry(directory)
+            RecordMapper(self.test_schema, [self.test_nested_schema], mapping_registry=mapping_registry)
+
+            # Act
+            # The registry is sent to the workers without its mappings, which are read from the directory.
+            res_pickled_registry = pickle.loads(pickle.dumps(mapping_registry))
+            parallel_transformer = ParallelTransformer(self.test_schema, [self.test_nested_schema], {}, "chain",
+                                                       workers=2, chunk_size=2, mapping_registry=mapping_registry)
+            res_records = list(parallel_transformer.transform_records(iter([self.input_record] * 5)))
+
+            # Assert
+            self.assertEqual(len(res_pickled_registry.entries), 0)
+            self.assertEqual(res_pickled_registry.directory, directory)
+            self.assertListEqual(res_records, [self.expected_record] * 5)
+
+    def test_get_fingerprint(self):
+
+        # Arrange
+        reordered_schema = {key: self.test_schema[key] for key in reversed(self.test_schema)}
+        other_nested_schema = {**self.test_nested_schema, "fields": []}
+
+        # Act
+        res_fingerprint = MappingRegistry.get_fingerprint(self.test_schema, [self.test_nested_schema])
+        res_reordered_fingerprint = MappingRegistry.get_fingerprint(reordered_schema, [self.test_nested_schema])
+        res_other_fingerprint = MappingRegistry.get_fingerprint(self.test_schema, [other_nested_schema])
+
+        # Assert
+        self.assertEqual(len(res_fingerprint), 64)
+        self.assertEqual(res_fingerprint, res_reordered_fingerprint)
+        self.assertNotEqual(res_fingerprint, res_other_fingerprint)
+        # The version of the module of the custom functions is part of the fingerprint.
+        self.assertIn("tests.custom_functions_for_tests", MappingRegistry.module_versions)
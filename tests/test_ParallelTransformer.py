@@ -0,0 +1,61 @@
+import unittest
+
+from RecordMapper import RecordMapper
+from RecordMapper.ParallelTransformer import ParallelTransformer
+
+
+class test_ParallelTransformer(unittest.TestCase):
+
+    test_schema = {
+        "type": "record",
+        "name": "TestSchema",
+        "fields": [
+            {"name": "field_1", "type": ["string", "null"], "aliases": ["another_field"]},
+            {"name": "field_2", "type": ["int", "null"], "transform": ["copyFrom(field_3)", "toInt"]},
+            {"name": "field_3", "type": ["string", "null"]}
+        ]
+    }
+
+    def test_transform_records(self):
+
+        # Arrange
+        input_records = [
+            {"another_field": f"value_{index}", "field_3": str(index)}
+            for index in range(250)
+        ]
+
+        expected_records = list(RecordMapper(self.test_schema).transform_records(input_records))
+
+        # Act
+        parallel_transformer = ParallelTransformer(self.test_schema, [], {}, "chain", workers=2, chunk_size=7)
+        res_records = list(parallel_transformer.transform_records(iter(input_records)))
+
+        # Assert
+        self.assertListEqual(res_records, expected_records)
+
+    def test_transform_records_unordered(self):
+
+        # Arrange
+        input_records = [
+            {"another_field": f"value_{index}", "field_3": str(index)}
+            for index in range(250)
+        ]
+
+        expected_records = list(RecordMapper(self.test_schema).transform_records(input_records))
+
+        # Act
+        parallel_transformer = ParallelTransformer(self.test_schema, [], {}, "chain", workers=2, chunk_size=7,
+                                                   ordered=False)
+        res_records = list(parallel_transformer.transform_records(iter(input_records)))
+
+        # Assert
+        self.assertCountEqual(res_records, expected_records)
+
+    def test_invalid_workers(self):
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            ParallelTransformer(self.test_schema, [], {}, "chain", workers=0)
+
+        # Assert
+        self.assertTrue("Invalid number of workers" in str(context.exception))
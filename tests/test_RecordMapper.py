@@ -1,11 +1,22 @@
 import os
+import subprocess
+import sys
 import tempfile
 import unittest
 
+import fastavro
+
 from RecordMapper import RecordMapper
 from RecordMapper.avro.AvroReader import AvroReader
+from RecordMapper.avro.AvroWriter import AvroMatchingException, AvroWriter
+from RecordMapper.csv.CSVWriter import CSVWriter
 from RecordMapper.csv.CSVReader import CSVReader
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class test_RecordMapper(unittest.TestCase):
 
@@ -273,6 +284,454 @@ class test_RecordMapper(unittest.TestCase):
         os.remove(avro_temp_file.name)
         os.remove(csv_temp_file.name)
 
+    def test_write_csv_as_read_from_avro(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": ["string", "null"]},
+                {"name": "field_2", "type": ["float", "null"]},
+                {"name": "field_3", "type": "double"},
+                {"name": "field_4", "type": ["null", "TestNestedSchema", "TestNestedSchema2"]},
+                {"name": "field_5", "type": "int", "default": 3},
+                {"name": "field_6", "type": {"type": "array", "items": "float"}, "default": []}
+            ]
+        }
+
+        test_nested_schema = {
+            "type": "record",
+            "name": "TestNestedSchema",
+            "fields": [
+                {"name": "nested_field_1", "type": ["string", "null"]},
+                {"name": "nested_field_2", "type": ["float", "null"]}
+            ]
+        }
+
+        test_nested_schema_2 = {
+            "type": "record",
+            "name": "TestNestedSchema2",
+            "fields": [
+                {"name": "nested_field_3", "type": ["int", "null"]}
+            ]
+        }
+
+        input_records = [
+            {"field_1": "example_1", "field_2": 0.1, "field_3": 5, "field_4": {"nested_field_3": 7},
+             "field_6": [0.3, 1]},
+            {"field_3": 0.1, "field_4": {"nested_field_2": 2.2, "nested_field_1": "a"}, "field_7": "ignored",
+             "field_5": 1},
+            {"field_2": 3, "field_3": -1.5, "field_4": None}
+        ]
+
+        output_opts = {
+            "flat_nested_schema_on_csv": {}
+        }
+
+        avro_temp_file = tempfile.NamedTemporaryFile(delete=False)
+        expected_csv_file = tempfile.NamedTemporaryFile(delete=False)
+        csv_temp_file = tempfile.NamedTemporaryFile(delete=False)
+
+        nested_schemas = [test_nested_schema, test_nested_schema_2]
+        fieldnames = [field["name"] for field in test_schema["fields"]]
+
+        # The csv file written from the Avro file.
+        avro_writer = AvroWriter(avro_temp_file.name, test_schema, nested_schemas, output_opts)
+        avro_writer.write_records([{**record} for record in input_records], output_opts)
+        avro_writer.close()
+
+        avro_reader = AvroReader(avro_temp_file.name)
+        csv_writer = CSVWriter(expected_csv_file.name, fieldnames)
+        csv_writer.write_records(avro_reader.read_records(), output_opts)
+        csv_writer.close()
+        avro_reader.close()
+
+        # Act
+        record_mapper = RecordMapper(test_schema, nested_schemas)
+        record_mapper.write_records(input_records, {"avro": avro_temp_file.name, "csv": csv_temp_file.name},
+                                    output_opts={**output_opts, "write_buffer_size": 2})
+
+        # Assert
+        with open(expected_csv_file.name, "rb") as expected_csv, open(csv_temp_file.name, "rb") as res_csv:
+            self.assertEqual(res_csv.read(), expected_csv.read())
+
+        self.assertDictEqual(record_mapper.stats["write_count"], {"avro": 3, "csv": 3})
+
+        os.remove(avro_temp_file.name)
+        os.remove(expected_csv_file.name)
+        os.remove(csv_temp_file.name)
+
+    def test_execute_with_workers(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_2", "aliases": ["field_auxiliar"], "type": ["int", "null"], "transform": "toInt"},
+                {"name": "field_3", "type": ["string", "null"]},
+                {"name": "field_4", "type": "int", "transform": ["copyFrom(field_2)", "toInt"]}
+            ]
+        }
+
+        input_csv_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        input_csv_file.write("field_auxiliar,field_3\n")
+        for index in range(100):
+            input_csv_file.write(f"{index},example_{index}\n")
+        input_csv_file.close()
+
+        serial_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        parallel_avro_file = tempfile.NamedTemporaryFile(delete=False)
+
+        serial_record_mapper = RecordMapper(test_schema)
+        serial_record_mapper.execute("csv", input_csv_file.name, {"avro": serial_avro_file.name})
+
+        # Act
+        parallel_record_mapper = RecordMapper(test_schema)
+        parallel_record_mapper.execute("csv", input_csv_file.name, {"avro": parallel_avro_file.name},
+                                       workers=2, chunk_size=9)
+
+        # Assert
+        serial_reader = AvroReader(serial_avro_file.name)
+        parallel_reader = AvroReader(parallel_avro_file.name)
+        self.assertListEqual(list(parallel_reader.read_records()), list(serial_reader.read_records()))
+        serial_reader.close()
+        parallel_reader.close()
+
+        self.assertDictEqual(parallel_record_mapper.stats, serial_record_mapper.stats)
+
+        os.remove(input_csv_file.name)
+        os.remove(serial_avro_file.name)
+        os.remove(parallel_avro_file.name)
+
+    def test_execute_with_workers_and_split_input(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_2", "aliases": ["field_auxiliar"], "type": ["int", "null"], "transform": "toInt"},
+                {"name": "field_3", "type": ["string", "null"]}
+            ]
+        }
+
+        input_csv_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        input_csv_file.write("field_auxiliar,field_3\n")
+        for index in range(100):
+            input_csv_file.write(f'{index},"example\n""{index}"""\n')
+        input_csv_file.close()
+
+        serial_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        parallel_avro_file = tempfile.NamedTemporaryFile(delete=False)
+
+        serial_record_mapper = RecordMapper(test_schema)
+        serial_record_mapper.execute("csv", input_csv_file.name, {"avro": serial_avro_file.name})
+
+        # Act
+        parallel_record_mapper = RecordMapper(test_schema)
+        parallel_record_mapper.execute("csv", input_csv_file.name, {"avro": parallel_avro_file.name},
+                                       input_opts={"split_input": True, "split_size": 50}, workers=2)
+
+        # Assert
+        serial_reader = AvroReader(serial_avro_file.name)
+        parallel_reader = AvroReader(parallel_avro_file.name)
+        self.assertListEqual(list(parallel_reader.read_records()), list(serial_reader.read_records()))
+        serial_reader.close()
+        parallel_reader.close()
+
+        self.assertDictEqual(parallel_record_mapper.stats, serial_record_mapper.stats)
+
+        os.remove(input_csv_file.name)
+        os.remove(serial_avro_file.name)
+        os.remove(parallel_avro_file.name)
+
+    def test_execute_with_workers_and_split_input_and_quotes_in_unquoted_fields(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "id", "type": ["string", "null"]},
+                {"name": "size", "type": ["string", "null"]},
+                {"name": "text", "type": ["string", "null"]}
+            ]
+        }
+
+        # The first ranges are split right, until the quote of the unquoted field "5\"" ends a range inside a
+        # quoted field, and the rest of the file is read serially.
+        input_csv_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        input_csv_file.write("id,size,text\n")
+        for index in range(3000):
+            input_csv_file.write(f'{index},5",plain\n' if index % 1000 == 500 else f'{index},1,"multi\nline text"\n')
+        input_csv_file.close()
+
+        serial_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        parallel_avro_file = tempfile.NamedTemporaryFile(delete=False)
+
+        serial_record_mapper = RecordMapper(test_schema)
+        serial_record_mapper.execute("csv", input_csv_file.name, {"avro": serial_avro_file.name})
+
+        # Act
+        parallel_record_mapper = RecordMapper(test_schema)
+        parallel_record_mapper.execute("csv", input_csv_file.name, {"avro": parallel_avro_file.name},
+                                       input_opts={"split_size": 4096, "split_input": True}, workers=2)
+
+        # Assert
+        serial_reader = AvroReader(serial_avro_file.name)
+        parallel_reader = AvroReader(parallel_avro_file.name)
+        self.assertListEqual(list(parallel_reader.read_records()), list(serial_reader.read_records()))
+        serial_reader.close()
+        parallel_reader.close()
+
+        self.assertEqual(parallel_record_mapper.stats["read_count"], 3000)
+
+        os.remove(input_csv_file.name)
+        os.remove(serial_avro_file.name)
+        os.remove(parallel_avro_file.name)
+
+    def test_execute_with_workers_and_quotes_in_unquoted_fields(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "id", "type": ["string", "null"]},
+                {"name": "size", "type": ["string", "null"]},
+                {"name": "text", "type": ["string", "null"]}
+            ]
+        }
+
+        # The quote of the unquoted field "5\"" breaks the split by quote parity, but not the csv reader.
+        input_csv_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        input_csv_file.write("id,size,text\n")
+        for index in range(3000):
+            input_csv_file.write(f'{index},5",plain\n' if index % 100 == 0 else f'{index},1,"multi\nline text"\n')
+        input_csv_file.close()
+
+        serial_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        parallel_avro_file = tempfile.NamedTemporaryFile(delete=False)
+
+        serial_record_mapper = RecordMapper(test_schema)
+        serial_record_mapper.execute("csv", input_csv_file.name, {"avro": serial_avro_file.name})
+
+        # Act
+        parallel_record_mapper = RecordMapper(test_schema)
+        parallel_record_mapper.execute("csv", input_csv_file.name, {"avro": parallel_avro_file.name},
+                                       input_opts={"split_size": 4096}, workers=2)
+
+        # Assert
+        serial_reader = AvroReader(serial_avro_file.name)
+        parallel_reader = AvroReader(parallel_avro_file.name)
+        self.assertListEqual(list(parallel_reader.read_records()), list(serial_reader.read_records()))
+        serial_reader.close()
+        parallel_reader.close()
+
+        self.assertEqual(parallel_record_mapper.stats["read_count"], 3000)
+
+        os.remove(input_csv_file.name)
+        os.remove(serial_avro_file.name)
+        os.remove(parallel_avro_file.name)
+
+    def test_execute_from_avro_with_workers(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_2", "aliases": ["field_auxiliar"], "type": ["int", "null"], "transform": "toInt"},
+                {"name": "field_3", "type": ["string", "null"]}
+            ]
+        }
+
+        input_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        input_schema = {
+            "type": "record",
+            "name": "InputSchema",
+            "fields": [
+                {"name": "field_auxiliar", "type": "string"},
+                {"name": "field_3", "type": "string"}
+            ]
+        }
+        input_records = [{"field_auxiliar": str(index), "field_3": f"example_{index}"} for index in range(100)]
+        fastavro.writer(input_avro_file, fastavro.parse_schema(input_schema), input_records, sync_interval=100)
+        input_avro_file.close()
+
+        serial_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        parallel_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        unordered_avro_file = tempfile.NamedTemporaryFile(delete=False)
+
+        serial_record_mapper = RecordMapper(test_schema)
+        serial_record_mapper.execute("avro", input_avro_file.name, {"avro": serial_avro_file.name})
+
+        # Act
+        parallel_record_mapper = RecordMapper(test_schema)
+        parallel_record_mapper.execute("avro", input_avro_file.name, {"avro": parallel_avro_file.name},
+                                       input_opts={"split_size": 200}, workers=2)
+
+        unordered_record_mapper = RecordMapper(test_schema)
+        unordered_record_mapper.execute("avro", input_avro_file.name, {"avro": unordered_avro_file.name},
+                                        input_opts={"split_size": 200}, workers=2, ordered=False)
+
+        # Assert
+        serial_reader = AvroReader(serial_avro_file.name)
+        serial_records = list(serial_reader.read_records())
+        serial_reader.close()
+
+        parallel_reader = AvroReader(parallel_avro_file.name)
+        self.assertListEqual(list(parallel_reader.read_records()), serial_records)
+        parallel_reader.close()
+
+        unordered_reader = AvroReader(unordered_avro_file.name)
+        self.assertCountEqual(list(unordered_reader.read_records()), serial_records)
+        unordered_reader.close()
+
+        self.assertDictEqual(parallel_record_mapper.stats, serial_record_mapper.stats)
+        self.assertDictEqual(unordered_record_mapper.stats, serial_record_mapper.stats)
+
+        for file_name in (input_avro_file.name, serial_avro_file.name, parallel_avro_file.name,
+                          unordered_avro_file.name):
+            os.remove(file_name)
+
+    def test_execute_avro_identity_mapping(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": ["null", "string"]},
+                {"name": "field_2", "type": "long"},
+                {"name": "field_3", "type": "double"}
+            ]
+        }
+
+        input_schema = {
+            "type": "record",
+            "name": "InputSchema",
+            "fields": [
+                {"name": "field_1", "type": ["null", "string"], "default": None},
+                {"name": "field_2", "type": "long"},
+                {"name": "field_3", "type": "double"}
+            ]
+        }
+
+        input_avro_file = tempfile.NamedTemporaryFile(delete=False)
+        input_records = [
+            {"field_1": f"example_{index}" if index % 3 else None, "field_2": index, "field_3": index / 7}
+            for index in range(100)
+        ]
+        fastavro.writer(input_avro_file, fastavro.parse_schema(input_schema), input_records, codec="deflate",
+                        sync_interval=100)
+        input_avro_file.close()
+
+        output_files = {
+            name: tempfile.NamedTemporaryFile(delete=False, suffix=f".{name.split('_')[-1]}").name
+            for name in ("decoded_avro", "decoded_csv", "copied_avro", "copied_csv")
+        }
+
+        decoded_record_mapper = RecordMapper(test_schema)
+        decoded_record_mapper.execute("avro", input_avro_file.name,
+                                      {"avro": output_files["decoded_avro"], "csv": output_files["decoded_csv"]},
+                                      input_opts={"avro_passthrough": False}, output_opts={"avro_codec": "deflate"})
+
+        # Act
+        copied_record_mapper = RecordMapper(test_schema)
+        copied_record_mapper.execute("avro", input_avro_file.name,
+                                     {"avro": output_files["copied_avro"], "csv": output_files["copied_csv"]},
+                                     output_opts={"avro_codec": "deflate"})
+
+        # Assert
+        input_reader = AvroReader(input_avro_file.name, memory_map=True)
+        copied_reader = AvroReader(output_files["copied_avro"], memory_map=True)
+        input_blocks = [(count, block.tobytes()) for _, _, count, block in input_reader.read_raw_blocks()]
+        copied_blocks = [(count, block.tobytes()) for _, _, count, block in copied_reader.read_raw_blocks()]
+        self.assertGreater(len(input_blocks), 1)
+        self.assertListEqual(copied_blocks, input_blocks)
+        self.assertListEqual(list(copied_reader.read_records()), input_records)
+        input_reader.close()
+        copied_reader.close()
+
+        with open(output_files["decoded_csv"]) as decoded_csv, open(output_files["copied_csv"]) as copied_csv:
+            self.assertEqual(copied_csv.read(), decoded_csv.read())
+
+        self.assertDictEqual(copied_record_mapper.stats, decoded_record_mapper.stats)
+
+        os.remove(input_avro_file.name)
+        for file_name in output_files.values():
+            os.remove(file_name)
+
+    def test_execute_date_cache_stats(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": ["string", "null"], "transform": "toDate(%d/%m/%Y)"}
+            ]
+        }
+
+        input_csv_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        input_csv_file.write("field_1\n")
+        for index in range(100):
+            input_csv_file.write(f"{index % 10 + 1:02}/07/2019\n")
+        input_csv_file.close()
+
+        avro_file = tempfile.NamedTemporaryFile(delete=False)
+
+        # Act
+        record_mapper = RecordMapper(test_schema, date_cache_size=5)
+        record_mapper.execute("csv", input_csv_file.name, {"avro": avro_file.name})
+        res_small_cache_stats = record_mapper.stats["date_cache"]
+
+        record_mapper = RecordMapper(test_schema, date_cache_size=100)
+        record_mapper.execute("csv", input_csv_file.name, {"avro": avro_file.name})
+        res_cached_stats = record_mapper.stats["date_cache"]
+
+        parallel_record_mapper = RecordMapper(test_schema, date_cache_size=100)
+        parallel_record_mapper.execute("csv", input_csv_file.name, {"avro": avro_file.name}, workers=2,
+                                       chunk_size=10)
+        res_parallel_stats = parallel_record_mapper.stats["date_cache"]
+
+        # Assert
+        # The 10 dates are cycled, so a cache of 5 dates does not keep any of them until it is used again.
+        self.assertDictEqual(res_small_cache_stats, {"hits": 0, "misses": 100})
+        # The last 5 dates are still cached from the previous execution.
+        self.assertDictEqual(res_cached_stats, {"hits": 95, "misses": 5})
+        # The counters of the workers are included.
+        self.assertEqual(res_parallel_stats["hits"] + res_parallel_stats["misses"], 100)
+
+        os.remove(input_csv_file.name)
+        os.remove(avro_file.name)
+
+    def test_execute_removes_the_csv_file_if_the_avro_file_fails(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": ["int", "null"]}
+            ]
+        }
+
+        input_csv_file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        input_csv_file.write("field_1\n")
+        input_csv_file.write("".join(f"{index}\n" for index in range(10)))
+        input_csv_file.close()
+
+        avro_file = tempfile.NamedTemporaryFile(delete=False)
+        output_csv_file = tempfile.NamedTemporaryFile(suffix=".csv", delete=False)
+
+        # Act
+        # The values of the csv file are strings, which do not match the int field.
+        record_mapper = RecordMapper(test_schema)
+        with self.assertRaises(AvroMatchingException):
+            record_mapper.execute("csv", input_csv_file.name, {"avro": avro_file.name, "csv": output_csv_file.name},
+                                  output_opts={"write_buffer_size": 3})
+
+        # Assert
+        self.assertFalse(os.path.exists(output_csv_file.name))
+
+        os.remove(input_csv_file.name)
+        os.remove(avro_file.name)
+
     def test_execute_from_csv_and_flat(self):
         # Arrange
         test_schema = {
@@ -368,3 +827,224 @@ class test_RecordMapper(unittest.TestCase):
 
         os.remove(avro_temp_file.name)
         os.remove(csv_temp_file.name)
+
+    def test_transform_record_with_fused_engine(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": "string", "aliases": ["another_field"]},
+                {"name": "field_2", "aliases": ["field_auxiliar"], "type": ["int", "null"]},
+                {"name": "field_3", "type": ["string", "null"]},
+                {"name": "field_4", "type": "int", "transform": ["copyFrom(field_2)", "toString"]},
+                {"name": "field_5", "type": ["TestNestedSchema"],
+                 "nestedSchemaSelector": "tests.custom_functions_for_tests.selectSchema(TestNestedSchema)"}
+            ]
+        }
+
+        test_nested_schema = {
+            "type": "record",
+            "name": "TestNestedSchema",
+            "fields": [
+                {"name": "nested_field_1", "type": "string", "aliases": ["field_3"]},
+                {"name": "nested_field_2", "type": ["string", "null"], "transform": "copyFrom(field_3)"}
+            ]
+        }
+
+        input_records = [
+            {"field_auxiliar": 21, "field_3": "hola"},
+            {"another_field": "adios", "field_2": 5, "field_6": 7},
+            {}
+        ]
+
+        # Act
+        chain_records = list(RecordMapper(test_schema, [test_nested_schema]).transform_records(input_records))
+        fused_records = list(RecordMapper(test_schema, [test_nested_schema], engine="fused")
+                             .transform_records(input_records))
+
+        # Assert
+        self.assertListEqual(fused_records, chain_records)
+        self.assertListEqual([repr(record) for record in fused_records], [repr(record) for record in chain_records])
+
+    def test_transform_record_with_generated_code_engines(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": "string", "aliases": ["another_field"]},
+                {"name": "field_2", "aliases": ["field_auxiliar"], "type": ["int", "null"]},
+                {"name": "field_3", "type": ["string", "null"]},
+                {"name": "field_4", "type": "int", "transform": ["copyFrom(field_2)", "toString"]},
+                {"name": "field_5", "type": ["TestNestedSchema", "TestNestedSchema2", "null"],
+                 "nestedSchemaSelector": "tests.custom_functions_for_tests.selectSchemaFromField(field_3)"}
+            ]
+        }
+
+        test_nested_schema = {
+            "type": "record",
+            "name": "TestNestedSchema",
+            "fields": [
+                {"name": "nested_field_1", "type": "string", "aliases": ["field_3"]},
+                {"name": "nested_field_2", "type": ["string", "null"], "transform": "copyFrom(field_3)"}
+            ]
+        }
+
+        test_nested_schema_2 = {
+            "type": "record",
+            "name": "TestNestedSchema2",
+            "fields": [
+                {"name": "nested_field_3", "type": ["int", "null"], "transform": "copyFrom(field_2)"}
+            ]
+        }
+
+        input_records = [
+            {"field_auxiliar": 21, "field_3": "TestNestedSchema"},
+            {"another_field": "adios", "field_2": 5, "field_3": "TestNestedSchema2"},
+            {"field_3": "TestNestedSchema"},
+            {}
+        ]
+
+        chain_records = list(RecordMapper(test_schema, [test_nested_schema, test_nested_schema_2])
+                             .transform_records(input_records))
+
+        for engine in ["codegen", "slots"]:
+            # Act
+            codegen_mapper = RecordMapper(test_schema, [test_nested_schema, test_nested_schema_2], engine=engine)
+            codegen_records = list(codegen_mapper.transform_records(input_records))
+
+            # Assert
+            self.assertListEqual(codegen_records, chain_records)
+            self.assertListEqual([repr(record) for record in codegen_records],
+                                 [repr(record) for record in chain_records])
+
+            # One function for each combination of selected nested schemas.
+            self.assertEqual(codegen_mapper.get_generated_source().count("def map_TestSchema_"), 3)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_transform_batches(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": "string", "aliases": ["another_field"]},
+                {"name": "field_2", "aliases": ["field_auxiliar"], "type": ["int", "null"]},
+                {"name": "field_3", "type": ["string", "null"]},
+                {"name": "field_4", "type": "int", "transform": ["copyFrom(field_2)", "toString"]},
+                {"name": "field_5", "type": ["TestNestedSchema", "TestNestedSchema2", "null"],
+                 "nestedSchemaSelector": "tests.custom_functions_for_tests.selectSchemaFromField(field_3)"}
+            ]
+        }
+
+        test_nested_schema = {
+            "type": "record",
+            "name": "TestNestedSchema",
+            "fields": [
+                {"name": "nested_field_1", "type": "string", "aliases": ["field_3"]},
+                {"name": "nested_field_2", "type": ["string", "null"], "transform": "copyFrom(field_3)"}
+            ]
+        }
+
+        test_nested_schema_2 = {
+            "type": "record",
+            "name": "TestNestedSchema2",
+            "fields": [
+                {"name": "nested_field_3", "type": ["int", "null"], "transform": "copyFrom(field_2)"}
+            ]
+        }
+
+        input_batch = {
+            "field_auxiliar": numpy.array([21, 1, 2, 3]),
+            "another_field": ["hola", "adios", None, "hola"],
+            "field_3": ["TestNestedSchema", "TestNestedSchema2", "TestNestedSchema", None]
+        }
+
+        input_records = [
+            {"field_auxiliar": 21, "another_field": "hola", "field_3": "TestNestedSchema"},
+            {"field_auxiliar": 1, "another_field": "adios", "field_3": "TestNestedSchema2"},
+            {"field_auxiliar": 2, "another_field": None, "field_3": "TestNestedSchema"},
+            {"field_auxiliar": 3, "another_field": "hola", "field_3": None}
+        ]
+
+        record_mapper = RecordMapper(test_schema, [test_nested_schema, test_nested_schema_2])
+        expected_records = list(record_mapper.transform_records(input_records))
+
+        # Act
+        flat_batches = record_mapper.transform_batches([input_batch])
+        res_records = list(record_mapper.get_records_from_batches(flat_batches))
+
+        # Assert
+        self.assertListEqual(res_records, expected_records)
+        self.assertListEqual([repr(record) for record in res_records], [repr(record) for record in expected_records])
+
+    def test_transform_batches_with_batch_implementations(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": ["int", "null"]},
+                {"name": "field_2", "type": ["int", "null"],
+                 "transform": ["copyFrom(field_1)", "tests.custom_functions_for_tests.multiply(3)"]}
+            ]
+        }
+
+        input_batch = {
+            "field_1": [1, None, 3]
+        }
+
+        record_mapper = RecordMapper(test_schema)
+        batch_function = record_mapper.mapping_plan.base_flat_schema[("field_2",)].transforms[1].batch_function
+
+        # Act
+        res_records = list(record_mapper.get_records_from_batches(record_mapper.transform_batches([input_batch])))
+
+        # Assert
+        self.assertListEqual(res_records, [
+            {"field_1": 1, "field_2": 3},
+            {"field_1": None, "field_2": None},
+            {"field_1": 3, "field_2": 9}
+        ])
+        self.assertEqual(batch_function.calls, 1)
+
+    def test_invalid_engine(self):
+        # Arrange
+        test_schema = {
+            "type": "record",
+            "name": "TestSchema",
+            "fields": [
+                {"name": "field_1", "type": "string"}
+            ]
+        }
+
+        # Act
+        with self.assertRaises(RuntimeError) as context:
+            RecordMapper(test_schema, engine="nope")
+
+        # Assert
+        self.assertTrue("Invalid engine" in str(context.exception))
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        # Arrange
+        # The modules are listed with "python -X importtime", in a new process, after building a RecordMapper.
+        code = (
+            "from RecordMapper import RecordMapper\n"
+            "RecordMapper({'type': 'record', 'name': 'TestSchema', "
+            "'fields': [{'name': 'field_1', 'type': 'string', 'transform': 'toDate(%Y-%m-%d)'}]})\n"
+        )
+        heavy_modules = ["dateparser", "fastavro", "numpy", "defusedxml", "concurrent.futures.process"]
+
+        # Act
+        res = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        imported_modules = [line.split("|")[-1].strip() for line in res.stderr.splitlines()
+                            if line.startswith("import time:")]
+
+        # Assert
+        self.assertEqual(res.returncode, 0, res.stderr)
+        self.assertIn("RecordMapper.RecordMapper", imported_modules)
+        self.assertListEqual([module for module in imported_modules
+                              if any(module == heavy or module.startswith(heavy + ".") for heavy in heavy_modules)],
+                             [])
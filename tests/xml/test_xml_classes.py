@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from RecordMapper.xml.XMLReader import XMLReader
+
+
+class test_XMLReader(unittest.TestCase):
+
+    test_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<records source="test">
+    <record id="1">
+        <field_1>value_1</field_1>
+        <field_2>5</field_2>
+    </record>
+    <record>
+        <field_1/>
+        <field_3><nested>ignored</nested></field_3>
+    </record>
+    <record></record>
+    <record><field_2>7</field_2><field_2>8</field_2></record>
+</records>
+"""
+
+    def read_records(self, streaming):
+
+        temp_file = tempfile.NamedTemporaryFile("w", suffix=".xml", delete=False)
+        temp_file.write(self.test_xml)
+        temp_file.close()
+
+        reader = XMLReader(temp_file.name, streaming)
+        records = list(reader.read_records())
+        reader.close()
+
+        os.remove(temp_file.name)
+
+        return records
+
+    def test_read_records(self):
+
+        # Arrange
+        expected_records = [
+            {"field_1": "value_1", "field_2": "5"},
+            {"field_1": None, "field_3": None},
+            {},
+            {"field_2": "8"}
+        ]
+
+        # Act
+        res_records = self.read_records(streaming=False)
+
+        # Assert
+        self.assertListEqual(res_records, expected_records)
+
+    def test_read_records_in_streaming_mode(self):
+
+        # Act
+        res_records = self.read_records(streaming=True)
+
+        # Assert
+        self.assertListEqual(res_records, self.read_records(streaming=False))